@@ -11,6 +11,8 @@ setup(
     entry_points={
         'console_scripts': [
             'stinkworld=stinkworld.core.main:main',
+            'stinkworld-bake-assets=stinkworld.ui.asset_cache:main',
+            'stinkworld-bench=stinkworld.core.benchmark:main',
         ],
     },
     include_package_data=True,
@@ -15,8 +15,6 @@ BODY_PARTS = [
 
 def add_injury(entity, part: str, injury_type: str):
     """Add an injury to an entity."""
-    if not hasattr(entity, "injuries"):
-        entity.injuries = {}
     entity.injuries[part] = {
         "type": injury_type,
         "turns": INJURY_TYPES[injury_type]["heal_turns"],
@@ -30,8 +28,6 @@ def process_injuries(entity):
     bleeding = False
     limping = False
     hp_loss = 0
-    if not hasattr(entity, "injuries"):
-        entity.injuries = {}
     for part, info in list(entity.injuries.items()):
         info["turns"] -= 1
         if info["bleed"]:
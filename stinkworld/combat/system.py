@@ -4,10 +4,6 @@ from stinkworld.combat.injuries import BODY_PARTS, add_injury, process_injuries,
 def start_combat(game, npc):
     """Turn-based combat system with injury, bleeding, and limping."""
     player = game.player
-    if not hasattr(player, "injuries"):
-        player.injuries = {}
-    if not hasattr(npc, "injuries"):
-        npc.injuries = {}
 
     combat_over = False
     while not combat_over:
@@ -63,9 +59,9 @@ def start_combat(game, npc):
                     "If I wanted to hear from you, I'd rattle your cage!"
                 ]
                 taunt = random.choice(taunts)
-                if not hasattr(npc, 'taunted') or not npc.taunted:
-                    npc.strength = max(1, getattr(npc, 'strength', 5) - 2)
-                    npc.defense = max(0, getattr(npc, 'defense', 2) - 1)
+                if not npc.taunted:
+                    npc.strength = max(1, npc.strength - 2)
+                    npc.defense = max(0, npc.defense - 1)
                     npc.taunted = True
                     debuff_msg = f"{npc.name}'s strength and defense are lowered!"
                 else:
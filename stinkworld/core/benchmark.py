@@ -0,0 +1,221 @@
+"""
+StinkWorld - Headless render benchmark
+
+Builds a Game on the SDL dummy video driver with a fixed seed, moves the
+camera along a scripted path and reports per-phase frame timings. Every
+frame is hashed so rendering optimizations can be checked against a golden
+file for pixel-exact output.
+
+    python -m stinkworld.core.benchmark --frames 300 --weather storm
+    python -m stinkworld.core.benchmark --golden bench_golden.json
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+
+PHASES = ('map', 'entities', 'overlays', 'hud')
+CAMERA_PATHS = ('loop', 'sweep', 'static')
+MAP_RENDERERS = ('scroll', 'gather', 'tiles')
+# Config keys that must not change the rendered pixels, ignored when comparing goldens
+RENDERER_OPTIONS = ('renderer',)
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct * len(ordered) / 100.0) - 1))
+    return ordered[rank]
+
+def camera_path(kind, frames, width, height):
+    """Yield one (x, y) player position per frame for the named path."""
+    margin_x, margin_y = min(20, width // 4), min(12, height // 4)
+    left, top = margin_x, margin_y
+    right, bottom = width - 1 - margin_x, height - 1 - margin_y
+    if kind == 'static':
+        for _ in range(frames):
+            yield width // 2, height // 2
+    elif kind == 'sweep':
+        # Diagonal corner-to-corner pan, one tile per frame, bouncing at the ends
+        steps = max(1, max(right - left, bottom - top))
+        for i in range(frames):
+            t = i % (2 * steps)
+            t = t if t < steps else 2 * steps - t
+            yield left + (right - left) * t // steps, top + (bottom - top) * t // steps
+    else:
+        # Clockwise lap around the inner rectangle, one tile per frame
+        perimeter = []
+        perimeter += [(x, top) for x in range(left, right)]
+        perimeter += [(right, y) for y in range(top, bottom)]
+        perimeter += [(x, bottom) for x in range(right, left, -1)]
+        perimeter += [(left, y) for y in range(bottom, top, -1)]
+        perimeter = perimeter or [(width // 2, height // 2)]
+        for i in range(frames):
+            yield perimeter[i % len(perimeter)]
+
+def build_game(args):
+    """Create a seeded Game with the benchmark's map size, population and weather."""
+    import numpy as np
+    import pygame
+    from stinkworld.core.settings import Settings
+    from stinkworld.core.game import Game
+
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    pygame.init()
+    settings = Settings()
+    settings.map_width = args.map_width
+    settings.map_height = args.map_height
+    settings.initial_npc_count = args.npcs
+    settings.initial_car_count = args.cars
+    settings.map_renderer = args.renderer
+    settings.map_zoom_levels = (args.zoom,)  # Fixed zoom for the whole run
+    settings.render_quality = args.quality
+    settings.capture_dir = args.capture_dir
+    game = Game(settings)
+    game.state = "playing"
+    weather = game.weather_system
+    if args.weather not in weather.weather_types:
+        raise SystemExit(f"Unknown weather '{args.weather}', choose from: {', '.join(weather.weather_types)}")
+    weather.current_weather = args.weather
+    weather.particles.rng = np.random.default_rng(args.seed)
+    return game
+
+def run_benchmark(args):
+    """Render the scripted frames, returns the report dict."""
+    game = build_game(args)
+    timings = {phase: [] for phase in PHASES}
+    totals = []
+    checksums = []
+    capture_frames = set(args.capture or ())
+    path = camera_path(args.path, args.warmup + args.frames, game.city.width, game.city.height)
+    for frame, (x, y) in enumerate(path):
+        game.player.x, game.player.y = x, y
+        game.render_game()
+        if frame < args.warmup:
+            continue
+        if frame - args.warmup in capture_frames:
+            game.capture.screenshot(game.screen, f"bench_{args.seed}_{frame - args.warmup:04d}")
+        for phase in PHASES:
+            timings[phase].append(game.frame_timings.get(phase, 0.0))
+        totals.append(sum(game.frame_timings.get(phase, 0.0) for phase in PHASES))
+        if not args.no_checksums:
+            import pygame
+            checksums.append(hashlib.sha1(pygame.image.tobytes(game.screen, 'RGB')).hexdigest())
+
+    game.capture.close()
+    report = {
+        'config': {
+            'seed': args.seed, 'frames': args.frames, 'warmup': args.warmup,
+            'map': [args.map_width, args.map_height], 'npcs': args.npcs, 'cars': args.cars,
+            'weather': args.weather, 'path': args.path, 'renderer': args.renderer,
+            'zoom': args.zoom, 'quality': args.quality,
+        },
+        'timings_ms': {},
+        'frame_modes': dict(game.dirty_rects.stats),
+        'quality_decisions': list(game.quality.decisions),
+        'captures': dict(game.capture.stats),
+        'memory': {name: list(usage) for name, usage in game.memory_report().items()},
+        'checksums': checksums,
+    }
+    for phase, values in list(timings.items()) + [('total', totals)]:
+        report['timings_ms'][phase] = {
+            'p50': percentile(values, 50) * 1000,
+            'p95': percentile(values, 95) * 1000,
+            'p99': percentile(values, 99) * 1000,
+        }
+    if checksums:
+        report['digest'] = hashlib.sha1(''.join(checksums).encode('ascii')).hexdigest()
+    return report
+
+def print_report(report):
+    """Print timings as a small table."""
+    config = report['config']
+    print(f"\n=== RENDER BENCHMARK ===")
+    print(f"{config['frames']} frames, map {config['map'][0]}x{config['map'][1]}, "
+          f"{config['npcs']} NPCs, {config['cars']} cars, weather {config['weather']}, "
+          f"path {config['path']}, renderer {config['renderer']}, zoom {config['zoom']}, "
+          f"quality {config['quality']}, seed {config['seed']}")
+    print(f"{'phase':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for phase, stats in report['timings_ms'].items():
+        print(f"{phase:<10}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}")
+    modes = report['frame_modes']
+    print(f"frames drawn: {modes['full']} full, {modes['partial']} partial, {modes['idle']} idle")
+    for decision in report['quality_decisions']:
+        print(f"quality {decision['from']} -> {decision['to']} at frame {decision['frame']}: "
+              f"{decision['reason']} ({decision['average_ms']} ms)")
+    captures = report['captures']
+    if captures['captured'] or captures['dropped']:
+        print(f"captures: {captures['written']} written, {captures['dropped']} dropped, {captures['failed']} failed")
+    print("memory: " + ", ".join(f"{count} {name} {size / 1024:.1f} KB"
+                                 for name, (count, size) in report['memory'].items()))
+    if 'digest' in report:
+        print(f"frame digest: {report['digest']}")
+
+def check_golden(report, golden_path, update=False):
+    """Compare frame checksums with a golden file (writing it if missing), returns True on match."""
+    if update or not os.path.exists(golden_path):
+        with open(golden_path, 'w') as f:
+            json.dump({'config': report['config'], 'checksums': report['checksums']}, f, indent=2)
+        print(f"Wrote golden checksums to {golden_path}")
+        return True
+    with open(golden_path) as f:
+        golden = json.load(f)
+    expected_config = {k: v for k, v in golden['config'].items() if k not in RENDERER_OPTIONS}
+    actual_config = {k: v for k, v in report['config'].items() if k not in RENDERER_OPTIONS}
+    if expected_config != actual_config:
+        print(f"Golden file {golden_path} was recorded with a different config: {golden['config']}")
+        return False
+    for frame, (expected, actual) in enumerate(zip(golden['checksums'], report['checksums'])):
+        if expected != actual:
+            print(f"Frame {frame} differs from golden output ({actual} != {expected})")
+            return False
+    if len(golden['checksums']) != len(report['checksums']):
+        print("Frame count differs from golden output")
+        return False
+    print(f"All {len(report['checksums'])} frames match {golden_path}")
+    return True
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Headless StinkWorld render benchmark.")
+    parser.add_argument('--frames', type=int, default=300, help="frames to measure")
+    parser.add_argument('--warmup', type=int, default=10, help="frames rendered before measuring")
+    parser.add_argument('--seed', type=int, default=1234, help="random seed for city and entities")
+    parser.add_argument('--map-width', type=int, default=100, help="map width in tiles")
+    parser.add_argument('--map-height', type=int, default=100, help="map height in tiles")
+    parser.add_argument('--npcs', type=int, default=50, help="NPCs to spawn")
+    parser.add_argument('--cars', type=int, default=30, help="cars to spawn")
+    parser.add_argument('--weather', default='clear', help="weather type to render")
+    parser.add_argument('--path', choices=CAMERA_PATHS, default='loop', help="scripted camera path")
+    parser.add_argument('--renderer', choices=MAP_RENDERERS, default='scroll', help="map renderer")
+    parser.add_argument('--zoom', type=float, default=1.0, help="map zoom factor (below 1 uses the LOD renderer)")
+    parser.add_argument('--quality', choices=('low', 'medium', 'high', 'auto'), default='high',
+                        help="render quality; 'auto' lets the governor adjust it, so frames are not reproducible")
+    parser.add_argument('--capture', type=lambda text: [int(n) for n in text.split(',')],
+                        help="comma-separated measured frame numbers to save as PNG in --capture-dir")
+    parser.add_argument('--capture-dir', default='captures', help="directory for --capture screenshots")
+    parser.add_argument('--golden', help="golden checksum file to compare against (written if missing)")
+    parser.add_argument('--update-golden', action='store_true', help="overwrite the golden file")
+    parser.add_argument('--no-checksums', action='store_true', help="skip per-frame hashing")
+    parser.add_argument('--json', help="also write the full report to this file")
+    args = parser.parse_args(argv)
+
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    report = run_benchmark(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    ok = True
+    if args.golden and not args.no_checksums:
+        ok = check_golden(report, args.golden, args.update_golden)
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
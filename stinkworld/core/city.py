@@ -1,7 +1,8 @@
 """City generation module."""
 import random
+import numpy as np
 from stinkworld.core.settings import (
-    MAP_WIDTH, MAP_HEIGHT, TILE_ROAD, TILE_BUILDING, TILE_PARK,
+    TILE_ROAD, TILE_BUILDING, TILE_PARK,
     TILE_DOOR, TILE_FLOOR, TILE_TOILET, TILE_OVEN, TILE_BED,
     TILE_DESK, TILE_SHOP_SHELF, TILE_TABLE, TILE_TREE, TILE_POND,
     TILE_GRASS, TILE_FRIDGE, TILE_COUNTER, TILE_SINK, TILE_TUB,
@@ -10,6 +11,13 @@ from stinkworld.core.settings import (
 )
 from stinkworld.utils.debug import debug_log
 
+ROOMS = ("bathroom", "kitchen", "bedroom", "living", "office", "shop")  # Room types place_room() knows
+ROOM_FURNITURE = {  # Furniture tile -> the room it makes of the building it stands in
+    TILE_TOILET: "bathroom", TILE_SINK: "bathroom", TILE_TUB: "bathroom",
+    TILE_FRIDGE: "kitchen", TILE_OVEN: "kitchen", TILE_COUNTER: "kitchen",
+    TILE_BED: "bedroom", TILE_TABLE: "living", TILE_DESK: "office", TILE_SHOP_SHELF: "shop",
+}
+
 def place_room(grid, bx, by, bw, bh, room_type):
     furniture = []
     rx1, ry1 = bx, by
@@ -214,17 +222,36 @@ def generate_city_map(width, height, road_spacing=ROAD_SPACING, road_width=ROAD_
     debug_log("[CITY] City map generation complete.")
     return grid
 
+class Building:
+    """A building NPCs can have on their itinerary: its shell, a door and its rooms."""
+
+    __slots__ = ('index', 'rect', 'door', 'rooms')
+
+    def __init__(self, index, rect, door, rooms):
+        """Initialize building."""
+        self.index = index  # Position in City.registry
+        self.rect = rect  # (x, y, width, height)
+        self.door = door  # (x, y) of a door tile
+        self.rooms = rooms  # Room type -> (x, y) of a piece of its furniture
+
+    def __repr__(self):
+        return f"Building({self.index}, door={self.door}, rooms={sorted(self.rooms)})"
+
 class City:
     """City generation and management."""
     
     def __init__(self, settings=None):
         """Initialize city."""
-        self.width = MAP_WIDTH
-        self.height = MAP_HEIGHT
+        self.settings = settings or Settings()
+        self.width = self.settings.map_width
+        self.height = self.settings.map_height
         self.map = [[TILE_GRASS for _ in range(self.width)] for _ in range(self.height)]
         self.shops = {}  # (x, y) -> shop_name
         self.props = {}  # (x, y) -> prop_name
-        self.settings = settings or Settings()
+        self.buildings = []  # (x, y, width, height) of every building shell, clipped to the map
+        self.registry = []  # Building for every shell with a door, see register_buildings()
+        self.tiles = None  # NumPy copy of map, indexed [y, x]
+        self.tile_listeners = []  # Callbacks called as listener(x, y, old_tile, new_tile)
         self.generate_city()
     
     def generate_city(self):
@@ -240,6 +267,9 @@ class City:
         
         # Add natural features
         self.add_natural_features()
+        
+        self.tiles = np.array(self.map, dtype=np.int16)
+        self.registry = self.register_buildings()
     
     def generate_roads(self):
         """Generate road grid."""
@@ -310,6 +340,11 @@ class City:
         offset_x = random.randint(1, ROAD_SPACING - width - 1)
         offset_y = random.randint(1, ROAD_SPACING - height - 1)
         
+        x0, y0 = start_x + offset_x, start_y + offset_y
+        x1, y1 = min(self.width, x0 + width), min(self.height, y0 + height)
+        if x0 < x1 and y0 < y1:
+            self.buildings.append((x0, y0, x1 - x0, y1 - y0))
+        
         # First create interior floors (MUST HAPPEN BEFORE WALLS)
         for y in range(1, height-1):
             for x in range(1, width-1):
@@ -455,12 +490,45 @@ class City:
                             self.shops[(x, y)] = shop_type
         debug_log(f"[CITY] Placed {furniture_count} furniture items in interiors.")
     
+    def register_buildings(self):
+        """List the buildings people can go to: shells with a door, with the rooms their furniture makes."""
+        registry = []
+        for x, y, width, height in self.buildings:
+            block = self.tiles[y:y + height, x:x + width]
+            doors = np.argwhere(block == TILE_DOOR)
+            if not len(doors):
+                continue
+            rooms = {}
+            furnished = np.isin(block, list(ROOM_FURNITURE))
+            for (dy, dx), tile in zip(np.argwhere(furnished).tolist(), block[furnished].tolist()):
+                rooms.setdefault(ROOM_FURNITURE[tile], (x + dx, y + dy))
+            door_y, door_x = doors[0].tolist()
+            registry.append(Building(len(registry), (x, y, width, height), (x + door_x, y + door_y), rooms))
+        debug_log(f"[CITY] Registered {len(registry)} of {len(self.buildings)} buildings")
+        return registry
+
     def get_tile(self, x, y):
         """Get tile at position."""
         if 0 <= x < self.width and 0 <= y < self.height:
             return self.map[y][x]
         return TILE_GRASS
     
+    def set_tile(self, x, y, tile):
+        """Change a tile after generation, keeping the NumPy layer and listeners in sync."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        old_tile = self.map[y][x]
+        if old_tile == tile:
+            return
+        self.map[y][x] = tile
+        self.tiles[y, x] = tile
+        for listener in self.tile_listeners:
+            listener(x, y, old_tile, tile)
+    
+    def add_tile_listener(self, listener):
+        """Register a callback for tile changes made through set_tile."""
+        self.tile_listeners.append(listener)
+    
     def get_shop_at(self, x, y):
         """Get shop name at position."""
         return self.shops.get((x, y))
@@ -490,13 +558,14 @@ class City:
                     return True
         return False
 
-    def find_walkable_tile(self):
-        """Find a random walkable tile in the city."""
-        walkable_tiles = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.is_walkable(x, y):
-                    walkable_tiles.append((x, y))
+    def walkable_tiles(self):
+        """Every walkable tile, row by row."""
+        return [(x, y) for y in range(self.height) for x in range(self.width) if self.is_walkable(x, y)]
+
+    def find_walkable_tile(self, walkable_tiles=None):
+        """Find a random walkable tile in the city (from walkable_tiles() if already listed)."""
+        if walkable_tiles is None:
+            walkable_tiles = self.walkable_tiles()
         return random.choice(walkable_tiles) if walkable_tiles else (None, None)
 
     def find_road_tile(self):
@@ -1,37 +1,57 @@
 """Main game module."""
 import pygame
-import sys
 import random
 import json
 import os
+import time
 from datetime import datetime, timedelta
 from stinkworld.ui.menus import main_menu
 from stinkworld.entities.character_creation import character_creation
 from stinkworld.core.settings import (
     Settings, TILE_ROAD, TILE_PARK, TILE_FLOOR, TILE_DOOR, TILE_GRASS,
-    TILE_TREE, TILE_POND, TILE_TOILET, TILE_OVEN, TILE_BED, TILE_DESK,
+    TILE_TOILET, TILE_OVEN, TILE_BED, TILE_DESK,
     TILE_SHOP_SHELF, TILE_TABLE, TILE_FRIDGE, TILE_COUNTER, TILE_SINK,
-    TILE_TUB, TILE_COUNTRY_HOUSE, TILE_BUILDING, TILE_WINDOW
+    TILE_TUB, TILE_COUNTRY_HOUSE, TILE_WINDOW
 )
 from stinkworld.systems.weather import WeatherSystem
 from stinkworld.systems.time import TimeSystem
 from stinkworld.ui.base import UI
 from stinkworld.ui.graphics import Graphics
+from stinkworld.ui.asset_cache import AssetCache
 from stinkworld.entities.player import Player
 from stinkworld.systems.economy import Economy
 from stinkworld.core.city import City  # <-- Correct import for City
 from stinkworld.utils.debug import debug_log
-from stinkworld.data.names import random_name
-from stinkworld.entities.npc import NPC
+from stinkworld.utils.memory import total_sizeof
+from stinkworld.entities.npc import add_npc_record, PERSONALITIES
 from stinkworld.entities.car import Car
 from stinkworld.systems.traffic import TrafficLight
+from stinkworld.systems.occupancy import OccupancyGrid, CAR
+from stinkworld.systems.population import NPCPopulation
+from stinkworld.systems.schedule import ScheduleEngine
+from stinkworld.systems.behavior import BehaviorRuntime
 from stinkworld.combat.messages import car_combat_message
 from stinkworld.ui.appearance import draw_portrait
+from stinkworld.ui.fonts import get_font, render_text
+from stinkworld.ui.text_layout import render_paragraph
+from stinkworld.ui.tile_renderer import GatherMapRenderer, TERRAIN_NAMES, FURNITURE_NAMES, road_terrain
+from stinkworld.ui.scroll_buffer import ScrollBufferRenderer
+from stinkworld.ui.map_lod import MapLOD
+from stinkworld.ui.minimap import Minimap
+from stinkworld.ui.light_map import LightMap
+from stinkworld.ui.quality import QualityGovernor
+from stinkworld.ui.capture import FrameCapture
+from stinkworld.ui.modal import ModalLayer
+from stinkworld.ui.virtual_list import VirtualList
+from stinkworld.core.loop import FixedTimestepLoop
+from stinkworld.systems.exploration import ExplorationMap
+from stinkworld.ui.dirty_rects import DirtyRectTracker, FRAME_IDLE
 
 # Viewport size in tiles
 from stinkworld.core.settings import TILE_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT
 VIEWPORT_WIDTH = SCREEN_WIDTH // TILE_SIZE
 VIEWPORT_HEIGHT = SCREEN_HEIGHT // TILE_SIZE
+SPAWN_ATTEMPTS = 10  # Random tiles tried per NPC before giving up on finding one in a block with room
 
 class Game:
     """Main game class."""
@@ -52,15 +72,17 @@ class Game:
         self.time_system = TimeSystem()
         self.time_system.game = self  # Connect TimeSystem to Game instance
         debug_log(f"[Game] TimeSystem initialized at {hex(id(self.time_system))} | Current time: {self.time_system.get_time_string()}")
-        self.weather_system = WeatherSystem()
+        self.weather_system = WeatherSystem(settings.weather_max_particles)
         
         # Initialize UI
         self.ui = UI(settings)
-        self.graphics = Graphics(self)
+        self.graphics = Graphics(self, AssetCache(settings.asset_cache_path))
         
         self.state = "menu"
         self.city = None
-        self.npcs = []
+        self.population = None
+        self.schedule = None  # ScheduleEngine running the population's daily itineraries
+        self.behavior = None  # BehaviorRuntime making the population's decisions
         self.cars = []
         self.traffic_lights = []
         self.turn = 0
@@ -68,15 +90,86 @@ class Game:
         self.player = None
         self.furniture_state = {}  # (x, y): {'state': 'normal'|'moved'|'broken'|'vandalized', 'type': tile, 'desc': str}
         self.economy = Economy()  # Initialize economy system
+        self.hud_fields = {}  # field -> (text, color, rendered surface)
+        self.frame_timings = {}  # render phase -> seconds spent in the last frame
+        self.dirty_rects = DirtyRectTracker(self.screen.get_size(), settings.dirty_rect_max_coverage)
+        self.last_scene = None  # Camera, hour and weather of the last drawn frame
+        self.camera = (0, 0)
+        self.zoom_level = 0  # Index into settings.map_zoom_levels
+        
+        # Fixed-timestep simulation (see run())
+        self.loop = FixedTimestepLoop(settings.sim_tick_rate, settings.max_frame_time, settings.max_ticks_per_frame)
+        self.sim_ticks = 0
+        self.next_move_tick = 0  # Earliest tick the player may move again
+        self.next_world_tick = 0  # Next world turn in realtime mode
+        self.pending_turn = None  # World turn generator still being worked through
+        self.motion_start = None  # id -> (entity, x, y) before the current move/turn
+        self.tweens = {}  # id -> (entity, from x, from y, start tick) for entities sliding on screen
+        self.capture = FrameCapture(settings.capture_dir, settings.capture_queue_depth)
+        self.modal = ModalLayer(self, settings.modal_wait_ms)
 
         self.debug("Game initialized.")
         
         # Initialize city and spawn entities
-        self.city = City()
-        self.spawn_npcs(50)  # Spawn 50 NPCs at game start
-        self.spawn_cars(30)   # Spawn 30 cars at game start (increased from 12)
+        self.city = City(settings)
+        self.population = NPCPopulation(self.city, wander_chance=settings.npc_wander_chance,
+                                        active_radius=settings.npc_active_radius,
+                                        middle_radius=settings.npc_middle_radius,
+                                        middle_interval=settings.npc_middle_interval,
+                                        far_interval=settings.npc_far_interval,
+                                        view_cache_size=settings.npc_view_cache_size,
+                                        crowd_radius=settings.npc_crowd_radius,
+                                        crowd_avoidance=settings.npc_crowd_avoidance,
+                                        lane_following=settings.npc_lane_following,
+                                        block_cap=settings.npc_block_cap)
+        self.occupancy = OccupancyGrid(self.city.width, self.city.height, self.population)
+        self.schedule = ScheduleEngine(self.population, self.city)
+        self.behavior = BehaviorRuntime(self.population, [p.lower() for p in PERSONALITIES])
+        self.spawn_npcs(settings.initial_npc_count)
+        self.schedule.advance(self.time_system.elapsed_minutes)
+        self.spawn_cars(settings.initial_car_count)
+        self.map_renderer = self.create_map_renderer(settings.map_renderer)
+        self.map_lod = MapLOD(self, settings.lod_tile_sizes, settings.lod_chunk_size, settings.lod_cache_chunks)
+        self.exploration = ExplorationMap(self.city.width, self.city.height)
+        self.minimap = Minimap(self, self.exploration, settings.minimap_size, settings.minimap_margin)
 
         self.init_player()
+        self.light_map = LightMap(self, settings.street_lamp_spacing)
+        self.quality = QualityGovernor(self, settings.frame_budget, settings.render_quality)
+        self.end_turn()
+
+    @property
+    def npcs(self):
+        """Every NPC; indexing or iterating makes NPC objects, so use the population's arrays for bulk work."""
+        return self.population
+
+    def memory_report(self):
+        """Approximate memory of the entities: name -> (count, bytes)."""
+        columns, made, made_bytes = self.population.sizeof()
+        return {
+            'npc rows': (len(self.population), columns),
+            'npc objects': (made, made_bytes),
+            'cars': total_sizeof(self.cars),
+            'player': (1, self.player.sizeof()),
+        }
+
+    def create_map_renderer(self, kind):
+        """Create the map renderer named in settings (None draws tile by tile)."""
+        if kind == 'scroll':
+            return ScrollBufferRenderer(self, self.settings.scroll_buffer_margin)
+        elif kind == 'gather':
+            return GatherMapRenderer(self)
+        return None
+
+    def map_zoom(self):
+        """Current zoom factor (1.0 is the normal tile view)."""
+        return self.settings.map_zoom_levels[self.zoom_level]
+
+    def change_zoom(self, step):
+        """Zoom out (step > 0) or in (step < 0) by one level."""
+        levels = self.settings.map_zoom_levels
+        self.zoom_level = max(0, min(len(levels) - 1, self.zoom_level + step))
+        self.debug(f"Map zoom {self.map_zoom()}")
 
     def debug(self, message):
         debug_log(f"[Game] {message}")
@@ -95,174 +188,251 @@ class Game:
             self.city.set_walkable(x, y, new_state == 'open')
             
             # Force redraw of the tile to show new state
-            self.graphics.redraw_tile(x, y)
+            self.invalidate_tile(x, y)
         
         self.debug(f"Toggled {tile_type} at ({x}, {y}) to {new_state}")
 
     def run(self):
-        """Main game loop with 8-directional movement and numpad support."""
-        move_cooldown = 0
+        """Main loop: fixed-rate simulation ticks, rendering as often as settings.fps allows."""
+        loop = self.loop
+        loop.reset()
         while self.running:
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.show_pause_menu()
-                    elif event.key == pygame.K_e:
-                        self.interact()
-                    elif event.key == pygame.K_SPACE:
-                        # Exit car if in car
-                        if hasattr(self.player, 'in_car') and self.player.in_car:
-                            self.player.in_car.remove_driver()
-                            self.show_message_and_wait("You exit the car.")
-                    elif event.key == pygame.K_j:
-                        self.show_journal()
-            # Player Movement (turn-based)
-            keys = pygame.key.get_pressed()
-            dx, dy = 0, 0
-            wait = False
-            if move_cooldown <= 0:
-                # 8-directional movement with numpad
-                if keys[pygame.K_KP1]:
-                    dx, dy = -1, 1
-                elif keys[pygame.K_KP2]:
-                    dx, dy = 0, 1
-                elif keys[pygame.K_KP3]:
-                    dx, dy = 1, 1
-                elif keys[pygame.K_KP4]:
-                    dx, dy = -1, 0
-                elif keys[pygame.K_KP6]:
-                    dx, dy = 1, 0
-                elif keys[pygame.K_KP7]:
-                    dx, dy = -1, -1
-                elif keys[pygame.K_KP8]:
-                    dx, dy = 0, -1
-                elif keys[pygame.K_KP9]:
-                    dx, dy = 1, -1
-                elif keys[pygame.K_KP5]:
-                    wait = True
-                # Also allow arrow keys for 4-directional movement
-                elif keys[pygame.K_UP]:
-                    dx, dy = 0, -1
-                elif keys[pygame.K_DOWN]:
-                    dx, dy = 0, 1
-                elif keys[pygame.K_LEFT]:
-                    dx, dy = -1, 0
-                elif keys[pygame.K_RIGHT]:
-                    dx, dy = 1, 0
-
-                if dx or dy:
-                    if self.is_walkable(self.player.x + dx, self.player.y + dy):
-                        move_result = self.player.move(dx, dy, self.city.map, self.npcs, self.cars)
-                        if isinstance(move_result, str):
-                            self.show_message_and_wait(move_result)
-                        self.time_system.advance_time()  # Only advance time when player moves
-                        move_cooldown = 10
-                        # Update NPCs (turn-based)
-                        for npc in self.npcs:
-                            npc.update(self.city.map, self.traffic_lights, self.npcs)
-                        # Update cars (AI for all undriven cars)
-                        for car in self.cars:
-                            if not car.driver:
-                                car.update_ai(self.city.map, self.traffic_lights, self.npcs)
-                        # --- WEATHER SYSTEM: update weather each turn ---
-                        current_date = self.time_system.get_current_datetime()
-                        self.weather_system.update_weather(current_date)
-                elif wait:
-                    # Wait/skip turn
-                    self.time_system.advance_time()
-                    move_cooldown = 10
-                    for npc in self.npcs:
-                        npc.update(self.city.map, self.traffic_lights, self.npcs)
-                    for car in self.cars:
-                        if not car.driver:
-                            car.update_ai(self.city.map, self.traffic_lights, self.npcs)
-                    # --- WEATHER SYSTEM: update weather each turn ---
-                    current_date = self.time_system.get_current_datetime()
-                    self.weather_system.update_weather(current_date)
-
-            # Cooldown Countdown
-            if move_cooldown > 0:
-                move_cooldown -= 1
-
-            # Rest of game loop (rendering etc)
-            self.render_game()
+            self.handle_events()
+            for _ in range(loop.advance()):
+                self.sim_tick()
+            self.run_pending_turn(self.settings.sim_turn_budget)
+            self.render_game(loop.alpha)
+            self.capture.record_frame(self.screen)
+            self.clock.tick(self.settings.fps)
+        self.capture.close()
+
+    def handle_events(self):
+        """Handle queued key presses and window events."""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.show_pause_menu()
+                elif event.key == pygame.K_e:
+                    self.interact()
+                elif event.key == pygame.K_SPACE:
+                    # Exit car if in car
+                    if self.player.in_car:
+                        self.player.in_car.remove_driver()
+                        self.show_message_and_wait("You exit the car.")
+                elif event.key == pygame.K_j:
+                    self.show_journal()
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.change_zoom(1)
+                elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                    self.change_zoom(-1)
+                elif event.key == pygame.K_F12 and event.mod & pygame.KMOD_SHIFT:
+                    if self.capture.recording:
+                        self.capture.stop_recording()
+                    else:
+                        self.capture.start_recording()
+                elif event.key == pygame.K_F12:
+                    # The screen still holds the last presented frame
+                    self.capture.screenshot(self.screen)
+
+    def read_move_keys(self):
+        """Return (dx, dy, wait) for the held movement keys (8 directions with numpad)."""
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_KP1]:
+            return -1, 1, False
+        elif keys[pygame.K_KP2]:
+            return 0, 1, False
+        elif keys[pygame.K_KP3]:
+            return 1, 1, False
+        elif keys[pygame.K_KP4]:
+            return -1, 0, False
+        elif keys[pygame.K_KP6]:
+            return 1, 0, False
+        elif keys[pygame.K_KP7]:
+            return -1, -1, False
+        elif keys[pygame.K_KP8]:
+            return 0, -1, False
+        elif keys[pygame.K_KP9]:
+            return 1, -1, False
+        elif keys[pygame.K_KP5]:
+            return 0, 0, True  # Wait/skip turn
+        # Also allow arrow keys for 4-directional movement
+        elif keys[pygame.K_UP]:
+            return 0, -1, False
+        elif keys[pygame.K_DOWN]:
+            return 0, 1, False
+        elif keys[pygame.K_LEFT]:
+            return -1, 0, False
+        elif keys[pygame.K_RIGHT]:
+            return 1, 0, False
+        return 0, 0, False
+
+    def sim_tick(self):
+        """One fixed simulation step: player input and, when due, a new world turn."""
+        self.sim_ticks += 1
+        tween_ticks = self.settings.move_tween_ticks
+        self.tweens = {key: tween for key, tween in self.tweens.items()
+                       if self.sim_ticks - tween[3] < tween_ticks}
+        if self.pending_turn is not None:
+            return  # Still working through the last turn
+
+        acted = False
+        dx, dy, wait = self.read_move_keys()
+        if self.sim_ticks >= self.next_move_tick and (dx or dy or wait):
+            if wait:
+                acted = True
+            elif self.is_walkable(self.player.x + dx, self.player.y + dy):
+                self.begin_motion()
+                move_result = self.player.move(dx, dy, self.city.map, self.npcs, self.cars)
+                if isinstance(move_result, str):
+                    self.show_message_and_wait(move_result)
+                    self.loop.reset()
+                acted = True
+            if acted:
+                self.next_move_tick = self.sim_ticks + self.settings.move_repeat_ticks
+
+        if self.settings.game_mode == 'realtime':
+            if self.sim_ticks >= self.next_world_tick:
+                self.next_world_tick = self.sim_ticks + self.settings.realtime_turn_ticks
+                self.start_turn()
+        elif acted:
+            self.start_turn()  # Only advance time when the player acts
+        if self.pending_turn is None:
+            self.end_motion()
+
+    def start_turn(self):
+        """Begin a world turn; it runs over as many frames as its budget needs."""
+        self.begin_motion()
+        self.pending_turn = self.world_turn()
+
+    def world_turn(self):
+        """Advance the world one turn, yielding after each entity so the work can be spread out."""
+        self.time_system.advance_time()
+        # Update NPCs (turn-based, all at once)
+        self.step_population()
+        yield
+        # Update cars (AI for all undriven cars)
+        for car in list(self.cars):
+            if not car.driver:
+                car.update_ai(self.city.map, self.traffic_lights, self.npcs)
+                yield
+        # --- WEATHER SYSTEM: update weather each turn ---
+        current_date = self.time_system.get_current_datetime()
+        self.weather_system.update_weather(current_date)
+        self.end_turn()
+
+    def run_pending_turn(self, budget):
+        """Continue the pending world turn for up to budget seconds."""
+        if self.pending_turn is None:
+            return
+        deadline = time.perf_counter() + budget
+        for _ in self.pending_turn:
+            if time.perf_counter() >= deadline:
+                return
+        self.pending_turn = None
+        self.end_motion()
+
+    def begin_motion(self):
+        """Remember where the player and cars are before a move or turn changes positions.
+
+        NPCs only move in step_population(), which adds the ones that did.
+        """
+        if self.motion_start is None:
+            entities = [self.player] + self.cars
+            self.motion_start = {id(e): (e, e.x, e.y) for e in entities}
+
+    def step_population(self):
+        """Run a turn of NPC schedules, movement and decisions, remembering where the visible movers started."""
+        now = self.time_system.elapsed_minutes
+        self.schedule.advance(now)
+        width = self.city.width
+        blocked = [y * width + x for car in self.cars for x, y in car.get_tiles()]
+        population = self.population
+        focus = self.camera_focus()
+        rows, old_x, old_y = population.step(blocked, (focus.x, focus.y))
+        self.behavior.tick(now, (focus.x, focus.y))
+        if self.motion_start is None:
+            return
+        for npc, ox, oy in self.behavior.moved:
+            self.motion_start.setdefault(id(npc), (npc, ox, oy))
+        if not len(rows):
+            return
+        # Only NPCs that will be drawn need a tween (the camera may follow the player a tile)
+        x0, y0, x1, y1 = self.view_rect(*self.camera)
+        x, y = population.x[rows], population.y[rows]
+        seen = (x >= x0 - 1) & (x < x1 + 1) & (y >= y0 - 1) & (y < y1 + 1)
+        for row, ox, oy in zip(rows[seen].tolist(), old_x[seen].tolist(), old_y[seen].tolist()):
+            npc = population.view(row)
+            self.motion_start.setdefault(id(npc), (npc, ox, oy))
+
+    def end_motion(self):
+        """Start an on-screen tween for every entity that moved since begin_motion()."""
+        if self.motion_start is None:
+            return
+        for key, (entity, x, y) in self.motion_start.items():
+            if (entity.x, entity.y) != (x, y):
+                self.tweens[key] = (entity, x, y, self.sim_ticks)
+        self.motion_start = None
+
+    def motion_offset(self, entity, alpha):
+        """Tile offset from an entity's position to where it is drawn mid-tween (0, 0 when settled)."""
+        tween = self.tweens.get(id(entity))
+        if tween is None or alpha is None:
+            return 0.0, 0.0
+        _, x, y, start = tween
+        progress = min(1.0, (self.sim_ticks - start + alpha) / self.settings.move_tween_ticks)
+        return (x - entity.x) * (1.0 - progress), (y - entity.y) * (1.0 - progress)
 
     def draw_map(self, camera_x, camera_y):
+        """Draw the visible map tiles one by one."""
         for y in range(camera_y, camera_y + VIEWPORT_HEIGHT):
             for x in range(camera_x, camera_x + VIEWPORT_WIDTH):
-                screen_x = (x - camera_x) * TILE_SIZE
-                screen_y = (y - camera_y) * TILE_SIZE
-                tile = self.city.get_tile(x, y)
-                
-                # Draw terrain
-                if tile == TILE_ROAD:
-                    # Determine road orientation based on surrounding roads
-                    is_vertical = (self.city.get_tile(x, y-1) == TILE_ROAD and 
-                                 self.city.get_tile(x, y+1) == TILE_ROAD)
-                    is_horizontal = (self.city.get_tile(x-1, y) == TILE_ROAD and 
-                                   self.city.get_tile(x+1, y) == TILE_ROAD)
-                    
-                    if is_vertical and is_horizontal:
-                        self.graphics.draw_terrain(self.screen, 'road_intersection', screen_x, screen_y)
-                    elif is_vertical:
-                        self.graphics.draw_terrain(self.screen, 'road_v', screen_x, screen_y)
-                    else:  # Default to horizontal
-                        self.graphics.draw_terrain(self.screen, 'road_h', screen_x, screen_y)
-                elif tile == TILE_PARK:
-                    self.graphics.draw_terrain(self.screen, 'grass', screen_x, screen_y)
-                elif tile == TILE_BUILDING:
-                    self.graphics.draw_terrain(self.screen, 'building', screen_x, screen_y)
-                elif tile == TILE_TREE:
-                    self.graphics.draw_terrain(self.screen, 'tree', screen_x, screen_y)
-                elif tile == TILE_POND:
-                    self.graphics.draw_terrain(self.screen, 'water', screen_x, screen_y)
-                elif tile == TILE_GRASS:
-                    self.graphics.draw_terrain(self.screen, 'grass', screen_x, screen_y)
-                elif tile == TILE_FLOOR:
-                    self.graphics.draw_terrain(self.screen, 'floor', screen_x, screen_y)
-                elif tile == TILE_DOOR:
-                    self.graphics.draw_terrain(self.screen, 'door', screen_x, screen_y)
-                elif tile == TILE_WINDOW:
-                    self.graphics.draw_terrain(self.screen, 'window', screen_x, screen_y)
-                
-                # Draw prop if present
-                prop = self.city.props.get((x, y))
-                if prop:
-                    self.graphics.draw_natural_prop(self.screen, prop, screen_x, screen_y)
-                
-                # Draw furniture with proper sprites and states
-                furniture_map = {
-                    TILE_TOILET: 'toilet',
-                    TILE_OVEN: 'oven',
-                    TILE_BED: 'bed',
-                    TILE_DESK: 'desk',
-                    TILE_SHOP_SHELF: 'shop_shelf',
-                    TILE_TABLE: 'table',
-                    TILE_FRIDGE: 'fridge',
-                    TILE_COUNTER: 'counter',
-                    TILE_SINK: 'sink',
-                    TILE_TUB: 'tub'
-                }
-                
-                if tile in furniture_map:
-                    state = self.furniture_state.get((x, y), {}).get('state', 'normal')
-                    self.graphics.draw_furniture(
-                        self.screen,
-                        furniture_map[tile],
-                        screen_x,
-                        screen_y,
-                        state
-                    )
-
-    def draw_cars(self, camera_x, camera_y):
+                self.draw_tile(x, y, (x - camera_x) * TILE_SIZE, (y - camera_y) * TILE_SIZE)
+
+    def draw_tile(self, x, y, screen_x, screen_y, terrain=True, surface=None):
+        """Draw one map tile (terrain, prop and furniture) at the given position on surface (default: screen)."""
+        surface = surface or self.screen
+        tile = self.city.get_tile(x, y)
+        
+        # Draw terrain
+        if not terrain:
+            pass
+        elif tile == TILE_ROAD:
+            self.graphics.draw_terrain(surface, road_terrain(self.city, x, y), screen_x, screen_y)
+        elif tile in TERRAIN_NAMES:
+            self.graphics.draw_terrain(surface, TERRAIN_NAMES[tile], screen_x, screen_y, (x, y))
+        
+        # Draw prop if present
+        prop = self.city.props.get((x, y))
+        if prop:
+            self.graphics.draw_natural_prop(surface, prop, screen_x, screen_y)
+        
+        # Draw furniture with proper sprites and states
+        if tile in FURNITURE_NAMES:
+            state = self.furniture_state.get((x, y), {}).get('state', 'normal')
+            self.graphics.draw_furniture(
+                surface,
+                FURNITURE_NAMES[tile],
+                screen_x,
+                screen_y,
+                state
+            )
+
+    def invalidate_tile(self, x, y):
+        """Tell the map renderer a tile's look changed (door opened, furniture broken...)."""
+        if self.map_renderer:
+            self.map_renderer.invalidate_tile(x, y)
+        camera_x, camera_y = self.camera
+        self.dirty_rects.add(((x - camera_x) * TILE_SIZE, (y - camera_y) * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+
+    def draw_cars(self, camera_x, camera_y, alpha=None):
         """Draw all cars with proper sprites."""
         debug_log(f"Drawing {len(self.cars)} cars. Camera at ({camera_x}, {camera_y})")
-        for car in self.cars:
-            screen_x = (car.x - camera_x) * TILE_SIZE
-            screen_y = (car.y - camera_y) * TILE_SIZE
+        for car in self.within_draw_distance(self.cars):
+            ox, oy = self.motion_offset(car, alpha)
+            screen_x = int((car.x + ox - camera_x) * TILE_SIZE)
+            screen_y = int((car.y + oy - camera_y) * TILE_SIZE)
             debug_log(f"Drawing car {car.type} at screen pos ({screen_x}, {screen_y}) from world pos ({car.x}, {car.y})")
             
             # Set car_direction for correct sprite flipping
@@ -272,7 +442,7 @@ class Game:
                 car.type,
                 screen_x,
                 screen_y,
-                'horizontal' if car.direction in ('left', 'right') else 'vertical',
+                'horizontal' if car.direction.horizontal else 'vertical',
                 car.hp < car.max_hp
             )
 
@@ -324,11 +494,11 @@ class Game:
             elif tile == TILE_WINDOW:
                 interactables.append({'type': 'window', 'x': tx, 'y': ty, 'desc': 'Window'})
             # Check for cars
-            car = next((c for c in self.cars if (tx, ty) in c.get_tiles()), None)
+            car = self.occupancy.car_at(tx, ty)
             if car:
                 interactables.append({'type': 'car', 'x': tx, 'y': ty, 'desc': f"{car.type.title()} car", 'car': car})
             # Check for NPCs
-            npc = next((n for n in self.npcs if n.x == tx and n.y == ty), None)
+            npc = self.occupancy.npc_at(tx, ty)
             if npc:
                 interactables.append({'type': 'npc', 'x': tx, 'y': ty, 'desc': f"{npc.name}", 'npc': npc})
             # Check for shops
@@ -364,13 +534,14 @@ class Game:
                 self.show_message_and_wait("You peek through the window.")
             elif actions[choice] == "Break":
                 self.furniture_state[(tx, ty)] = {'type': tile, 'state': 'broken'}
+                self.invalidate_tile(tx, ty)
                 self.show_message_and_wait("You smash the window!")
         elif selected['type'] == 'car':
             car = selected['car']
             actions = ["Hijack", "Smash", "Inspect", "Enter", "Cancel"]
             choice = self.show_menu_and_wait(f"Interact with {car.type.title()} car:", actions)
             if actions[choice] == "Hijack":
-                if not getattr(self.player, 'in_car', None):
+                if not self.player.in_car:
                     if random.random() < 0.5:
                         if car.driver:
                             hijack_success = car.hijack(self.player)
@@ -391,7 +562,7 @@ class Game:
                 else:
                     self.show_message_and_wait("You're already in a car!")
             elif actions[choice] == "Enter":
-                if not getattr(self.player, 'in_car', None):
+                if not self.player.in_car:
                     if car.hp > 0:
                         if car.driver:
                             self.show_message_and_wait("Someone is already driving this car!")
@@ -429,7 +600,8 @@ class Game:
                     msg = f"You set {npc.name}'s corpse ablaze! The smell of burning flesh fills the air as their remains turn to ash."
                     self.show_message_and_wait(msg)
                     self.add_journal_entry(f"Incinerated {npc.name}'s remains")
-                    self.npcs.remove(npc)
+                    self.light_map.add_fire(npc.x, npc.y)
+                    self.despawn_npc(npc)
                 elif actions[choice] == "Desecrate":
                     acts = [
                         f"carve obscene symbols into {npc.name}'s flesh",
@@ -461,7 +633,7 @@ class Game:
                     npc.is_knocked_out = False
                     self.add_journal_entry(f"Finished off {npc.name} with a fatal blow to the {target_part}")
                 elif actions[choice] == "Draw On Face":
-                    if not hasattr(npc, 'vandalized'):
+                    if not npc.vandalized:
                         npc.vandalized = True
                         npc.appearance['graffiti'] = random.choice([
                             "mustache", "glasses", "beard", "clown makeup", 
@@ -473,7 +645,7 @@ class Game:
                     else:
                         self.show_message_and_wait(f"{npc.name}'s face is already decorated with {npc.appearance['graffiti']}.")
                 elif actions[choice] == "Rob":
-                    if not hasattr(npc, 'robbed'):
+                    if not npc.robbed:
                         npc.robbed = True
                         self.show_message_and_wait(f"You take {npc.name}'s valuables while they're unconscious.")
                         self.add_journal_entry(f"Robbed {npc.name} while unconscious")
@@ -575,6 +747,7 @@ class Game:
             self.show_message_and_wait(f"The {fname} is already moved.")
             return
         self.furniture_state[(x, y)] = {'state': 'moved'}
+        self.invalidate_tile(x, y)
         self.add_journal_entry(f"Moved {fname} at ({x}, {y})")
         self.show_message_and_wait(f"You push the {fname} aside. You can now walk through that space.")
 
@@ -583,6 +756,7 @@ class Game:
             self.show_message_and_wait(f"The {fname} is already broken.")
             return
         self.furniture_state[(x, y)] = {'state': 'broken'}
+        self.invalidate_tile(x, y)
         self.add_journal_entry(f"Broke {fname} at ({x}, {y})")
         self.show_message_and_wait(f"You smash the {fname}! It's now broken and useless.")
 
@@ -591,6 +765,7 @@ class Game:
             self.show_message_and_wait(f"The {fname} is already vandalized.")
             return
         self.furniture_state[(x, y)] = {'state': 'vandalized'}
+        self.invalidate_tile(x, y)
         self.add_journal_entry(f"Vandalized {fname} at ({x}, {y})")
         self.show_message_and_wait(f"You spray paint rude words on the {fname}. It's now vandalized.")
 
@@ -606,83 +781,65 @@ class Game:
         self.show_message_and_wait(desc)
 
     def show_menu_and_wait(self, prompt, options):
-        font = pygame.font.SysFont(None, 32)
-        selected = 0
-        while True:
-            self.screen.fill((0,0,0))
-            txt = font.render(prompt, True, (255,255,0))
-            self.screen.blit(txt, (40, 40))
-            for i, opt in enumerate(options):
-                color = (255,255,255) if i == selected else (180,180,180)
-                opt_txt = font.render(opt, True, color)
-                self.screen.blit(opt_txt, (60, 120 + i*40))
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_UP:
-                        selected = (selected - 1) % len(options)
-                    elif event.key == pygame.K_DOWN:
-                        selected = (selected + 1) % len(options)
-                    elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                        return selected
+        """Show a list of options over the game, returns the chosen index."""
+        font = get_font(32)
+        height = self.screen.get_height()
+        options_list = VirtualList(options, font, (60, 120, self.screen.get_width() - 120, height - 180), 40, wrap=True,
+                                   cache_size=self.settings.list_row_cache_size)
+
+        def draw(screen):
+            screen.blit(render_text(font, prompt, (255,255,0)), (40, 40))
+            options_list.draw(screen)
+
+        def on_key(event):
+            if event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                return options_list.selected
+            options_list.handle_key(event)
+            return None
+
+        return self.modal.run(draw, on_key)
 
     def show_message_and_wait(self, message, portrait=False, appearance=None):
         """Display a message and wait for player to press a key."""
-        font = pygame.font.SysFont(None, 32)
-        while True:
-            self.screen.fill((0, 0, 0))
-            lines = message.split('\n')
-            for i, line in enumerate(lines):
-                text = font.render(line, True, (255, 255, 255))
-                self.screen.blit(text, (40, 100 + i * 40))
+        font = get_font(32)
+        text = render_paragraph(message, font, (255, 255, 255), self.screen.get_width() - 80, 40)
+
+        def draw(screen):
+            screen.blit(text, (40, 100))
             # Optionally draw portrait (if used in NPC interactions)
             if portrait and appearance:
-                from stinkworld.ui.appearance import draw_portrait
-                draw_portrait(self.screen, 40, 40, 64, appearance)
-            inst = font.render("Press any key to continue...", True, (180, 180, 180))
-            self.screen.blit(inst, (40, 500))
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    return
+                draw_portrait(screen, 40, 40, 64, appearance)
+            screen.blit(render_text(font, "Press any key to continue...", (180, 180, 180)), (40, 500))
+
+        self.modal.run(draw, lambda event: True)
 
     def show_journal(self):
         self.debug("Journal opened.")
-        font = pygame.font.SysFont(None, 32)
-        bigfont = pygame.font.SysFont(None, 44)
-        scroll = 0
+        font = get_font(32)
+        bigfont = get_font(44)
         lines = self.player.journal if self.player.journal else ["(Your journal is empty.)"]
-        while True:
-            self.screen.fill((0,0,0))
-            title = bigfont.render("Journal", True, (255,255,0))
-            self.screen.blit(title, (40, 20))
-            for i, entry in enumerate(lines[scroll:scroll+12]):
-                txt = font.render(entry, True, (255,255,255))
-                self.screen.blit(txt, (60, 80 + i*32))
-            inst = font.render("Up/Down: Scroll  Esc: Close", True, (180,180,180))
-            self.screen.blit(inst, (40, 500))
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        return
-                    elif event.key == pygame.K_UP:
-                        scroll = max(0, scroll-1)
-                    elif event.key == pygame.K_DOWN:
-                        if scroll < max(0, len(lines)-12):
-                            scroll += 1
+        entries = VirtualList(lines, font, (60, 80, self.screen.get_width() - 120, 12 * 32), 32,
+                              selectable=False, colors=((255,255,255), (255,255,255)),
+                              cache_size=self.settings.list_row_cache_size)
+
+        def draw(screen):
+            screen.blit(render_text(bigfont, "Journal", (255,255,0)), (40, 20))
+            entries.draw(screen)
+            screen.blit(render_text(font, "Up/Down/PgUp/PgDn: Scroll  Type: Search  Esc: Close", (180,180,180)), (40, 500))
+
+        def on_key(event):
+            if event.key == pygame.K_ESCAPE:
+                return True
+            entries.handle_key(event)
+            return None
+
+        self.modal.run(draw, on_key)
 
     def show_stats_menu(self):
-        self.debug("Stats menu opened.")
         """Show the player stats and inventory menu."""
-        font = pygame.font.SysFont(None, 32)
-        bigfont = pygame.font.SysFont(None, 44)
+        self.debug("Stats menu opened.")
+        font = get_font(32)
+        bigfont = get_font(44)
         
         # Stats page
         STATS_PAGE = 0
@@ -692,19 +849,23 @@ class Game:
         JOURNAL_PAGE = 2
         
         current_page = STATS_PAGE
-        scroll = 0
+        width = self.screen.get_width()
+        white = ((255, 255, 255), (255, 255, 255))
+        inventory = VirtualList(self.player.inventory, font, (60, 80, width - 120, 12 * 30), 30,
+                                format_row=lambda item: f"- {item}", selectable=False, colors=white,
+                                cache_size=self.settings.list_row_cache_size)
+        journal = VirtualList(self.player.journal, font, (60, 80, width - 120, 12 * 30), 30,
+                              selectable=False, colors=white, cache_size=self.settings.list_row_cache_size)
         
-        while True:
-            self.screen.fill((0, 0, 0))
-            
+        def draw(screen):
             # Draw title
             if current_page == STATS_PAGE:
-                title = bigfont.render("Character Stats", True, (255, 255, 0))
+                title = render_text(bigfont, "Character Stats", (255, 255, 0))
             elif current_page == INVENTORY_PAGE:
-                title = bigfont.render("Inventory", True, (255, 255, 0))
+                title = render_text(bigfont, "Inventory", (255, 255, 0))
             else:
-                title = bigfont.render("Journal", True, (255, 255, 0))
-            self.screen.blit(title, (40, 20))
+                title = render_text(bigfont, "Journal", (255, 255, 0))
+            screen.blit(title, (40, 20))
             
             y = 80
             
@@ -736,61 +897,86 @@ class Game:
                     stats_text.append("None")
                 
                 for line in stats_text:
-                    text = font.render(line, True, (255, 255, 255))
-                    self.screen.blit(text, (60, y))
+                    screen.blit(render_text(font, line, (255, 255, 255)), (60, y))
                     y += 30
             
             elif current_page == INVENTORY_PAGE:
                 if self.player.inventory:
-                    for item in self.player.inventory[scroll:scroll+12]:
-                        text = font.render(f"- {item}", True, (255, 255, 255))
-                        self.screen.blit(text, (60, y))
-                        y += 30
+                    inventory.draw(screen)
                 else:
-                    text = font.render("(Inventory is empty)", True, (180, 180, 180))
-                    self.screen.blit(text, (60, y))
+                    screen.blit(render_text(font, "(Inventory is empty)", (180, 180, 180)), (60, y))
             
             else:  # Journal page
                 if self.player.journal:
-                    for entry in self.player.journal[scroll:scroll+12]:
-                        text = font.render(entry, True, (255, 255, 255))
-                        self.screen.blit(text, (60, y))
-                        y += 30
+                    journal.draw(screen)
                 else:
-                    text = font.render("(Journal is empty)", True, (180, 180, 180))
-                    self.screen.blit(text, (60, y))
+                    screen.blit(render_text(font, "(Journal is empty)", (180, 180, 180)), (60, y))
             
             # Draw controls
             controls = [
                 "Tab: Switch Page",
-                "Up/Down: Scroll",
+                "Up/Down/PgUp/PgDn: Scroll  Type: Search",
                 "Esc: Close"
             ]
-            y = self.screen.get_height() - 100
+            y = screen.get_height() - 100
             for control in controls:
-                text = font.render(control, True, (180, 180, 180))
-                self.screen.blit(text, (40, y))
+                screen.blit(render_text(font, control, (180, 180, 180)), (40, y))
                 y += 30
-            
-            pygame.display.flip()
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        return
-                    elif event.key == pygame.K_TAB:
-                        current_page = (current_page + 1) % 3
-                        scroll = 0
-                    elif event.key == pygame.K_UP:
-                        scroll = max(0, scroll - 1)
-                    elif event.key == pygame.K_DOWN:
-                        if current_page == INVENTORY_PAGE and scroll < len(self.player.inventory) - 12:
-                            scroll += 1
-                        elif current_page == JOURNAL_PAGE and scroll < len(self.player.journal) - 12:
-                            scroll += 1
+        
+        def on_key(event):
+            nonlocal current_page
+            if event.key == pygame.K_ESCAPE:
+                return True
+            elif event.key == pygame.K_TAB:
+                current_page = (current_page + 1) % 3
+            elif current_page == INVENTORY_PAGE:
+                inventory.handle_key(event)
+            elif current_page == JOURNAL_PAGE:
+                journal.handle_key(event)
+            return None
+        
+        self.modal.run(draw, on_key)
+
+    def show_shop_menu(self, shop_name):
+        """Browse a shop's stock and buy items."""
+        economy = self.economy
+        if economy.find_shop(shop_name) is None:
+            self.show_message_and_wait(f"{shop_name} has nothing for sale.")
+            return
+        stock = economy.get_shop_inventory(shop_name, self.time_system.hour)
+        if not stock:
+            self.show_message_and_wait(f"{shop_name} is closed.")
+            return
+        font = get_font(32)
+        bigfont = get_font(44)
+        height = self.screen.get_height()
+        items = VirtualList(stock, font, (60, 80, self.screen.get_width() - 120, height - 200), 32,
+                            format_row=lambda item: f"{item['name']} - {item['price']} {economy.currency_name}",
+                            cache_size=self.settings.list_row_cache_size)
+
+        def draw(screen):
+            screen.blit(render_text(bigfont, shop_name, (255, 255, 0)), (40, 20))
+            items.draw(screen)
+            money = f"Money: {self.player.money} {economy.currency_name}"
+            screen.blit(render_text(font, money, (255, 255, 255)), (40, height - 100))
+            screen.blit(render_text(font, "Enter: Buy  Type: Search  Esc: Leave", (180, 180, 180)), (40, height - 60))
+
+        def on_key(event):
+            if event.key == pygame.K_ESCAPE:
+                return True
+            elif event.key == pygame.K_RETURN:
+                return stock[items.selected]
+            items.handle_key(event)
+            return None
+
+        while True:
+            item = self.modal.run(draw, on_key)
+            if item is True:
+                return
+            bought, message = economy.buy_item(self.player, shop_name, item['name'], self.time_system.hour)
+            if bought:
+                self.add_journal_entry(f"Bought {item['name']} at {shop_name}")
+            self.show_message_and_wait(message)
 
     def show_pause_menu(self):
         """Basic pause menu that shows game options"""
@@ -804,14 +990,38 @@ class Game:
             self.show_message_and_wait("Game saved successfully")
 
     def spawn_npcs(self, count=50):
-        """Spawn NPCs in walkable areas."""
+        """Spawn NPCs in walkable areas, as population rows (see NPCPopulation.view).
+
+        Only tiles the population can walk on are used (see
+        PEDESTRIAN_TILES), so no one starts out stuck indoors. Tiles in city
+        blocks already holding the crowd's block_cap NPCs are passed over,
+        so no block gets more than its share.
+        """
+        passable = self.population.passable
+        walkable_tiles = [(x, y) for x, y in self.city.walkable_tiles() if passable[y, x]]
+        crowd = self.population.crowd
+        xy = self.population.positions(alive=True)
+        counts = crowd.block_counts(xy[:, 0], xy[:, 1])
+        full = 0
         for _ in range(count):
-            x, y = self.city.find_walkable_tile()
-            if x is not None and y is not None:
-                name = random_name()
-                npc = NPC(name, x, y)
-                self.npcs.append(npc)
-                self.debug(f"Spawned NPC {name} at ({x}, {y})")
+            for _ in range(SPAWN_ATTEMPTS):
+                x, y = self.city.find_walkable_tile(walkable_tiles)
+                if x is None or y is None:
+                    break
+                block = crowd.blocks(x, y)
+                if counts[block] < crowd.block_cap:
+                    counts[block] += 1
+                    add_npc_record(self.population, x, y)
+                    break
+            else:
+                full += 1
+        if full:
+            self.debug(f"{full} NPCs not spawned: every block tried was full")
+        self.debug(f"Spawned {len(self.population)} NPCs ({self.population.nbytes()} bytes each)")
+
+    def despawn_npc(self, npc):
+        """Take an NPC out of the world."""
+        self.population.remove(npc)
 
     def spawn_cars(self, count=30):
         """Spawn cars at random road positions."""
@@ -830,7 +1040,9 @@ class Game:
         for _ in range(count):
             x, y = random.choice(road_tiles)
             car_type = random.choice(['sedan', 'truck', 'sports'])
-            self.cars.append(Car(x, y, car_type))
+            car = Car(x, y, car_type)
+            self.cars.append(car)
+            self.occupancy.add(car, CAR)
             debug_log(f"[CAR SPAWN] Spawned {car_type} at ({x}, {y})")
 
     def init_player(self):
@@ -889,6 +1101,7 @@ class Game:
         self.player = Player(self.settings)
         self.player.x = spawn_x
         self.player.y = spawn_y
+        self.player.occupancy = self.occupancy
         print(f"\n=== ACTUAL PLAYER POSITION ===")
         print(f"Player.x: {self.player.x}")
         print(f"Player.y: {self.player.y}")
@@ -906,89 +1119,253 @@ class Game:
         self.turn += 1
         
         # Force updates when time advances
-        for npc in self.npcs:
-            npc.update(self.city.map, self.traffic_lights, self.npcs)
+        self.step_population()
         
         for car in self.cars:
             if not car.driver:
                 car.update_ai(self.city.map, self.traffic_lights, self.npcs)
+        self.end_turn()
 
-    def render_game(self):
-        """Handle all rendering operations."""
-        # Calculate camera position
-        if hasattr(self.player, 'in_car') and self.player.in_car:
-            car = self.player.in_car
-            camera_x = max(0, min(car.x - VIEWPORT_WIDTH // 2, self.city.width - VIEWPORT_WIDTH))
-            camera_y = max(0, min(car.y - VIEWPORT_HEIGHT // 2, self.city.height - VIEWPORT_HEIGHT))
-        else:
-            camera_x = max(0, min(self.player.x - VIEWPORT_WIDTH // 2, self.city.width - VIEWPORT_WIDTH))
-            camera_y = max(0, min(self.player.y - VIEWPORT_HEIGHT // 2, self.city.height - VIEWPORT_HEIGHT))
-        
-        # Clear screen
-        self.screen.fill((0, 0, 0))
-        
-        # Draw map and entities
-        self.draw_map(camera_x, camera_y)
-        self.draw_cars(camera_x, camera_y)
-        
-        # Draw traffic lights
-        for light in self.traffic_lights:
-            light.draw(self.screen, camera_x, camera_y)
+    def camera_focus(self):
+        """The entity the camera follows: the player's car when driving, else the player."""
+        if self.player.in_car:
+            return self.player.in_car
+        return self.player
+
+    def camera_position(self):
+        """Top-left tile of the viewport, centred on the focus and clamped to the map."""
+        focus = self.camera_focus()
+        camera_x = max(0, min(focus.x - VIEWPORT_WIDTH // 2, self.city.width - VIEWPORT_WIDTH))
+        camera_y = max(0, min(focus.y - VIEWPORT_HEIGHT // 2, self.city.height - VIEWPORT_HEIGHT))
+        return camera_x, camera_y
+
+    def end_turn(self):
+        """Bookkeeping after every turn: exploration and light sources."""
+        self.update_exploration()
+        self.light_map.update_sources()
+
+    def within_draw_distance(self, entities):
+        """The entities close enough to the camera focus to be drawn at the current quality."""
+        distance = self.quality.preset['draw_distance']
+        if distance is None:
+            return entities
+        focus = self.camera_focus()
+        return [entity for entity in entities
+                if abs(entity.x - focus.x) <= distance and abs(entity.y - focus.y) <= distance]
+
+    def view_rect(self, camera_x, camera_y):
+        """Tiles x0 <= x < x1, y0 <= y < y1 whose NPCs get drawn: on or next to the viewport and within draw distance."""
+        # A tween can slide an NPC in from next to the viewport; the far edges also cover a partly visible last row or column
+        x0, y0 = camera_x - 1, camera_y - 1
+        x1, y1 = camera_x + VIEWPORT_WIDTH + 2, camera_y + VIEWPORT_HEIGHT + 2
+        distance = self.quality.preset['draw_distance']
+        if distance is not None:
+            focus = self.camera_focus()
+            x0, y0 = max(x0, focus.x - distance), max(y0, focus.y - distance)
+            x1, y1 = min(x1, focus.x + distance + 1), min(y1, focus.y + distance + 1)
+        return x0, y0, x1, y1
+
+    def npcs_in_view(self, camera_x, camera_y):
+        """NPCs in view_rect(), in spawn order; these are made into objects if they aren't already."""
+        population = self.population
+        return [population.view(row) for row in population.in_rect(*self.view_rect(camera_x, camera_y)).tolist()]
+
+    def update_exploration(self):
+        """Mark everything in the player's viewport as explored."""
+        camera_x, camera_y = self.camera_position()
+        self.minimap.explore(camera_x, camera_y, camera_x + VIEWPORT_WIDTH, camera_y + VIEWPORT_HEIGHT)
+
+    def render_game(self, alpha=None):
+        """Handle all rendering operations.
+
+        alpha is how far the current simulation tick has progressed; with it,
+        entities that just moved are drawn sliding between tiles. None draws
+        everything at its tile.
+        """
+        frame_start = time.perf_counter()
+        camera_x, camera_y = self.camera_position()
         
-        # Draw NPCs
-        for npc in self.npcs:
-            npc.draw(self.screen, camera_x, camera_y)
+        timings = self.frame_timings
+        for phase in ('map', 'entities', 'overlays', 'hud'):
+            timings[phase] = 0.0
+        hud = self.hud_layout()
+        mode = self.plan_frame(camera_x, camera_y, hud, alpha)
+        if mode == FRAME_IDLE:
+            return
+        self.screen.set_clip(self.dirty_rects.clip)
+        start = time.perf_counter()
         
-        # Draw player (only if not in car)
-        if not hasattr(self.player, 'in_car') or not self.player.in_car:
-            self.player.draw(self.screen, camera_x, camera_y)
+        # Clear screen and draw map
+        zoom = self.map_zoom()
+        if zoom != 1.0:
+            focus = self.camera_focus()
+            self.map_lod.draw(self.screen, (focus.x, focus.y), zoom)
+        elif self.map_renderer:
+            self.map_renderer.draw(self.screen, camera_x, camera_y)
+        else:
+            self.screen.fill((0, 0, 0))
+            self.draw_map(camera_x, camera_y)
+        mark = time.perf_counter()
+        timings['map'] = mark - start
+        start = mark
+        if zoom != 1.0:
+            # Zoomed out: density dots instead of sprites
+            self.map_lod.draw_entities(self.screen)
+        else:
+            self.draw_cars(camera_x, camera_y, alpha)
+            
+            # Draw traffic lights
+            for light in self.traffic_lights:
+                light.draw(self.screen, camera_x, camera_y)
+            
+            # Draw NPCs (shifting the camera by the tween offset draws them between tiles)
+            detail = self.quality.preset['portrait_detail']
+            for npc in self.npcs_in_view(camera_x, camera_y):
+                ox, oy = self.motion_offset(npc, alpha)
+                npc.draw(self.screen, camera_x - ox, camera_y - oy, detail)
+            
+            # Draw player (only if not in car)
+            if not self.player.in_car:
+                ox, oy = self.motion_offset(self.player, alpha)
+                self.player.draw(self.screen, camera_x - ox, camera_y - oy)
+        mark = time.perf_counter()
+        timings['entities'] = mark - start
+        start = mark
         
-        # Apply lighting based on time of day
-        self.time_system.apply_lighting(self.screen)
+        # Apply lighting: ambient light for the time of day plus lamps, windows, headlights and fires
+        if zoom != 1.0:
+            self.light_map.apply_ambient(self.screen)
+        else:
+            self.light_map.apply(self.screen)
         # --- WEATHER SYSTEM: draw weather effects after lighting ---
-        time_of_day_lighting = self.time_system.get_lighting_color()
-        self.weather_system.apply_weather_effects(self.screen, time_of_day_lighting)
+        # Time of day is already in the light map, so only the weather's own tint is added
+        self.weather_system.apply_weather_effects(self.screen, (0, 0, 0, 0))
+        mark = time.perf_counter()
+        timings['overlays'] = mark - start
+        start = mark
         
         # Draw HUD
-        self.draw_hud()
+        self.draw_hud(hud)
+        focus = self.camera_focus()
+        self.minimap.draw(self.screen, (focus.x, focus.y), (camera_x, camera_y, VIEWPORT_WIDTH, VIEWPORT_HEIGHT))
+        timings['hud'] = time.perf_counter() - start
         
         # Update display
-        pygame.display.flip()
-        self.clock.tick(30)  # Lock to 30 FPS
+        self.screen.set_clip(None)
+        self.dirty_rects.present(mode)
+        self.quality.record(time.perf_counter() - frame_start)
 
-    def draw_hud(self):
-        # Draw HUD at the bottom of the screen
-        font = pygame.font.SysFont(None, 24)
+    def plan_frame(self, camera_x, camera_y, hud, alpha=None):
+        """Collect what changed since the last frame and pick idle, partial or full drawing."""
+        tracker = self.dirty_rects
+        weather = self.weather_system
+        # Anything that touches every pixel forces a full frame
+        scene = (camera_x, camera_y, self.time_system.hour, weather.current_weather, self.zoom_level)
+        if scene != self.last_scene:
+            tracker.invalidate_all()
+            self.last_scene = scene
+        if self.map_zoom() != 1.0:
+            tracker.invalidate_all()  # Dots move by sub-tile amounts; a zoomed frame is a few blits anyway
+        if 'particles' in weather.get_current_weather() or weather.particles.count:
+            tracker.invalidate_all()  # Weather particles cover the whole screen
+        self.camera = (camera_x, camera_y)
+        
+        # Light that changed (headlights, fires, windows), grown by a tile for the smooth upscale
+        lit = self.light_map.update(camera_x, camera_y, VIEWPORT_WIDTH, VIEWPORT_HEIGHT)
+        if lit and not self.light_map.is_daylight():
+            x, y, w, h = lit
+            tracker.add(((x - 1) * TILE_SIZE, (y - 1) * TILE_SIZE, (w + 2) * TILE_SIZE, (h + 2) * TILE_SIZE))
+        
+        # Entities: old and new rects of anything that moved or changed (untracked ones are erased)
+        for car in self.within_draw_distance(self.cars):
+            tracker.track(('car', id(car)), (car.x, car.y, car.direction, car.hp),
+                          self.entity_rect(car, camera_x, camera_y, alpha))
+        for light in self.traffic_lights:
+            tracker.track(('light', id(light)), (light.x, light.y, light.state),
+                          self.entity_rect(light, camera_x, camera_y))
+        for npc in self.npcs_in_view(camera_x, camera_y):
+            tracker.track(('npc', npc.ident), (npc.x, npc.y, npc.is_dead, npc.is_knocked_out),
+                          self.entity_rect(npc, camera_x, camera_y, alpha))
+        if not self.player.in_car:
+            player = self.player
+            tracker.track('player', (player.x, player.y, player.direction, player.hp,
+                                     player.is_knocked_out, len(player.injuries)),
+                          self.entity_rect(player, camera_x, camera_y, alpha))
+        
+        focus = self.camera_focus()
+        tracker.track('minimap', (self.minimap.version, focus.x, focus.y), self.minimap.rect().inflate(2, 2))
+        
+        # HUD fields whose text changed
+        for field, text, color, pos in hud:
+            surface = self.hud_text(field, text, color)
+            tracker.track(('hud', field), (text, color), surface.get_rect(topleft=pos))
+        tracker.end_tracking()
+        return tracker.plan()
+
+    def entity_rect(self, entity, camera_x, camera_y, alpha=None):
+        """Screen rect an entity covers (cars span two tiles), including any tween offset."""
+        ox, oy = self.motion_offset(entity, alpha)
+        rect = pygame.Rect(int((entity.x + ox - camera_x) * TILE_SIZE), int((entity.y + oy - camera_y) * TILE_SIZE),
+                           TILE_SIZE, TILE_SIZE)
+        if isinstance(entity, Car):
+            if entity.direction.horizontal:
+                rect.width *= 2
+            else:
+                rect.height *= 2
+        return rect
+
+    def hud_text(self, field, text, color):
+        """Return the HUD surface for a field, re-rendering only when its text changed."""
+        cached = self.hud_fields.get(field)
+        if cached and cached[0] == text and cached[1] == color:
+            return cached[2]
+        surface = get_font(24).render(text, True, color)
+        self.hud_fields[field] = (text, color, surface)
+        return surface
+
+    def hud_layout(self):
+        """Return the HUD as (field, text, color, position) entries."""
+        # HUD at the bottom of the screen
+        height = self.screen.get_height()
+        width = self.screen.get_width()
+        layout = []
         # Player stats
         hp_text = f"HP: {self.player.hp}/{self.player.max_hp}"
-        hp_surface = font.render(hp_text, True, (255, 255, 255))
-        self.screen.blit(hp_surface, (10, self.screen.get_height() - 80))
+        layout.append(('hp', hp_text, (255, 255, 255), (10, height - 80)))
         # Time and date
         time_text = f"Time: {self.time_system.format_time()}"
-        time_surface = font.render(time_text, True, (255, 255, 255))
-        self.screen.blit(time_surface, (10, self.screen.get_height() - 60))
+        layout.append(('time', time_text, (255, 255, 255), (10, height - 60)))
         date_text = f"Date: {self.time_system.format_date()}"
-        date_surface = font.render(date_text, True, (255, 255, 255))
-        self.screen.blit(date_surface, (10, self.screen.get_height() - 40))
+        layout.append(('date', date_text, (255, 255, 255), (10, height - 40)))
         # Player position
         pos_text = f"Pos: ({self.player.x}, {self.player.y})"
-        pos_surface = font.render(pos_text, True, (255, 255, 255))
-        self.screen.blit(pos_surface, (10, self.screen.get_height() - 20))
+        layout.append(('pos', pos_text, (255, 255, 255), (10, height - 20)))
         # Controls reminder - changes based on if player is in a car
-        if hasattr(self.player, 'in_car') and self.player.in_car:
+        if self.player.in_car:
             car_type = self.player.in_car.type
             controls_text = f"SPACE: Exit {car_type}  WASD: Drive  E: Interact  J: Journal  ESC: Menu"
-            # Draw car status
+            # Car status
             car_hp = self.player.in_car.hp
             car_max_hp = self.player.in_car.max_hp
             car_status = f"Vehicle: {car_type} ({car_hp}/{car_max_hp} HP)"
-            car_status_surface = font.render(car_status, True, (255, 255, 0))
-            self.screen.blit(car_status_surface, (self.screen.get_width() - 300, self.screen.get_height() - 40))
+            layout.append(('car', car_status, (255, 255, 0), (width - 300, height - 40)))
         else:
             controls_text = "E: Interact  J: Journal  WASD: Move  ESC: Menu"
-        controls_surface = font.render(controls_text, True, (180, 180, 180))
-        self.screen.blit(controls_surface, (self.screen.get_width() - 300, self.screen.get_height() - 20))
+        layout.append(('controls', controls_text, (180, 180, 180), (width - 300, height - 20)))
         # --- WEATHER SYSTEM: show weather in HUD ---
         weather_text = self.weather_system.get_description()
-        weather_surface = font.render(weather_text, True, (200, 200, 255))
-        self.screen.blit(weather_surface, (10, self.screen.get_height() - 100))
\ No newline at end of file
+        layout.append(('weather', weather_text, (200, 200, 255), (10, height - 100)))
+        zoom = self.map_zoom()
+        if zoom != 1.0:
+            layout.append(('zoom', f"Zoom: 1/{round(1 / zoom)}  -/=: Zoom", (180, 180, 180), (width - 300, height - 60)))
+        if self.settings.debug_mode:
+            layout.append(('quality', self.quality.describe(), (180, 180, 180), (width - 300, height - 80)))
+            layout.append(('population', self.population.describe(), (180, 180, 180), (width - 460, height - 100)))
+            layout.append(('schedule', self.schedule.describe(), (180, 180, 180), (width - 460, height - 120)))
+            layout.append(('behavior', self.behavior.describe(), (180, 180, 180), (width - 460, height - 140)))
+        return layout
+
+    def draw_hud(self, layout=None):
+        """Draw the HUD fields."""
+        for field, text, color, pos in layout or self.hud_layout():
+            self.screen.blit(self.hud_text(field, text, color), pos)
@@ -0,0 +1,44 @@
+"""Fixed-timestep clock for the main loop."""
+import time
+from stinkworld.core.settings import SIM_TICK_RATE, MAX_FRAME_TIME, MAX_TICKS_PER_FRAME
+
+class FixedTimestepLoop:
+    """Turns variable frame times into a whole number of fixed simulation ticks.
+
+    Real time is added to an accumulator every frame and spent in steps of
+    1 / tick_rate seconds; what is left over becomes `alpha`, how far the
+    next tick has progressed, which rendering uses to interpolate. Frame
+    time is clamped (a stall or an open menu doesn't trigger a burst of
+    catch-up ticks) and at most max_ticks run per frame, so a slow machine
+    slows the simulation down instead of spiralling.
+    """
+
+    def __init__(self, tick_rate=SIM_TICK_RATE, max_frame_time=MAX_FRAME_TIME, max_ticks=MAX_TICKS_PER_FRAME):
+        """Initialize loop clock."""
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_frame_time = max_frame_time
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.last_time = None
+        self.alpha = 0.0
+        self.ticks = 0  # Ticks run since the loop started
+
+    def reset(self):
+        """Forget elapsed time, e.g. after a blocking menu."""
+        self.last_time = time.perf_counter()
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def advance(self, now=None):
+        """Account for the time since the last call, returns how many ticks to run now."""
+        now = time.perf_counter() if now is None else now
+        if self.last_time is None:
+            self.last_time = now
+        self.accumulator += min(now - self.last_time, self.max_frame_time)
+        self.last_time = now
+        ticks = min(int(self.accumulator / self.dt), self.max_ticks)
+        self.accumulator = min(self.accumulator - ticks * self.dt, self.dt)
+        self.alpha = self.accumulator / self.dt
+        self.ticks += ticks
+        return ticks
@@ -1,6 +1,7 @@
 """
 StinkWorld - Main Game Entry Point
 """
+import gc
 import pygame
 import sys
 import os
@@ -42,12 +43,20 @@ def main():
                     # Preserve the game's calculated spawn position
                     player.x = game.player.x
                     player.y = game.player.y
+                    player.occupancy = game.occupancy
                     game.player = player
                     
                     # DEBUG: Verify final position
                     print(f"[DEBUG] Final player position: ({game.player.x}, {game.player.y})")
                     
-                    game.run()
+                    # The city and population live for the whole game: keep the collector from
+                    # rescanning them, then let it have them back for the next game
+                    gc.collect()
+                    gc.freeze()
+                    try:
+                        game.run()
+                    finally:
+                        gc.unfreeze()
             elif choice == 2:  # Exit
                 running = False
         pygame.quit()
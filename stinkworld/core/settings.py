@@ -7,6 +7,28 @@ SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 FPS = 60
 TILE_SIZE = 32
+MAP_RENDERER = 'scroll'  # 'scroll' (ring buffer), 'gather' (NumPy whole-viewport terrain) or 'tiles' (one blit per tile)
+SCROLL_BUFFER_MARGIN = 4  # Tiles pre-rendered around the viewport by the scroll renderer
+DIRTY_RECT_MAX_COVERAGE = 0.5  # Above this fraction of the screen, redraw and flip everything
+MAP_ZOOM_LEVELS = (1.0, 0.5, 0.25, 0.125, 0.0625, 0.03125)  # Zoom factors cycled with -/=, 1.0 is the normal view
+LOD_TILE_SIZES = (16, 8, 4, 1)  # Pixels per tile of the pre-rendered zoomed-out map levels
+LOD_CHUNK_SIZE = 32  # Tiles per side of a cached zoomed-out map chunk
+LOD_CACHE_CHUNKS = 256  # Zoomed-out chunks kept before the least recently used is dropped
+MINIMAP_SIZE = 160  # Pixels along the minimap's longer side
+MINIMAP_MARGIN = 10  # Pixels between the minimap and the screen edge
+STREET_LAMP_SPACING = 8  # Roughly one street lamp per this many road-edge tiles
+RENDER_QUALITY = 'auto'  # 'auto' (adjusted to hold FRAME_BUDGET) or a fixed 'low', 'medium' or 'high'
+FRAME_BUDGET = 0.8 / FPS  # Seconds of drawing per frame the quality governor aims for
+
+# Simulation loop settings
+GAME_MODE = 'turn'  # 'turn' (the world moves when the player acts) or 'realtime' (the world moves on its own)
+SIM_TICK_RATE = 30  # Fixed simulation ticks per second; rendering runs at FPS independently
+MOVE_REPEAT_TICKS = 10  # Ticks between player moves while a direction key is held
+MOVE_TWEEN_TICKS = 5  # Ticks over which a move is interpolated on screen
+REALTIME_TURN_TICKS = 15  # Ticks between world turns in realtime mode
+SIM_TURN_BUDGET = 0.008  # Seconds per frame spent on a world turn before it continues next frame
+MAX_FRAME_TIME = 0.25  # Longest frame time credited to the simulation
+MAX_TICKS_PER_FRAME = 5  # Most simulation ticks run before a frame is rendered
 
 # Map settings
 MAP_WIDTH = 100
@@ -14,6 +36,10 @@ MAP_HEIGHT = 100
 ROAD_SPACING = 12  # Space between roads
 ROAD_WIDTH = 2    # Width of roads in tiles
 
+# Population settings
+INITIAL_NPC_COUNT = 50  # NPCs spawned at game start
+INITIAL_CAR_COUNT = 30  # Cars spawned at game start
+
 # Tile types
 TILE_GRASS = 0
 TILE_ROAD = 1
@@ -62,6 +88,16 @@ PLAYER_MAX_STRESS = 100
 NPC_SPEED = 3
 NPC_MAX_HP = 100
 NPC_VIEW_DISTANCE = 8
+NPC_WANDER_CHANCE = 0.3  # Chance an idle pedestrian steps to a neighbouring tile each turn
+NPC_ACTIVE_RADIUS = 24  # Tiles from the player within which NPCs are simulated every turn
+NPC_MIDDLE_RADIUS = 64  # Out to here they move every NPC_MIDDLE_INTERVAL turns, in one multi-step jump
+NPC_MIDDLE_INTERVAL = 4
+NPC_FAR_INTERVAL = 30  # Turns between updates of NPCs further out, which hop between building entrances
+NPC_VIEW_CACHE_SIZE = 1024 # NPC objects made from their seeds that are kept (LRU) before being dropped
+NPC_CROWD_RADIUS = 2  # Tiles around a tile whose NPCs count towards its crowd density
+NPC_CROWD_AVOIDANCE = 0.5  # How much wandering pedestrians prefer steps onto less crowded tiles
+NPC_LANE_FOLLOWING = 1.0  # How much they prefer steps along the local flow of walkers
+NPC_BLOCK_CAP = 80  # Most NPCs spawned into, or hopping into, one city block (ROAD_SPACING tiles square)
 
 # Time settings
 GAME_HOUR = 1000  # milliseconds per game hour
@@ -70,6 +106,7 @@ DAY_LENGTH = 24 * GAME_HOUR
 # Weather settings
 WEATHER_CHANGE_CHANCE = 0.1
 WEATHER_TYPES = ['clear', 'cloudy', 'rain', 'storm']
+WEATHER_MAX_PARTICLES = 10000  # Capacity of the weather particle engine
 
 # Traffic settings
 GREEN_TIME = 180  # Time in frames for each traffic light state
@@ -99,6 +136,11 @@ UI_TEXT_COLOR = (255, 255, 255)
 UI_HIGHLIGHT_COLOR = (255, 255, 0)
 UI_FONT = None  # Use system default font
 UI_COLOR = UI_TEXT_COLOR
+TEXT_CACHE_SIZE = 512  # Max rendered text surfaces kept by the font manager
+TEXT_LAYOUT_CACHE_SIZE = 256  # Max wrapped paragraphs (line lists and surfaces each) kept by the text layout
+ASSET_CACHE_PATH = '.cache/sprites.bin'  # Baked sprite cache, relative to the working directory
+LIST_ROW_CACHE_SIZE = 128  # Rendered rows kept by each list widget
+MODAL_WAIT_MS = 1000  # Longest a dialog sleeps waiting for input before checking again
 
 # Sound settings
 SOUND_ENABLED = True
@@ -109,6 +151,8 @@ SFX_VOLUME = 0.7
 DEBUG_MODE = False
 SHOW_HITBOXES = False
 SHOW_PATHFINDING = False
+CAPTURE_DIR = 'captures'  # Screenshots (F12) and recordings (Shift+F12), relative to the working directory
+CAPTURE_QUEUE_DEPTH = 4  # Frames waiting for the encoder before new captures are dropped
 LOG_LEVEL = 'INFO'
 
 # Prop customization settings
@@ -131,12 +175,36 @@ class Settings:
         self.screen_height = SCREEN_HEIGHT
         self.fps = FPS
         self.tile_size = TILE_SIZE
+        self.map_renderer = MAP_RENDERER
+        self.scroll_buffer_margin = SCROLL_BUFFER_MARGIN
+        self.dirty_rect_max_coverage = DIRTY_RECT_MAX_COVERAGE
+        self.map_zoom_levels = MAP_ZOOM_LEVELS
+        self.lod_tile_sizes = LOD_TILE_SIZES
+        self.lod_chunk_size = LOD_CHUNK_SIZE
+        self.lod_cache_chunks = LOD_CACHE_CHUNKS
+        self.minimap_size = MINIMAP_SIZE
+        self.minimap_margin = MINIMAP_MARGIN
+        self.street_lamp_spacing = STREET_LAMP_SPACING
+        self.render_quality = RENDER_QUALITY
+        self.frame_budget = FRAME_BUDGET
+        
+        # Simulation loop settings
+        self.game_mode = GAME_MODE
+        self.sim_tick_rate = SIM_TICK_RATE
+        self.move_repeat_ticks = MOVE_REPEAT_TICKS
+        self.move_tween_ticks = MOVE_TWEEN_TICKS
+        self.realtime_turn_ticks = REALTIME_TURN_TICKS
+        self.sim_turn_budget = SIM_TURN_BUDGET
+        self.max_frame_time = MAX_FRAME_TIME
+        self.max_ticks_per_frame = MAX_TICKS_PER_FRAME
         
         # Map settings
         self.map_width = MAP_WIDTH
         self.map_height = MAP_HEIGHT
         self.road_spacing = ROAD_SPACING
         self.road_width = ROAD_WIDTH
+        self.initial_npc_count = INITIAL_NPC_COUNT
+        self.initial_car_count = INITIAL_CAR_COUNT
         
         # Colors
         self.color_black = COLOR_BLACK
@@ -161,6 +229,16 @@ class Settings:
         self.npc_speed = NPC_SPEED
         self.npc_max_hp = NPC_MAX_HP
         self.npc_view_distance = NPC_VIEW_DISTANCE
+        self.npc_wander_chance = NPC_WANDER_CHANCE
+        self.npc_active_radius = NPC_ACTIVE_RADIUS
+        self.npc_middle_radius = NPC_MIDDLE_RADIUS
+        self.npc_middle_interval = NPC_MIDDLE_INTERVAL
+        self.npc_far_interval = NPC_FAR_INTERVAL
+        self.npc_view_cache_size = NPC_VIEW_CACHE_SIZE
+        self.npc_crowd_radius = NPC_CROWD_RADIUS
+        self.npc_crowd_avoidance = NPC_CROWD_AVOIDANCE
+        self.npc_lane_following = NPC_LANE_FOLLOWING
+        self.npc_block_cap = NPC_BLOCK_CAP
         
         # Time settings
         self.game_hour = GAME_HOUR
@@ -169,6 +247,7 @@ class Settings:
         # Weather settings
         self.weather_change_chance = WEATHER_CHANGE_CHANCE
         self.weather_types = WEATHER_TYPES.copy()
+        self.weather_max_particles = WEATHER_MAX_PARTICLES
         
         # Traffic settings
         self.traffic_light_green_time = TRAFFIC_LIGHT_GREEN_TIME
@@ -195,6 +274,11 @@ class Settings:
         self.ui_highlight_color = UI_HIGHLIGHT_COLOR
         self.ui_font = UI_FONT
         self.ui_color = UI_COLOR
+        self.text_cache_size = TEXT_CACHE_SIZE
+        self.text_layout_cache_size = TEXT_LAYOUT_CACHE_SIZE
+        self.asset_cache_path = ASSET_CACHE_PATH
+        self.list_row_cache_size = LIST_ROW_CACHE_SIZE
+        self.modal_wait_ms = MODAL_WAIT_MS
         
         # Sound settings
         self.sound_enabled = SOUND_ENABLED
@@ -205,6 +289,8 @@ class Settings:
         self.debug_mode = DEBUG_MODE
         self.show_hitboxes = SHOW_HITBOXES
         self.show_pathfinding = SHOW_PATHFINDING
+        self.capture_dir = CAPTURE_DIR
+        self.capture_queue_depth = CAPTURE_QUEUE_DEPTH
         self.log_level = LOG_LEVEL
 
         # Prop customization
@@ -0,0 +1,67 @@
+"""Behavior trees NPCs decide with, one per personality (run by stinkworld.systems.behavior)."""
+
+# A tree is nested tuples, (kind, ...):
+#   ('sequence', child, ...)  children in order until one fails
+#   ('selector', child, ...)  children in order until one succeeds
+#   ('condition', name)       succeeds if the named condition holds
+#   ('action', name)          does the named action; 'running' ones carry on next turn
+#   ('wait', turns)           suspends for that many turns, then succeeds
+#   ('wait_for', event)       suspends until the event ('player_near', 'player_gone'), then succeeds
+# Every tree starts with a wait_for, so an NPC costs nothing until that event,
+# and goes back to it once the tree is done.
+
+# Pieces shared by several personalities
+WATCH = ('sequence', ('action', 'face_player'), ('wait', 3))
+FLEE_IF_HURT = ('sequence', ('condition', 'hurt'), ('action', 'flee_player'))
+KEEP_AWAY_IF_DISLIKED = ('sequence', ('condition', 'dislikes_player'), WATCH)
+
+BEHAVIORS = {
+    'friendly': ('sequence',
+                 ('wait_for', 'player_near'),
+                 ('selector',
+                  FLEE_IF_HURT,
+                  KEEP_AWAY_IF_DISLIKED,
+                  ('sequence', ('action', 'approach_player'), ('action', 'face_player'), ('wait', 30))),
+                 ('wait_for', 'player_gone')),
+    'grumpy': ('sequence',
+               ('wait_for', 'player_near'),
+               ('selector',
+                ('sequence', ('condition', 'next_to_player'), ('action', 'step_away')),
+                WATCH),
+               ('wait', 10)),
+    'timid': ('sequence',
+              ('wait_for', 'player_near'),
+              ('action', 'flee_player'),
+              ('wait', 20)),
+    'aggressive': ('sequence',
+                   ('wait_for', 'player_near'),
+                   ('selector',
+                    FLEE_IF_HURT,
+                    ('sequence', ('condition', 'dislikes_player'), ('action', 'turn_hostile'),
+                     ('action', 'approach_player'), WATCH),
+                    WATCH),
+                   ('wait_for', 'player_gone'),
+                   ('action', 'calm_down')),
+    'forgiving': ('sequence',
+                  ('wait_for', 'player_near'),
+                  ('selector',
+                   ('sequence', ('condition', 'hostile'), ('wait', 30), ('action', 'calm_down')),
+                   WATCH),
+                  ('wait_for', 'player_gone')),
+    'grudgeful': ('sequence',
+                  ('wait_for', 'player_near'),
+                  ('selector',
+                   ('sequence', ('condition', 'dislikes_player'), ('action', 'turn_hostile'), WATCH),
+                   WATCH),
+                  ('wait_for', 'player_gone')),
+    'chatty': ('sequence',
+               ('wait_for', 'player_near'),
+               ('selector',
+                FLEE_IF_HURT,
+                KEEP_AWAY_IF_DISLIKED,
+                ('sequence', ('action', 'approach_player'), ('action', 'face_player'), ('wait', 10)))),
+    'quiet': ('sequence',
+              ('wait_for', 'player_near'),
+              WATCH,
+              ('wait_for', 'player_gone')),
+}
@@ -40,8 +40,8 @@ def get_hair_offset(face_shape, tile_size):
         return tile_size//6
     return 0
 
-def generate_vitiligo_patches(tile_size, intensity, face_shape):
-    """Generate static vitiligo patch positions"""
+def generate_vitiligo_patches(tile_size, intensity, face_shape, rng=random):
+    """Generate static vitiligo patch positions (rng: a random.Random, or the random module)"""
     if intensity <= 0:
         return []
         
@@ -49,9 +49,9 @@ def generate_vitiligo_patches(tile_size, intensity, face_shape):
     num_patches = int(10 * intensity)
     
     for _ in range(num_patches):
-        patch_x = random.randint(0, tile_size)
-        patch_y = random.randint(0, tile_size)
-        patch_size = random.randint(tile_size//10, tile_size//4)
+        patch_x = rng.randint(0, tile_size)
+        patch_y = rng.randint(0, tile_size)
+        patch_size = rng.randint(tile_size//10, tile_size//4)
         
         # Adjust patch position based on face shape
         if face_shape == 'oval':
@@ -161,22 +161,22 @@ def draw_portrait(surface, x, y, tile_size, appearance):
     }
     pygame.draw.rect(surface, clothes_colors.get(appearance['clothes'], (180,180,180)), (x, y+tile_size-8, tile_size, 8))
 
-def generate_npc_appearance(tile_size=32):
-    """Generate a random, unique appearance for an NPC."""
-    skin_tone_key = random.choice([k for k in SKIN_TONES.keys() if k != 'rainbow'])
+def generate_npc_appearance(tile_size=32, rng=random):
+    """Generate a random, unique appearance for an NPC; pass a seeded random.Random to make it reproducible."""
+    skin_tone_key = rng.choice([k for k in SKIN_TONES.keys() if k != 'rainbow'])
     skin_tone = SKIN_TONES[skin_tone_key]
-    face_shape = random.choice(FACE_SHAPES)
-    eye_type = random.choice(EYE_TYPES)
+    face_shape = rng.choice(FACE_SHAPES)
+    eye_type = rng.choice(EYE_TYPES)
     # Exclude 'bald' if present, and always pick a visible hair style
     visible_hair_styles = [h for h in HAIR_STYLES if h != 'bald']
-    hair_style = random.choice(visible_hair_styles)
-    hair_color = random.choice(HAIR_COLORS)
-    clothes = random.choice(CLOTHES)
+    hair_style = rng.choice(visible_hair_styles)
+    hair_color = rng.choice(HAIR_COLORS)
+    clothes = rng.choice(CLOTHES)
     # Vitiligo
-    vitiligo_key = random.choice(list(VITILIGO_INTENSITIES.keys()))
+    vitiligo_key = rng.choice(list(VITILIGO_INTENSITIES.keys()))
     vitiligo = VITILIGO_INTENSITIES[vitiligo_key]
     if vitiligo > 0:
-        vitiligo_patches = generate_vitiligo_patches(tile_size, vitiligo, face_shape)
+        vitiligo_patches = generate_vitiligo_patches(tile_size, vitiligo, face_shape, rng)
     else:
         vitiligo_patches = []
     return {
@@ -1,10 +1,18 @@
 """Car entity module."""
 import random
 from stinkworld.core.settings import CAR_SPEED, TILE_ROAD
+from stinkworld.entities.direction import Direction
 from stinkworld.utils.debug import debug_log
+from stinkworld.utils.memory import sizeof_slots
+
+DIRECTIONS = tuple(Direction)
 
 class Car:
     """Car entity that can be driven by players or NPCs."""
+
+    __slots__ = ('x', 'y', 'type', 'speed', 'direction', 'driver', 'hp', 'max_hp', 'destination', 'path',
+                 'is_locked', 'occupancy')
+    REFERENCES = ('driver', 'occupancy')  # Not owned
     
     def __init__(self, x, y, car_type='sedan'):
         """Initialize car."""
@@ -13,17 +21,22 @@ class Car:
         self.type = car_type
         self.speed = CAR_SPEED
         # Restore original direction logic: up/down/left/right
-        self.direction = random.choice(['up', 'down', 'left', 'right'])
+        self.direction = random.choice(DIRECTIONS)
         self.driver = None  # Can be Player or NPC
         self.hp = 100
         self.max_hp = 100
         self.destination = None
         self.path = []
         self.is_locked = False
+        self.occupancy = None  # OccupancyGrid tracking this car, if any
     
     def debug(self, message):
         """Log debug messages."""
         debug_log(message)
+
+    def sizeof(self, seen=None):
+        """Approximate bytes of this car object and what it owns."""
+        return sizeof_slots(self, self.REFERENCES, seen)
     
     def set_driver(self, driver):
         """Set the driver of this car."""
@@ -31,13 +44,12 @@ class Car:
             return False
             
         self.driver = driver
-        if hasattr(driver, 'in_car'):
-            driver.in_car = self
+        driver.in_car = self
         return True
         
     def remove_driver(self):
         """Remove the current driver."""
-        if self.driver and hasattr(self.driver, 'in_car'):
+        if self.driver:
             self.driver.in_car = None
         self.driver = None
         
@@ -47,7 +59,7 @@ class Car:
             return self.set_driver(new_driver)
             
         # NPCs may resist hijacking based on personality
-        if hasattr(self.driver, 'personality') and 'aggressive' in self.driver.personality:
+        if self.driver.personality == 'aggressive':
             if random.random() < 0.7:  # 70% chance to resist
                 return False
                 
@@ -96,16 +108,7 @@ class Car:
     def get_tiles(self):
         """Get all tiles occupied by the car."""
         # Restore: car occupies 2 tiles based on up/down/left/right
-        if self.direction == 'left':
-            return [(self.x, self.y), (self.x - 1, self.y)]
-        elif self.direction == 'right':
-            return [(self.x, self.y), (self.x + 1, self.y)]
-        elif self.direction == 'up':
-            return [(self.x, self.y), (self.x, self.y - 1)]
-        elif self.direction == 'down':
-            return [(self.x, self.y), (self.x, self.y + 1)]
-        else:
-            return [(self.x, self.y)]
+        return self.get_tiles_for_position(self.x, self.y, self.direction)
 
     def handle_player_input(self, dx, dy, city_map, cars, npcs):
         """Handle player input for car movement."""
@@ -113,37 +116,40 @@ class Car:
         if dx != 0 and dy != 0:
             return False
         # Set direction based on input, but only if moving in that axis
-        if dx == 1:
-            self.direction = 'right'
-        elif dx == -1:
-            self.direction = 'left'
-        elif dy == 1:
-            self.direction = 'down'
-        elif dy == -1:
-            self.direction = 'up'
-        else:
+        direction = Direction.from_step(dx, dy)
+        if direction is None:
             # No movement
             return False
+        self.direction = direction
+        occupancy = self.occupancy
+        if occupancy is not None:
+            occupancy.update(self)  # Turning changes the footprint even if the car can't move
         new_x = self.x + dx
         new_y = self.y + dy
         # Get new tiles based on direction
         new_tiles = self.get_tiles_for_position(new_x, new_y, self.direction)
-        # Check for collisions with other cars
-        for car in cars:
-            if car != self:
-                if any(tile in car.get_tiles() for tile in new_tiles):
-                    return False
+        if occupancy is not None:
+            # update_ai passes no cars: AI cars don't block each other
+            if cars and occupancy.car_on(new_tiles, ignore=self) is not None:
+                return False
+            npc = occupancy.npc_on(new_tiles)
+        else:
+            # Check for collisions with other cars
+            for car in cars:
+                if car != self:
+                    if any(tile in car.get_tiles() for tile in new_tiles):
+                        return False
+            npc = next((npc for npc in npcs if (npc.x, npc.y) in new_tiles and not npc.is_dead), None)
         # Check for collisions with NPCs
-        for npc in npcs:
-            if (npc.x, npc.y) in new_tiles and not npc.is_dead:
-                damage = random.randint(50, 100)
-                npc.hp = max(0, npc.hp - damage)
-                if npc.hp <= 0:
-                    npc.is_dead = True
-                    npc.is_knocked_out = True
-                else:
-                    npc.is_knocked_out = True if npc.hp < 3 else False
-                return f"You hit {npc.name} with the car! They take {damage} damage!"
+        if npc is not None:
+            damage = random.randint(50, 100)
+            npc.hp = max(0, npc.hp - damage)
+            if npc.hp <= 0:
+                npc.is_dead = True
+                npc.is_knocked_out = True
+            else:
+                npc.is_knocked_out = True if npc.hp < 3 else False
+            return f"You hit {npc.name} with the car! They take {damage} damage!"
         # Check if new position is on road
         for tile_x, tile_y in new_tiles:
             if not self.is_valid_position(tile_x, tile_y, city_map):
@@ -151,20 +157,15 @@ class Car:
         # Move car
         self.x = new_x
         self.y = new_y
+        if occupancy is not None:
+            occupancy.update(self)
         return True
 
     def get_tiles_for_position(self, x, y, direction):
         """Get tiles for the car's position based on direction."""
-        if direction == 'left':
-            return [(x, y), (x - 1, y)]
-        elif direction == 'right':
-            return [(x, y), (x + 1, y)]
-        elif direction == 'up':
-            return [(x, y), (x, y - 1)]
-        elif direction == 'down':
-            return [(x, y), (x, y + 1)]
-        else:
+        if direction is None:
             return [(x, y)]
+        return [(x, y), (x + direction.dx, y + direction.dy)]
 
     def is_valid_position(self, x, y, city_map):
         """Check if position is valid for car."""
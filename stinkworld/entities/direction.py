@@ -0,0 +1,44 @@
+"""Facing of players, NPCs and cars as a small-int enum."""
+from enum import IntEnum
+
+class Direction(IntEnum):
+    """One of the four grid directions.
+
+    The values are the ones stored in the NPC population's direction
+    column, so a facing is a byte in arrays and an int everywhere else.
+    """
+
+    UP = 0
+    DOWN = 1
+    LEFT = 2
+    RIGHT = 3
+
+    @property
+    def dx(self):
+        """Column step of one tile this way."""
+        return STEPS[self][0]
+
+    @property
+    def dy(self):
+        """Row step of one tile this way."""
+        return STEPS[self][1]
+
+    @property
+    def horizontal(self):
+        """True for LEFT and RIGHT."""
+        return self >= Direction.LEFT
+
+    @classmethod
+    def from_step(cls, dx, dy):
+        """Direction of a step, preferring the x axis for diagonals; None for no step."""
+        if dx > 0:
+            return cls.RIGHT
+        if dx < 0:
+            return cls.LEFT
+        if dy > 0:
+            return cls.DOWN
+        if dy < 0:
+            return cls.UP
+        return None
+
+STEPS = ((0, -1), (0, 1), (-1, 0), (1, 0))  # (dx, dy), indexed by Direction
@@ -3,7 +3,7 @@ import random
 import math
 from stinkworld.core.settings import (
     TILE_SIZE, COLOR_NPC, MAP_WIDTH, MAP_HEIGHT, TILE_ROAD, TILE_PARK, TILE_FLOOR, TILE_DOOR, TILE_GRASS,
-    NPC_SPEED, NPC_MAX_HP, NPC_VIEW_DISTANCE, COLOR_WHITE
+    NPC_SPEED, NPC_MAX_HP, COLOR_WHITE
 )
 from stinkworld.ui.appearance import (
     draw_portrait, FACE_SHAPES, EYE_TYPES, HAIR_STYLES, HAIR_COLORS, CLOTHES,
@@ -11,7 +11,14 @@ from stinkworld.ui.appearance import (
 )
 from stinkworld.entities.npc_generator import generate_biography
 from stinkworld.data.personality import PERSONALITY_FLAVOR
+from stinkworld.core.city import ROOMS
+from stinkworld.entities.direction import Direction
+from stinkworld.systems.population import (
+    NPCPopulation, Column, Flag, DIRECTIONS, DEAD, KNOCKED_OUT, HOSTILE, MOVING
+)
+from stinkworld.systems.schedule import ACTIVITIES, schedule_of
 from stinkworld.utils.debug import debug_log
+from stinkworld.utils.memory import sizeof_slots
 
 # Expanded name lists for more diversity
 FIRST_NAMES_FEM = [
@@ -63,22 +70,29 @@ PERSONALITIES = [
     'Forgiving', 'Grudgeful', 'Chatty', 'Quiet'
 ]
 
-def random_name():
-    group = random.choices(
+def random_name(rng=random):
+    group = rng.choices(
         ["fem", "masc", "nb"], weights=[0.4, 0.4, 0.2]
     )[0]
     if group == "fem":
-        first = random.choice(FIRST_NAMES_FEM)
+        first = rng.choice(FIRST_NAMES_FEM)
     elif group == "masc":
-        first = random.choice(FIRST_NAMES_MASC)
+        first = rng.choice(FIRST_NAMES_MASC)
     else:
-        first = random.choice(FIRST_NAMES_NB)
-    last = random.choice(LAST_NAMES)
+        first = rng.choice(FIRST_NAMES_NB)
+    last = rng.choice(LAST_NAMES)
     return f"{first} {last}"
 
 def random_personality():
     return random.choice(PERSONALITIES)
 
+def add_npc_record(population, x, y, seed=None):
+    """Add an NPC to a population as a row only, facing and personality picked from its seed; returns the row."""
+    if seed is None:
+        seed = random.getrandbits(32)
+    return population.add(x, y, NPC_MAX_HP, seed, direction=seed % len(DIRECTIONS),
+                          personality=(seed >> 8) % len(PERSONALITIES))
+
 # --- INJURY SYSTEM ---
 INJURY_TYPES = {
     "bruise": {"severity": 1, "heal_turns": 30, "bleed": False, "limp": False},
@@ -92,36 +106,68 @@ BODY_PARTS = [
 ]
 
 class NPC:
-    """Non-player character class."""
-    
-    def __init__(self, name, x, y, personality=None):
-        """Initialize NPC."""
-        self.name = name
-        self.x = x
-        self.y = y
+    """Non-player character class.
+
+    Position, health, state flags, facing, move cooldown, personality and
+    what the NPC's schedule has it doing live in a row of an NPCPopulation
+    (the game's, or a private one for an NPC made on its own); the
+    attributes below read and write that row.
+    Everything else is made from the row's seed, so an NPC object can be
+    dropped and made again (see NPCPopulation.view) until has_history().
+    Attributes are slots, optional ones included, so a made NPC carries no
+    per-instance __dict__.
+    """
+
+    __slots__ = (
+        'population', 'index', 'name', 'max_hp', 'speed', 'target', 'occupancy', 'game',
+        'money', 'inventory', 'equipped', 'relationship_status',
+        'significant_other', 'reputation', 'friends', 'enemies', 'family', 'path', 'destination',
+        'facing', 'animation_frame', 'animation_timer', 'hair_sway', 'hair_sway_speed', 'hair_sway_amount',
+        'hair_animation_offset', 'strength', 'defense', 'street_smarts', 'relationship', 'appearance',
+        'biography', 'memory', 'injuries', 'vandalized', 'robbed', 'taunted', 'driving_skill',
+        'current_vehicle', '__weakref__',
+    )
+    REFERENCES = ('population', 'occupancy', 'game', 'target', 'significant_other', 'current_vehicle')  # Not owned
+
+    x = Column('x', position=True)
+    y = Column('y', position=True)
+    hp = Column('hp')
+    direction = Column('direction', DIRECTIONS)
+    move_cooldown = Column('cooldown')
+    personality = Column('personality', tuple(p.lower() for p in PERSONALITIES))
+    is_dead = Flag(DEAD)
+    is_knocked_out = Flag(KNOCKED_OUT)
+    is_hostile = Flag(HOSTILE)
+    is_moving = Flag(MOVING)
+    ident = Column('ident')
+    seed = Column('seed')
+    current_activity = Column('activity', (None,) + ACTIVITIES)  # Set by the ScheduleEngine
+    current_room = Column('room', (None,) + ROOMS)
+
+    def __init__(self, name=None, x=0, y=0, personality=None, population=None, index=None):
+        """Initialize NPC; with an index, make the object of an existing row of population from its seed."""
+        if population is None:
+            population = NPCPopulation(capacity=1)
+        self.population = population
+        self.index = index if index is not None else add_npc_record(population, x, y)
+        if index is None:
+            population.pin(self)
+            if personality:
+                self.personality = personality.lower()
+        rng = random.Random(self.seed)
+        self.name = name or random_name(rng)
         
         # Stats
-        self.hp = NPC_MAX_HP
         self.max_hp = NPC_MAX_HP
         self.speed = NPC_SPEED
         
         # State
-        self.direction = random.choice(['up', 'down', 'left', 'right'])
-        self.is_moving = False
-        self.is_knocked_out = False
-        self.is_dead = False
-        self.is_hostile = False
         self.target = None
-        
-        # Personality and behavior
-        self.personality = (personality or random.choice(PERSONALITIES)).lower()
-        
-        # Schedule and routine
-        self.schedule = self.generate_schedule()
-        self.current_activity = None
+        self.occupancy = population.occupancy  # OccupancyGrid answering "who is on this tile", if any
+        self.game = None  # Set for NPCs that check walkability against the game's city
         
         # Inventory and equipment
-        self.money = random.randint(10, 100)
+        self.money = rng.randint(10, 100)
         self.inventory = []
         self.equipped = {
             'weapon': None,
@@ -129,15 +175,15 @@ class NPC:
         }
         
         # Relationship status
-        self.relationship_status = random.choice(['single', 'dating', 'married', 'divorced', 'widowed'])
+        self.relationship_status = rng.choice(['single', 'dating', 'married', 'divorced', 'widowed'])
         self.significant_other = None
         
         # Reputation system
         self.reputation = {
-            'kindness': random.randint(-50, 50),
-            'reliability': random.randint(-50, 50),
-            'honesty': random.randint(-50, 50),
-            'bravery': random.randint(-50, 50)
+            'kindness': rng.randint(-50, 50),
+            'reliability': rng.randint(-50, 50),
+            'honesty': rng.randint(-50, 50),
+            'bravery': rng.randint(-50, 50)
         }
         
         # Social connections
@@ -146,18 +192,17 @@ class NPC:
         self.family = set()
 
         # Movement and pathfinding
-        self.move_cooldown = 0
         self.path = []
         self.destination = None
-        self.facing = 'down'  # 'up', 'down', 'left', 'right'
+        self.facing = Direction.DOWN
         
         # Animation state
         self.animation_frame = 0
         self.animation_timer = 0
         self.hair_sway = 0
-        self.hair_sway_speed = random.uniform(0.05, 0.15)
-        self.hair_sway_amount = random.uniform(2, 4)
-        self.hair_animation_offset = random.uniform(0, 6.28)  # Random starting phase (0 to 2π)
+        self.hair_sway_speed = rng.uniform(0.05, 0.15)
+        self.hair_sway_amount = rng.uniform(2, 4)
+        self.hair_animation_offset = rng.uniform(0, 6.28)  # Random starting phase (0 to 2π)
         
         # Stats based on personality
         self.strength = 5
@@ -170,21 +215,41 @@ class NPC:
 
         # Appearance
         from stinkworld.entities.appearance import generate_npc_appearance
-        self.appearance = generate_npc_appearance()
+        self.appearance = generate_npc_appearance(rng=rng)
         
         # Biography
         from stinkworld.entities.npc_generator import generate_biography
-        self.biography = generate_biography(self.appearance)
+        self.biography = generate_biography(self.appearance, rng)
         
         # Memory
         self.memory = {}
+        self.injuries = {}  # Body part -> injury (see combat.injuries)
 
         # Optional status flags
         self.vandalized = False
         self.robbed = False
-        self.driving_skill = random.randint(1, 5)  # 1-5 scale
+        self.taunted = False  # Strength and defense already lowered by a taunt in combat
+        self.driving_skill = rng.randint(1, 5)  # 1-5 scale
         self.current_vehicle = None
 
+    @property
+    def in_car(self):
+        """Vehicle the NPC is driving; the name Car and Player use for it."""
+        return self.current_vehicle
+
+    @in_car.setter
+    def in_car(self, vehicle):
+        self.current_vehicle = vehicle
+
+    def has_history(self):
+        """True once something happened to the NPC that its seed can't make again (memories, injuries, theft...)."""
+        return bool(self.memory or self.relationship or self.vandalized or self.robbed or self.inventory
+                    or self.current_vehicle or self.target or self.injuries or self.taunted)
+
+    def sizeof(self, seen=None):
+        """Approximate bytes of this NPC object and what it owns (its population row is NPCPopulation.nbytes())."""
+        return sizeof_slots(self, self.REFERENCES, seen)
+
     def adjust_stats_by_personality(self):
         """Adjust NPC stats based on their personality"""
         personality_mods = {
@@ -201,94 +266,31 @@ class NPC:
         if self.personality in personality_mods:
             mods = personality_mods[self.personality]
             for stat, mod in mods.items():
-                if hasattr(self, stat):
-                    setattr(self, stat, getattr(self, stat) + mod)
-
-    def generate_schedule(self):
-        """Generate a daily schedule for the NPC"""
-        schedule = {
-            'morning': random.choice(['sleeping', 'working', 'exercising', 'shopping']),
-            'afternoon': random.choice(['working', 'relaxing', 'shopping', 'socializing']),
-            'evening': random.choice(['working', 'relaxing', 'socializing', 'sleeping']),
-            'night': random.choice(['sleeping', 'working', 'partying', 'relaxing'])
-        }
-        return schedule
+                setattr(self, stat, getattr(self, stat) + mod)
+
+    @property
+    def schedule(self):
+        """Period -> activity daily schedule, a hash of the seed so the ScheduleEngine can work it out without the object."""
+        return schedule_of(self.seed)
 
-    def update(self, city_map, npcs, player):
-        """Guaranteed NPC movement"""
-        if self.is_dead or self.is_knocked_out:
-            return
-        if random.random() < 0.3:  # 30% chance to move each turn
-            directions = [(0,1),(0,-1),(1,0),(-1,0)]
-            dx, dy = random.choice(directions)
-            if self.is_walkable(city_map, self.x + dx, self.y + dy):
-                self.x += dx
-                self.y += dy
-                print(f"NPC moved to ({self.x}, {self.y})")
-
-    def can_see_player(self, player):
-        """Check if NPC can see the player."""
-        if player.is_dead:
-            return False
-            
-        dx = abs(self.x - player.x)
-        dy = abs(self.y - player.y)
-        return dx <= NPC_VIEW_DISTANCE and dy <= NPC_VIEW_DISTANCE
-    
-    def move_towards_target(self, city_map, npcs, cars):
-        """Move towards target."""
-        if not self.target:
-            return
-            
-        dx = self.target.x - self.x
-        dy = self.target.y - self.y
-        
-        # Determine movement direction
-        if abs(dx) > abs(dy):
-            dx = 1 if dx > 0 else -1
-            dy = 0
-        else:
-            dx = 0
-            dy = 1 if dy > 0 else -1
-        
-        self.move(dx, dy, city_map, npcs, cars)
-    
-    def wander(self, city_map, npcs, cars):
-        """Random movement when no target."""
-        if random.random() < 0.1:  # 10% chance to change direction
-            self.direction = random.choice(['up', 'down', 'left', 'right'])
-        
-        dx = 0
-        dy = 0
-        if self.direction == 'right':
-            dx = 1
-        elif self.direction == 'left':
-            dx = -1
-        elif self.direction == 'down':
-            dy = 1
-        else:  # up
-            dy = -1
-        
-        if not self.move(dx, dy, city_map, npcs, cars):
-            # If movement failed, try a different direction
-            self.direction = random.choice(['up', 'down', 'left', 'right'])
-    
     def move(self, dx, dy, city_map, npcs, cars):
         """Handle NPC movement."""
         new_x = self.x + dx
         new_y = self.y + dy
 
-        # Check for collisions with other NPCs
-        for npc in npcs:
-            if not hasattr(npc, 'x') or not hasattr(npc, 'y') or not hasattr(npc, 'is_dead'):
-                continue  # Skip non-NPC objects (e.g., lists)
-            if npc != self and npc.x == new_x and npc.y == new_y and not npc.is_dead:
+        if self.occupancy is not None:
+            if self.occupancy.blocked(new_x, new_y, ignore=self):
                 return False
+        else:
+            # Check for collisions with other NPCs
+            for npc in npcs:
+                if npc is not self and npc.x == new_x and npc.y == new_y and not npc.is_dead:
+                    return False
 
-        # Check for collisions with cars
-        for car in cars:
-            if (new_x, new_y) in car.get_tiles():
-                return False
+            # Check for collisions with cars
+            for car in cars:
+                if (new_x, new_y) in car.get_tiles():
+                    return False
 
         # Check if new position is walkable
         if self.is_valid_position(new_x, new_y, city_map):
@@ -301,7 +303,7 @@ class NPC:
     
     def is_valid_position(self, x, y, city_map):
         """Check if position is valid for NPC by using the city's walkability system."""
-        if hasattr(self, 'game') and hasattr(self.game, 'city'):
+        if self.game is not None:
             return self.game.city.is_walkable(x, y)
         # Fallback for when city isn't available (shouldn't happen)
         if 0 <= x < len(city_map[0]) and 0 <= y < len(city_map):
@@ -309,13 +311,16 @@ class NPC:
             return tile in [0, 1, 3, 4, 5]  # Grass, road, park, door, floor
         return False
     
-    def draw(self, screen, camera_x, camera_y):
-        """Draw NPC on screen with their portrait."""
+    def draw(self, screen, camera_x, camera_y, detail='high'):
+        """Draw NPC on screen with their portrait ('low' detail draws a flat three-shape portrait)."""
         screen_x = (self.x - camera_x) * TILE_SIZE
         screen_y = (self.y - camera_y) * TILE_SIZE
 
         # Draw portrait if not dead or knocked out
-        if not self.is_dead and not self.is_knocked_out:
+        if not self.is_dead and not self.is_knocked_out and detail == 'low':
+            from stinkworld.ui.appearance import draw_portrait_simple
+            draw_portrait_simple(screen, screen_x, screen_y, TILE_SIZE, self.appearance)
+        elif not self.is_dead and not self.is_knocked_out:
             from stinkworld.ui.appearance import draw_portrait
             portrait_surface = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
             draw_portrait(portrait_surface, 0, 0, TILE_SIZE, self.appearance)
@@ -457,13 +462,15 @@ class NPC:
             status.append("They are currently knocked out and unresponsive.")
         elif self.hp < self.max_hp // 2:
             status.append("They appear to be injured.")
+        if self.is_hostile and not self.is_dead and not self.is_knocked_out:
+            status.append("They look ready for a fight.")
         
         # Add vandalism status
-        if hasattr(self, 'vandalized') and self.vandalized:
+        if self.vandalized:
             status.append(f"Someone has drawn {self.appearance.get('graffiti', 'something')} on their face.")
         
         # Add robbery status
-        if hasattr(self, 'robbed') and self.robbed:
+        if self.robbed:
             status.append("Their pockets have been emptied.")
         
         # Add relationship status
@@ -472,7 +479,8 @@ class NPC:
         
         # Add current activity
         if self.current_activity and not self.is_knocked_out and not self.is_dead:
-            status.append(f"Currently: {self.current_activity}")
+            room = f" ({self.current_room})" if self.current_room else ""
+            status.append(f"Currently: {self.current_activity}{room}")
         
         # Add relationship with player
         rel_desc = {
@@ -562,7 +570,7 @@ class NPC:
             return
             
         # If we have a destination, drive toward it
-        if hasattr(self, 'destination') and self.destination:
+        if self.destination:
             dx = self.destination[0] - self.current_vehicle.x
             dy = self.destination[1] - self.current_vehicle.y
             
@@ -573,25 +581,9 @@ class NPC:
                 self.current_vehicle.handle_player_input(0, 1 if dy > 0 else -1, city_map, [], npcs)
         else:
             # Random driving if no destination
-            direction = random.choice(['up', 'down', 'left', 'right'])
-            if direction == 'up':
-                self.current_vehicle.handle_player_input(0, -1, city_map, [], npcs)
-            elif direction == 'down':
-                self.current_vehicle.handle_player_input(0, 1, city_map, [], npcs)
-            elif direction == 'left':
-                self.current_vehicle.handle_player_input(-1, 0, city_map, [], npcs)
-            elif direction == 'right':
-                self.current_vehicle.handle_player_input(1, 0, city_map, [], npcs)
+            direction = random.choice(DIRECTIONS)
+            self.current_vehicle.handle_player_input(direction.dx, direction.dy, city_map, [], npcs)
 
     def debug(self, message):
         """Log debug messages."""
         debug_log(message)
-
-    def is_walkable(self, city_map, x, y):
-        """Check if a tile is walkable for NPCs."""
-        if isinstance(city_map, list):
-            if 0 <= x < len(city_map[0]) and 0 <= y < len(city_map):
-                return city_map[y][x] in (0, 1)  # 0=road, 1=sidewalk
-            return False
-        else:
-            return city_map.is_walkable(x, y)
\ No newline at end of file
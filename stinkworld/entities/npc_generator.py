@@ -59,11 +59,11 @@ PERSONALITY_DESCRIPTIONS = {
     'quiet': "They are reserved and prefer to listen rather than speak."
 }
 
-def generate_biography(appearance):
+def generate_biography(appearance, rng=random):
     """Generate a detailed biography for an NPC based on their appearance."""
-    occupation = random.choice(OCCUPATIONS)
-    life_event = random.choice(LIFE_EVENTS)
-    interests = random.sample(INTERESTS, k=random.randint(1, 3))
+    occupation = rng.choice(OCCUPATIONS)
+    life_event = rng.choice(LIFE_EVENTS)
+    interests = rng.sample(INTERESTS, k=rng.randint(1, 3))
     # Use actual appearance fields for description
     hair_style = appearance.get('hair_style', 'short')
     hair_color = appearance.get('hair_color', 'brown')
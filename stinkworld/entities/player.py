@@ -7,10 +7,23 @@ from stinkworld.core.settings import (
     COLOR_WHITE
 )
 from stinkworld.ui.appearance import SKIN_TONES, draw_portrait
+from stinkworld.ui.fonts import get_font, render_text
+from stinkworld.entities.direction import Direction
 from stinkworld.utils.debug import debug_log
+from stinkworld.utils.memory import sizeof_slots
 
 class Player:
     """Player character class."""
+
+    __slots__ = (
+        'name', 'x', 'y', 'hp', 'max_hp', 'energy', 'max_energy', 'hunger', 'max_hunger', 'thirst', 'max_thirst',
+        'stress', 'max_stress', 'strength', 'defense', 'agility', 'intelligence', 'charisma', 'reputation', 'book_smarts',
+        'street_smarts', 'money', 'inventory', 'equipped', 'speed', 'direction', 'is_moving', 'in_car',
+        'occupancy', 'is_knocked_out', 'is_dead', 'skills', 'points', 'journal', 'skin_tone', 'current_job',
+        'job_experience', 'appearance', 'ko_timer', 'personality', 'injuries',
+        'moving_left', 'moving_right', 'moving_up', 'moving_down',
+    )
+    REFERENCES = ('in_car', 'occupancy')  # Not owned
     
     def __init__(self, settings):
         """Initialize player."""
@@ -32,6 +45,7 @@ class Player:
         
         # Attributes
         self.strength = 5
+        self.defense = 2  # Read by combat, same base as an NPC's
         self.agility = 5
         self.intelligence = 5
         self.charisma = 5
@@ -50,9 +64,11 @@ class Player:
         
         # State
         self.speed = PLAYER_SPEED
-        self.direction = 'right'
+        self.direction = Direction.RIGHT
         self.is_moving = False
+        self.moving_left = self.moving_right = self.moving_up = self.moving_down = False  # Held keys
         self.in_car = None
+        self.occupancy = None  # The world's OccupancyGrid (the player isn't tracked in it)
         self.is_knocked_out = False
         self.is_dead = False
         
@@ -89,6 +105,11 @@ class Player:
         }
         self.ko_timer = 0
         self.personality = None
+        self.injuries = {}  # Body part -> injury (see combat.injuries)
+
+    def sizeof(self, seen=None):
+        """Approximate bytes of the player object and what it owns."""
+        return sizeof_slots(self, self.REFERENCES, seen)
 
     def handle_event(self, event):
         """Handle player input events."""
@@ -160,24 +181,23 @@ class Player:
         new_y = self.y + dy
         
         # Update direction
-        if dx > 0:
-            self.direction = 'right'
-        elif dx < 0:
-            self.direction = 'left'
-        elif dy > 0:
-            self.direction = 'down'
-        elif dy < 0:
-            self.direction = 'up'
-        
-        # Check for collisions with NPCs
-        for npc in npcs:
-            if npc.x == new_x and npc.y == new_y and not npc.is_dead:
-                return False
+        direction = Direction.from_step(dx, dy)
+        if direction is not None:
+            self.direction = direction
         
-        # Check for collisions with cars
-        for car in cars:
-            if (new_x, new_y) in car.get_tiles():
+        if self.occupancy is not None:
+            if self.occupancy.blocked(new_x, new_y):
                 return False
+        else:
+            # Check for collisions with NPCs
+            for npc in npcs:
+                if npc.x == new_x and npc.y == new_y and not npc.is_dead:
+                    return False
+
+            # Check for collisions with cars
+            for car in cars:
+                if (new_x, new_y) in car.get_tiles():
+                    return False
         
         # Check if new position is walkable
         if self.is_valid_position(new_x, new_y, city_map):
@@ -211,15 +231,15 @@ class Player:
         
         # Draw direction indicator
         indicator_color = (0, 255, 0)
-        if self.direction == 'right':
+        if self.direction == Direction.RIGHT:
             pygame.draw.line(screen, indicator_color,
                            (screen_x + TILE_SIZE - 4, screen_y + TILE_SIZE//2),
                            (screen_x + TILE_SIZE, screen_y + TILE_SIZE//2), 3)
-        elif self.direction == 'left':
+        elif self.direction == Direction.LEFT:
             pygame.draw.line(screen, indicator_color,
                            (screen_x, screen_y + TILE_SIZE//2),
                            (screen_x + 4, screen_y + TILE_SIZE//2), 3)
-        elif self.direction == 'down':
+        elif self.direction == Direction.DOWN:
             pygame.draw.line(screen, indicator_color,
                            (screen_x + TILE_SIZE//2, screen_y + TILE_SIZE - 4),
                            (screen_x + TILE_SIZE//2, screen_y + TILE_SIZE), 3)
@@ -237,9 +257,8 @@ class Player:
         screen.blit(portrait_surface, (screen_x, screen_y))
         
         # Draw injury indicators if any
-        if hasattr(self, 'injuries') and self.injuries:
-            font = pygame.font.SysFont(None, 18)
-            text = font.render("+", True, (255, 0, 0))
+        if self.injuries:
+            text = render_text(get_font(18), "+", (255, 0, 0))
             screen.blit(text, (screen_x + 2, screen_y + 2))
 
     def equip_item(self, item_name, item_info):
@@ -0,0 +1,316 @@
+"""Behavior-tree runtime for NPC decisions."""
+import numpy as np
+from stinkworld.core.settings import NPC_VIEW_DISTANCE
+from stinkworld.data.behaviors import BEHAVIORS
+from stinkworld.entities.direction import Direction
+from stinkworld.systems.population import DEAD, KNOCKED_OUT, BUSY
+from stinkworld.systems.schedule import TimingWheel
+from stinkworld.utils.debug import debug_log
+
+SUCCESS, FAILURE, RUNNING = 'success', 'failure', 'running'
+SEQUENCE, SELECTOR, CONDITION, ACTION, WAIT, WAIT_FOR = range(6)
+KINDS = {'sequence': SEQUENCE, 'selector': SELECTOR, 'condition': CONDITION,
+         'action': ACTION, 'wait': WAIT, 'wait_for': WAIT_FOR}
+
+# Values of the population's waiting column
+UNSTARTED, TIMER, PLAYER_NEAR, PLAYER_GONE = range(4)
+EVENTS = {'player_near': PLAYER_NEAR, 'player_gone': PLAYER_GONE}
+
+ACTION_TURNS = 20  # An action still running after this many turns fails
+KNOCKED_OUT_RETRY = 10  # Turns before a knocked-out NPC's due decision is tried again
+
+def sign(value):
+    return (value > 0) - (value < 0)
+
+class Context:
+    """What conditions and actions get besides the NPC: the runtime, the turn and the player's tile."""
+
+    __slots__ = ('runtime', 'now', 'focus', 'started')
+
+    def __init__(self, runtime, now, focus):
+        """Initialize context."""
+        self.runtime = runtime
+        self.now = now
+        self.focus = focus
+        self.started = now  # Turn the running action began, from the blackboard
+
+    def offset(self, npc):
+        """(dx, dy) from an NPC to the player."""
+        return self.focus[0] - npc.x, self.focus[1] - npc.y
+
+    def distance(self, npc):
+        """Chebyshev distance from an NPC to the player, in tiles."""
+        dx, dy = self.offset(npc)
+        return max(abs(dx), abs(dy))
+
+def sees_player(npc, context):
+    return context.distance(npc) <= NPC_VIEW_DISTANCE
+
+def next_to_player(npc, context):
+    return context.distance(npc) <= 1
+
+def hurt(npc, context):
+    return npc.hp < npc.max_hp // 2
+
+def hostile(npc, context):
+    return npc.is_hostile
+
+def likes_player(npc, context):
+    return npc.relationship >= 25
+
+def dislikes_player(npc, context):
+    return npc.relationship <= -25
+
+def approach_player(npc, context):
+    """Walk up to the player; fails if they get out of sight."""
+    if next_to_player(npc, context):
+        return SUCCESS
+    if not sees_player(npc, context):
+        return FAILURE
+    dx, dy = context.offset(npc)
+    context.runtime.step_towards(npc, sign(dx), sign(dy))
+    return RUNNING
+
+def flee_player(npc, context):
+    """Get out of the player's sight."""
+    if not sees_player(npc, context):
+        return SUCCESS
+    dx, dy = context.offset(npc)
+    context.runtime.step_towards(npc, -sign(dx), -sign(dy))
+    return RUNNING
+
+def step_away(npc, context):
+    """One step away from the player."""
+    dx, dy = context.offset(npc)
+    return SUCCESS if context.runtime.step_towards(npc, -sign(dx), -sign(dy)) else FAILURE
+
+def face_player(npc, context):
+    dx, dy = context.offset(npc)
+    facing = Direction.from_step(sign(dx), 0) if abs(dx) >= abs(dy) else Direction.from_step(0, sign(dy))
+    if facing is not None:
+        npc.direction = facing
+    return SUCCESS
+
+def turn_hostile(npc, context):
+    npc.is_hostile = True
+    return SUCCESS
+
+def calm_down(npc, context):
+    npc.is_hostile = False
+    return SUCCESS
+
+CONDITIONS = {f.__name__: f for f in (sees_player, next_to_player, hurt, hostile, likes_player, dislikes_player)}
+ACTIONS = {f.__name__: f for f in (approach_player, flee_player, step_away, face_player, turn_hostile, calm_down)}
+
+class BehaviorTree:
+    """A tree definition flattened into node arrays, shared by every NPC that runs it.
+
+    Nodes are numbered depth first; an NPC's place in the tree is one of
+    these numbers (its cursor), so NPCs hold no per-node state.
+    """
+
+    def __init__(self, name, definition):
+        """Flatten a nested-tuple definition (see stinkworld.data.behaviors)."""
+        self.name = name
+        self.kinds = []
+        self.args = []  # Condition/action function, turns or event code
+        self.parents = []
+        self.next_siblings = []
+        self.first_children = []
+        self.add(definition, -1)
+        self.entry = 0  # The first leaf, where an NPC starts
+        while self.first_children[self.entry] >= 0:
+            self.entry = self.first_children[self.entry]
+        if self.kinds[self.entry] != WAIT_FOR:
+            raise ValueError(f"Behavior tree {name!r} must start with a wait_for")
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add(self, definition, parent):
+        """Append a node and its subtree, returns its number."""
+        kind_name, *rest = definition
+        if kind_name not in KINDS:
+            raise ValueError(f"Unknown node kind {kind_name!r} in behavior tree {self.name!r}")
+        kind = KINDS[kind_name]
+        node = len(self.kinds)
+        self.kinds.append(kind)
+        self.parents.append(parent)
+        self.next_siblings.append(-1)
+        self.first_children.append(-1)
+        if kind in (SEQUENCE, SELECTOR):
+            self.args.append(None)
+            previous = -1
+            for child in rest:
+                number = self.add(child, node)
+                if previous < 0:
+                    self.first_children[node] = number
+                else:
+                    self.next_siblings[previous] = number
+                previous = number
+        else:
+            (arg,) = rest
+            table = {CONDITION: CONDITIONS, ACTION: ACTIONS, WAIT_FOR: EVENTS}.get(kind)
+            if table is not None and arg not in table:
+                raise ValueError(f"Unknown {kind_name} {arg!r} in behavior tree {self.name!r}")
+            self.args.append(table[arg] if table is not None else int(arg))
+        return node
+
+class BehaviorRuntime:
+    """Runs the behavior trees of a population's NPCs, only when something is due.
+
+    An NPC's tree is picked by its personality; the NPC itself holds
+    only a cursor (the node it is suspended at) and what it waits for, in
+    the population's node and waiting columns, plus a blackboard entry
+    while an action is running. Suspended NPCs aren't looked at: a wait
+    puts the NPC's ident in a timing wheel, and the player_near and
+    player_gone events are one array comparison per turn for the whole
+    population. tick() then runs just the NPCs that came due, from their
+    cursor until they suspend again, so a turn costs as much as the
+    decisions being made. A running action steers the NPC itself (its
+    BUSY flag keeps the population from wandering it) and comes due again
+    next turn.
+    """
+
+    def __init__(self, population, trees, definitions=BEHAVIORS):
+        """Initialize a runtime; trees lists the definition name of each personality ID."""
+        self.population = population
+        compiled = {}
+        for name in trees:
+            if name not in compiled:
+                compiled[name] = BehaviorTree(name, definitions[name])
+        self.trees = [compiled[name] for name in trees]
+        self.entries = np.array([tree.entry for tree in self.trees], dtype=np.uint16)
+        self.entry_events = np.array([tree.args[tree.entry] for tree in self.trees], dtype=np.uint8)
+        self.wheel = TimingWheel()
+        self.blackboards = {}  # ident -> {'node', 'started'} of a running action
+        self.moved = []  # (npc, old x, old y) of NPCs stepped during the last tick
+        self.decided = 0  # NPCs run at the last tick
+        self.focus = None  # Player's tile during a tick
+        debug_log(f"[Behavior] {len(compiled)} trees, {sum(len(tree) for tree in compiled.values())} nodes")
+
+    def start(self, rows):
+        """Put rows at the entry of their personality's tree."""
+        population = self.population
+        personality = population.personality[rows]
+        population.node[rows] = self.entries[personality]
+        population.waiting[rows] = self.entry_events[personality]
+
+    def step_towards(self, npc, dx, dy):
+        """Step an NPC a tile along (dx, dy), trying each axis; the population's rules apply (passable, unoccupied)."""
+        population = self.population
+        height, width = population.passable.shape
+        occupancy = population.occupancy
+        for sx, sy in ((dx, dy), (dx, 0), (0, dy)) if dx and dy else ((dx, dy),):
+            x, y = npc.x + sx, npc.y + sy
+            if not (0 <= x < width and 0 <= y < height) or not population.passable[y, x]:
+                continue
+            if (x, y) == self.focus or (occupancy is not None and occupancy.blocked(x, y, ignore=npc)):
+                continue
+            self.moved.append((npc, npc.x, npc.y))
+            npc.x, npc.y = x, y
+            npc.direction = Direction.from_step(sx, sy)
+            npc.is_moving = True
+            return True
+        return False
+
+    def due(self, now, focus):
+        """Rows whose wait ended by turn now, with the player at focus."""
+        population = self.population
+        n = population.count
+        waiting = population.waiting[:n]
+        flags = population.flags[:n]
+        fresh = np.flatnonzero(waiting == UNSTARTED)
+        if len(fresh):
+            self.start(fresh)
+        near = np.maximum(np.abs(population.x[:n] - focus[0]), np.abs(population.y[:n] - focus[1])) <= NPC_VIEW_DISTANCE
+        awake = (flags & (DEAD | KNOCKED_OUT)) == 0
+        rows = np.flatnonzero(awake & (((waiting == PLAYER_NEAR) & near) | ((waiting == PLAYER_GONE) & ~near)))
+        if now < self.wheel.now:
+            # The clock was set back: end every wait now rather than keep them for the old times
+            self.wheel = TimingWheel(now - 1)
+            self.wheel.schedule(population.ident[:n][waiting == TIMER], np.full(int((waiting == TIMER).sum()), now))
+        idents = self.wheel.advance(now)
+        if len(idents):
+            timed = np.searchsorted(population.ident[:n], idents)  # Idents stay in row order
+            found = timed < n
+            found[found] &= population.ident[timed[found]] == idents[found]
+            timed = timed[found]
+            timed = timed[waiting[timed] == TIMER]
+            asleep = (flags[timed] & KNOCKED_OUT) != 0
+            retry = timed[asleep & ((flags[timed] & DEAD) == 0)]
+            self.wheel.schedule(population.ident[retry], np.full(len(retry), now + KNOCKED_OUT_RETRY))
+            rows = np.union1d(rows, timed[~asleep & ((flags[timed] & DEAD) == 0)])
+        return rows
+
+    def tick(self, now, focus):
+        """Run every NPC with a decision due at turn now; focus is the player's tile."""
+        self.moved = []
+        self.focus = focus
+        rows = self.due(now, focus).tolist()
+        for row in rows:
+            self.run(self.population.view(row), now, focus)
+        self.decided = len(rows)
+
+    def run(self, npc, now, focus):
+        """Carry an NPC's tree on from its cursor until it suspends or finishes."""
+        population = self.population
+        tree = self.trees[population.personality[npc.index]]
+        kinds, args = tree.kinds, tree.args
+        context = Context(self, now, focus)
+        node = int(population.node[npc.index])
+        # Resuming: a wait has ended, a running action goes again
+        result = None if kinds[node] == ACTION else SUCCESS
+        for _ in range(4 * len(tree)):
+            if result is None:
+                kind = kinds[node]
+                if kind in (SEQUENCE, SELECTOR):
+                    node = tree.first_children[node]
+                    continue
+                if kind == CONDITION:
+                    result = SUCCESS if args[node](npc, context) else FAILURE
+                elif kind == ACTION:
+                    board = self.blackboards.get(npc.ident)
+                    context.started = board['started'] if board is not None and board['node'] == node else now
+                    if now - context.started >= ACTION_TURNS:
+                        result = FAILURE
+                    else:
+                        result = args[node](npc, context)
+                    if result == RUNNING:
+                        self.suspend(npc, node, TIMER, now + 1, busy=True)
+                        self.blackboards[npc.ident] = {'node': node, 'started': context.started}
+                        return
+                    self.blackboards.pop(npc.ident, None)
+                elif kind == WAIT:
+                    self.suspend(npc, node, TIMER, now + args[node])
+                    return
+                else:
+                    self.suspend(npc, node, args[node])
+                    return
+            parent = tree.parents[node]
+            if parent < 0:
+                break
+            if (result == SUCCESS) == (kinds[parent] == SEQUENCE) and tree.next_siblings[node] >= 0:
+                node, result = tree.next_siblings[node], None
+            else:
+                node = parent
+        # Finished (or looped without suspending): back to the start
+        self.blackboards.pop(npc.ident, None)
+        self.suspend(npc, tree.entry, args[tree.entry])
+
+    def suspend(self, npc, node, waiting, wake=None, busy=False):
+        """Park an NPC at a node until its event (or, for TIMER, the turn wake)."""
+        population = self.population
+        index = npc.index
+        population.node[index] = node
+        population.waiting[index] = waiting
+        if busy:
+            population.flags[index] |= BUSY
+        else:
+            population.flags[index] &= ~np.uint8(BUSY)
+        if waiting == TIMER:
+            self.wheel.schedule([npc.ident], [wake])
+
+    def describe(self):
+        """One-line summary for the debug HUD."""
+        return f"Behaviors: {len(self.wheel)} timers, {self.decided} decided, {len(self.moved)} stepped"
@@ -0,0 +1,90 @@
+"""Crowd density and flow of pedestrians, for congestion-aware movement and spawning."""
+import numpy as np
+from stinkworld.core.settings import NPC_CROWD_RADIUS, NPC_BLOCK_CAP, ROAD_SPACING
+
+class CrowdField:
+    """Per-tile density and velocity of NPCs, scatter-added from their positions each turn.
+
+    accumulate() bins NPCs into a window of the map with np.bincount (their
+    last step's dx and dy as weights for the velocity) and keeps summed-area
+    tables of the bins, so a tile's density (NPCs within radius tiles) and
+    flow (the sum of their steps) are four lookups each, with no
+    neighbour scans. The window is what the player's active band can step
+    into, so a turn's cost follows that window, not the map or the
+    population.
+
+    Blocks of block x block tiles (a city block by default) are counted
+    separately; spawning and far NPCs' hops leave out blocks already
+    holding block_cap NPCs, so hot spots can't pile up.
+    """
+
+    def __init__(self, width, height, radius=NPC_CROWD_RADIUS, block=ROAD_SPACING, block_cap=NPC_BLOCK_CAP):
+        """Initialize an empty field for a width x height map."""
+        self.width = width
+        self.height = height
+        self.radius = radius
+        self.block = block
+        self.block_cap = block_cap
+        self.blocks_x = -(-width // block)
+        self.blocks_y = -(-height // block)
+        self.origin = (0, 0)  # Map tile of the tables' first bin
+        self.shape = (0, 0)  # Bins in the window (rows, columns)
+        self.tables = None  # Summed-area tables of count, dx and dy, each (rows + 1, columns + 1)
+
+    def accumulate(self, x, y, dx, dy, window=None):
+        """Bin NPCs at (x, y) that last stepped (dx, dy); window (x0, y0, x1, y1) limits the tiles looked up later."""
+        r = self.radius
+        x0, y0, x1, y1 = window if window is not None else (0, 0, self.width, self.height)
+        # Bins reach radius past the window, so tiles at its edge count all their neighbours
+        x0, y0 = max(0, x0 - r), max(0, y0 - r)
+        x1, y1 = min(self.width, x1 + r), min(self.height, y1 + r)
+        rows, columns = max(0, y1 - y0), max(0, x1 - x0)
+        inside = (x >= x0) & (x < x1) & (y >= y0) & (y < y1)
+        flat = (y[inside] - y0) * columns + (x[inside] - x0)
+        size = rows * columns
+        tables = []
+        for weights in (None, dx[inside], dy[inside]):
+            bins = np.bincount(flat, weights=weights, minlength=size).reshape(rows, columns)
+            table = np.zeros((rows + 1, columns + 1), dtype=np.float64)
+            np.cumsum(np.cumsum(bins, axis=0), axis=1, out=table[1:, 1:])
+            tables.append(table)
+        self.origin = (x0, y0)
+        self.shape = (rows, columns)
+        self.tables = tables
+
+    def box(self, table, tx, ty):
+        """Sums of a table over the radius box around tiles (tx, ty), clipped to the window."""
+        rows, columns = self.shape
+        r = self.radius
+        x0, y0 = self.origin
+        left = np.clip(tx - x0 - r, 0, columns)
+        right = np.clip(tx - x0 + r + 1, 0, columns)
+        top = np.clip(ty - y0 - r, 0, rows)
+        bottom = np.clip(ty - y0 + r + 1, 0, rows)
+        return table[bottom, right] - table[top, right] - table[bottom, left] + table[top, left]
+
+    def density(self, tx, ty):
+        """NPCs within radius tiles (Chebyshev) of each tile."""
+        return self.box(self.tables[0], tx, ty)
+
+    def flow(self, tx, ty):
+        """Mean last step (fx, fy) of the NPCs around each tile, (0, 0) where there are none."""
+        count = np.maximum(self.density(tx, ty), 1)
+        return self.box(self.tables[1], tx, ty) / count, self.box(self.tables[2], tx, ty) / count
+
+    def blocks(self, x, y):
+        """Block index of tiles."""
+        return (y // self.block) * self.blocks_x + x // self.block
+
+    def block_counts(self, x, y):
+        """NPCs in every block."""
+        return np.bincount(self.blocks(x, y), minlength=self.blocks_x * self.blocks_y)
+
+    def admit(self, counts, blocks):
+        """Which of a batch of arrivals fit in their blocks, given the counts already there (first come first in)."""
+        order = np.argsort(blocks, kind='stable')
+        ordered = blocks[order]
+        first = np.searchsorted(ordered, ordered)  # Start of each arrival's group
+        fits = np.empty(len(blocks), dtype=bool)
+        fits[order] = counts[ordered] + (np.arange(len(ordered)) - first) < self.block_cap
+        return fits
@@ -2,6 +2,11 @@ import random
 from datetime import datetime, timedelta
 from stinkworld.utils.debug import debug_log
 
+# Shop names the city uses that are stocked like one of Economy.shops
+SHOP_ALIASES = {
+    'General Store': 'Convenience Store',
+}
+
 class Economy:
     """Manages game economy, shops, jobs, and trading."""
     
@@ -176,12 +181,15 @@ class Economy:
             'reputation': job['reputation_gain']
         }
 
+    def find_shop(self, shop_name):
+        """Return the shop entry for a name (or one of its aliases), None if there is none."""
+        return self.shops.get(SHOP_ALIASES.get(shop_name, shop_name))
+
     def get_shop_inventory(self, shop_name, current_hour):
         """Get available items in a shop based on operating hours."""
-        if shop_name not in self.shops:
+        shop = self.find_shop(shop_name)
+        if shop is None:
             return []
-            
-        shop = self.shops[shop_name]
         
         # Check if shop is open
         open_hour = shop['hours']['open']
@@ -235,10 +243,9 @@ class Economy:
         if item_name not in player.inventory:
             return False, "You don't have this item."
             
-        if shop_name not in self.shops:
+        shop = self.find_shop(shop_name)
+        if shop is None:
             return False, "Shop not found."
-            
-        shop = self.shops[shop_name]
         
         # Check if shop buys this type of item
         if item_name not in shop['items']:
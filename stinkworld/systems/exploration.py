@@ -0,0 +1,79 @@
+"""Explored-area bitset: one bit per map tile."""
+import struct
+import zlib
+import numpy as np
+
+MAGIC = b'SWEX'
+HEADER = struct.Struct('<4sII')  # magic, width, height
+
+class ExplorationMap:
+    """Records which tiles the player has seen, packed 8 tiles per byte.
+
+    Rows are padded to whole bytes and bits are little-endian within a
+    byte, so tile (x, y) is bit x & 7 of bits[y, x >> 3]. A 4000x4000 city
+    takes 2 MB in memory, and since explored areas are mostly long runs of
+    set or clear bits the zlib-compressed save is usually a few KB.
+    """
+
+    def __init__(self, width, height):
+        """Initialize exploration map with nothing explored."""
+        self.width = width
+        self.height = height
+        self.bits = np.zeros((height, (width + 7) // 8), dtype=np.uint8)
+        self.version = 0  # Bumped whenever a bit is set
+
+    def row_mask(self, x0, x1):
+        """Packed row with bits x0 <= x < x1 set."""
+        row = np.zeros(self.bits.shape[1] * 8, dtype=bool)
+        row[x0:x1] = True
+        return np.packbits(row, bitorder='little')
+
+    def clip(self, x0, y0, x1, y1):
+        """Clip a tile rect (exclusive end) to the map."""
+        return max(0, x0), max(0, y0), min(self.width, x1), min(self.height, y1)
+
+    def mark_rect(self, x0, y0, x1, y1):
+        """Mark tiles x0 <= x < x1, y0 <= y < y1 as explored, returns True if any were new."""
+        x0, y0, x1, y1 = self.clip(x0, y0, x1, y1)
+        if x0 >= x1 or y0 >= y1:
+            return False
+        rows = self.bits[y0:y1]
+        mask = self.row_mask(x0, x1)
+        if not (mask & ~rows).any():
+            return False
+        rows |= mask
+        self.version += 1
+        return True
+
+    def is_explored(self, x, y):
+        """Check if a tile has been seen; off-map tiles never are."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return bool(self.bits[y, x >> 3] >> (x & 7) & 1)
+
+    def unpack(self, x0=0, y0=0, x1=None, y1=None):
+        """Return explored flags of a tile rect as a (rows, cols) bool array."""
+        x1 = self.width if x1 is None else x1
+        y1 = self.height if y1 is None else y1
+        x0, y0, x1, y1 = self.clip(x0, y0, x1, y1)
+        rows = np.unpackbits(self.bits[y0:y1], axis=1, bitorder='little')
+        return rows[:, x0:x1].astype(bool)
+
+    def count(self):
+        """Number of explored tiles."""
+        return int(np.unpackbits(self.bits, bitorder='little').sum())
+
+    def to_bytes(self):
+        """Serialize to a compact zlib-compressed blob."""
+        return HEADER.pack(MAGIC, self.width, self.height) + zlib.compress(self.bits.tobytes(), 6)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Restore an exploration map written by to_bytes()."""
+        magic, width, height = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not an exploration map")
+        explored = cls(width, height)
+        bits = np.frombuffer(zlib.decompress(data[HEADER.size:]), dtype=np.uint8)
+        explored.bits = bits.reshape(explored.bits.shape).copy()
+        return explored
@@ -0,0 +1,155 @@
+"""Tile occupancy: which NPCs and cars stand on each map tile."""
+from stinkworld.systems.population import DEAD
+
+CAR = 'car'
+
+class OccupancyGrid:
+    """Spatial hash from tile to the entities on it.
+
+    Only occupied tiles have a cell, so memory follows the number of
+    entities rather than the map size. Every entity that is added gets an
+    `occupancy` attribute pointing back at the grid and calls update()
+    whenever its position or footprint (a car turning) changes, which
+    makes "is anything on this tile" a dict lookup instead of a scan of
+    every car.
+
+    NPCs are not added: most of them only exist as rows of the population,
+    so NPC questions go to its tile index (NPCPopulation.rows_at) and only
+    the NPCs found are made into objects.
+    """
+
+    def __init__(self, width, height, population=None):
+        """Initialize an empty grid for a width x height map, answering NPC queries from population."""
+        self.width = width
+        self.height = height
+        self.cells = {}  # (x, y) -> list of entities
+        self.placed = {}  # id(entity) -> (kind, tiles)
+        self.population = population
+        if population is not None:
+            population.occupancy = self
+
+    def __len__(self):
+        return len(self.placed)
+
+    @staticmethod
+    def footprint(entity, kind):
+        """Tiles an entity covers: two for a car, one for anything else."""
+        return tuple(entity.get_tiles()) if kind == CAR else ((entity.x, entity.y),)
+
+    def place(self, entity, tiles):
+        """Add an entity to the cells of its tiles."""
+        for tile in tiles:
+            cell = self.cells.get(tile)
+            if cell is None:
+                self.cells[tile] = [entity]
+            else:
+                cell.append(entity)
+
+    def unplace(self, entity, tiles):
+        """Take an entity out of the cells of its tiles, dropping emptied cells."""
+        for tile in tiles:
+            cell = self.cells[tile]
+            cell.remove(entity)
+            if not cell:
+                del self.cells[tile]
+
+    def add(self, entity, kind=CAR):
+        """Start tracking an entity (only cars so far)."""
+        tiles = self.footprint(entity, kind)
+        self.placed[id(entity)] = (kind, tiles)
+        self.place(entity, tiles)
+        entity.occupancy = self
+
+    def remove(self, entity):
+        """Stop tracking an entity (despawned, incinerated, ...)."""
+        kind, tiles = self.placed.pop(id(entity))
+        self.unplace(entity, tiles)
+        entity.occupancy = None
+
+    def update(self, entity):
+        """Move an entity's cells to its current position and footprint."""
+        kind, old = self.placed[id(entity)]
+        tiles = self.footprint(entity, kind)
+        if tiles != old:
+            self.unplace(entity, old)
+            self.place(entity, tiles)
+            self.placed[id(entity)] = (kind, tiles)
+
+    def at(self, x, y):
+        """Entities on a tile."""
+        return self.cells.get((x, y), ())
+
+    def kind(self, entity):
+        """Kind an entity was added as."""
+        return self.placed[id(entity)][0]
+
+    def npc_rows(self, x, y, alive=False, ignore=None):
+        """Population rows on a tile, leaving out ignore's and (with alive=True) the dead."""
+        population = self.population
+        if population is None:
+            return []
+        rows = population.rows_at(x, y).tolist()
+        if alive:
+            rows = [row for row in rows if not population.flags[row] & DEAD]
+        if ignore is not None and getattr(ignore, 'population', None) is population:
+            rows = [row for row in rows if row != ignore.index]
+        return rows
+
+    def npc_at(self, x, y, alive=False):
+        """First NPC on a tile (only living ones with alive=True), or None."""
+        rows = self.npc_rows(x, y, alive)
+        return self.population.view(rows[0]) if rows else None
+
+    def car_at(self, x, y):
+        """Car covering a tile, or None."""
+        for entity in self.cells.get((x, y), ()):
+            if self.kind(entity) == CAR:
+                return entity
+        return None
+
+    def npc_on(self, tiles, ignore=None):
+        """First living NPC other than ignore on any of the tiles, or None."""
+        for x, y in tiles:
+            rows = self.npc_rows(x, y, True, ignore)
+            if rows:
+                return self.population.view(rows[0])
+        return None
+
+    def car_on(self, tiles, ignore=None):
+        """First car other than ignore covering any of the tiles, or None."""
+        for tile in tiles:
+            for entity in self.cells.get(tile, ()):
+                if entity is not ignore and self.kind(entity) == CAR:
+                    return entity
+        return None
+
+    def blocked(self, x, y, ignore=None):
+        """True if a car or a living NPC other than ignore is on the tile."""
+        return self.car_on(((x, y),), ignore) is not None or bool(self.npc_rows(x, y, True, ignore))
+
+    def query_rect(self, x0, y0, x1, y1):
+        """Entities with a tile in x0 <= x < x1, y0 <= y < y1, each listed once (NPCs found are made into objects)."""
+        found = {}
+        if self.population is not None:
+            for row in self.population.in_rect(x0, y0, x1, y1).tolist():
+                view = self.population.view(row)
+                found[id(view)] = view
+        if (x1 - x0) * (y1 - y0) <= len(self.cells):
+            for y in range(y0, y1):
+                for x in range(x0, x1):
+                    for entity in self.cells.get((x, y), ()):
+                        found[id(entity)] = entity
+        else:
+            # Fewer occupied tiles than tiles in the rect, walk those instead
+            for (x, y), cell in self.cells.items():
+                if x0 <= x < x1 and y0 <= y < y1:
+                    for entity in cell:
+                        found[id(entity)] = entity
+        return list(found.values())
+
+    def query_radius(self, x, y, radius):
+        """Entities with a tile within radius tiles (Euclidean) of (x, y)."""
+        r2 = radius * radius
+        return [entity for entity in self.query_rect(x - radius, y - radius, x + radius + 1, y + radius + 1)
+                if any((tx - x) ** 2 + (ty - y) ** 2 <= r2
+                       for tx, ty in self.placed.get(id(entity), (None, ((entity.x, entity.y),)))[1])]
@@ -0,0 +1,450 @@
+"""NPC simulation state stored column by column in NumPy arrays."""
+import random
+import weakref
+from collections import OrderedDict
+import numpy as np
+from stinkworld.core.settings import (
+    NPC_WANDER_CHANCE, NPC_ACTIVE_RADIUS, NPC_MIDDLE_RADIUS, NPC_MIDDLE_INTERVAL, NPC_FAR_INTERVAL,
+    NPC_VIEW_CACHE_SIZE, NPC_CROWD_RADIUS, NPC_CROWD_AVOIDANCE, NPC_LANE_FOLLOWING, NPC_BLOCK_CAP,
+    TILE_GRASS, TILE_PARK, TILE_ROAD
+)
+from stinkworld.entities.direction import Direction, STEPS
+from stinkworld.systems.crowd import CrowdField
+from stinkworld.utils.debug import debug_log
+from stinkworld.utils.memory import total_sizeof
+
+DIRECTIONS = tuple(Direction)
+STEP_X = np.array([dx for dx, _ in STEPS], dtype=np.int32)  # Indexed by direction
+STEP_Y = np.array([dy for _, dy in STEPS], dtype=np.int32)
+PEDESTRIAN_TILES = (TILE_GRASS, TILE_PARK, TILE_ROAD)  # Outdoor tiles wandering pedestrians step onto
+
+# Bits of the flags column
+DEAD = 1
+KNOCKED_OUT = 2
+HOSTILE = 4
+MOVING = 8
+BUSY = 16  # A behavior is steering the NPC, so step() doesn't wander it
+
+# Simulation bands, by distance from the player
+BANDS = ('active', 'middle', 'far')
+ACTIVE, MIDDLE, FAR = range(3)
+
+MIN_CAPACITY = 64
+TILE_MOVES_LIMIT = 1024  # Single moves patched over the tile index before it is rebuilt
+
+class NPCPopulation:
+    """Positions, health, flags, facing, move cooldowns, personality IDs, seeds and whereabouts of every NPC.
+
+    An NPC nobody is looking at is only its row, about 38 bytes. The NPC
+    object the rest of the game talks to (its view) is made by view() when
+    the NPC is drawn, inspected or bumped into: name, appearance,
+    biography, schedule and the rest come from a random.Random seeded with
+    the row's seed, so the same NPC looks the same every time it is made.
+    Simulation attributes are read and written straight through to the
+    arrays (see Column and Flag). Views are kept in an LRU cache; one that
+    has picked up history the seed can't reproduce (memories, injuries,
+    being robbed; see NPC.has_history) is pinned instead of evicted, and an
+    evicted view that is still referenced somewhere is found again rather
+    than made twice. Rows stay in spawn order, and indexing or iterating
+    the population gives views in that order.
+
+    step() runs one turn for every NPC at once, at a level of detail set
+    by the NPC's distance from the player (Chebyshev, in tiles):
+
+    - active (within active_radius): wander a tile each turn, preferring
+      less crowded tiles and the way nearby walkers are going (see
+      CrowdField; crowd_avoidance and lane_following weigh the two).
+    - middle (within middle_radius): every middle_interval turns, make
+      all those turns' wandering in one jump.
+    - far: every far_interval turns, go to the goal tile its schedule
+      set (see ScheduleEngine; activity, building, room and goal are
+      columns too), so the NPC is wherever its itinerary says when it
+      comes back into range. Far NPCs never land within middle_radius,
+      so no one appears out of nowhere, and don't hop into a city block
+      already holding block_cap NPCs.
+
+    Updates in the slow bands are staggered by ident, so they don't all
+    land on the same turn. All moves then go through the same checks:
+    impassable, car-covered or occupied targets are dropped, and one
+    random winner is picked among NPCs aiming for the same tile.
+    """
+
+    COLUMNS = ('x', 'y', 'hp', 'flags', 'direction', 'cooldown', 'personality', 'ident', 'seed',
+               'activity', 'room', 'building', 'goal', 'node', 'waiting')
+
+    def __init__(self, city=None, capacity=MIN_CAPACITY, wander_chance=NPC_WANDER_CHANCE,
+                 active_radius=NPC_ACTIVE_RADIUS, middle_radius=NPC_MIDDLE_RADIUS,
+                 middle_interval=NPC_MIDDLE_INTERVAL, far_interval=NPC_FAR_INTERVAL,
+                 view_cache_size=NPC_VIEW_CACHE_SIZE, crowd_radius=NPC_CROWD_RADIUS,
+                 crowd_avoidance=NPC_CROWD_AVOIDANCE, lane_following=NPC_LANE_FOLLOWING,
+                 block_cap=NPC_BLOCK_CAP):
+        """Initialize an empty population; without a city there is no map to wander and step() does nothing."""
+        self.count = 0
+        self.wander_chance = wander_chance
+        self.active_radius = active_radius
+        self.middle_radius = middle_radius
+        self.middle_interval = middle_interval
+        self.far_interval = far_interval
+        self.view_cache_size = view_cache_size
+        self.crowd_avoidance = crowd_avoidance
+        self.lane_following = lane_following
+        self.views = OrderedDict()  # ident -> NPC, least recently used first
+        self.pinned = {}  # ident -> NPC with history, never evicted
+        self.loose = weakref.WeakValueDictionary()  # ident -> evicted NPC still referenced elsewhere
+        self.occupancy = None  # OccupancyGrid answering tile queries from this population, if any
+        self.tile_index = None  # Sorted tile keys and their rows, rebuilt after NPCs move
+        self.tile_moves = {}  # row -> (x, y) of rows moved one by one since tile_index was built
+        self.moved_tiles = {}  # (x, y) -> set of those rows standing there
+        self.next_ident = 0
+        self.turn = 0  # Steps taken
+        self.band_counts = dict.fromkeys(BANDS, 0)  # Living NPCs per band at the last step
+        self.updated = 0  # NPCs considered for a move at the last step
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.hp = np.zeros(capacity, dtype=np.int32)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+        self.direction = np.zeros(capacity, dtype=np.uint8)  # Direction
+        self.cooldown = np.zeros(capacity, dtype=np.uint16)  # Turns left before the NPC may move
+        self.personality = np.zeros(capacity, dtype=np.uint8)
+        self.ident = np.zeros(capacity, dtype=np.uint32)  # Stable ID, also seeds per-NPC choices
+        self.seed = np.zeros(capacity, dtype=np.uint32)  # Seed everything else about the NPC is made from
+        self.activity = np.zeros(capacity, dtype=np.uint8)  # 1 + index into schedule.ACTIVITIES, 0 for none
+        self.room = np.zeros(capacity, dtype=np.uint8)  # 1 + index into city.ROOMS, 0 for none
+        self.building = np.zeros(capacity, dtype=np.int32)  # Index into City.registry, -1 for none
+        self.goal = np.zeros(capacity, dtype=np.int32)  # Flat tile far NPCs go to, -1 for none
+        self.node = np.zeros(capacity, dtype=np.uint16)  # Behavior-tree node the NPC is suspended at
+        self.waiting = np.zeros(capacity, dtype=np.uint8)  # What it waits for there (see behavior.py), 0 if not started
+        self.rng = None  # Seeded from random on the first step(), so it follows random.seed()
+        self.passable = None
+        self.crowd = None  # CrowdField of the last step, if there is a city
+        if city is not None:
+            self.passable = np.isin(city.tiles, PEDESTRIAN_TILES)
+            self.crowd = CrowdField(city.width, city.height, crowd_radius, block_cap=block_cap)
+            city.add_tile_listener(self.on_tile_changed)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, row):
+        return self.view(row)
+
+    def __iter__(self):
+        """Views of every NPC in spawn order; this materializes them all, so it is for small populations."""
+        return (self.view(row) for row in range(self.count))
+
+    def on_tile_changed(self, x, y, old_tile, new_tile):
+        """Keep the passability grid in step with the map."""
+        self.passable[y, x] = new_tile in PEDESTRIAN_TILES
+
+    def grow(self):
+        """Double the capacity of every column."""
+        capacity = max(MIN_CAPACITY, len(self.x) * 2)
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+
+    def add(self, x, y, hp, seed, direction=0, personality=0):
+        """Append a row for an NPC, returns its index (no view is made)."""
+        if self.count == len(self.x):
+            self.grow()
+        index = self.count
+        self.x[index] = x
+        self.y[index] = y
+        self.hp[index] = hp
+        self.flags[index] = 0
+        self.direction[index] = direction
+        self.cooldown[index] = 0
+        self.personality[index] = personality
+        self.ident[index] = self.next_ident
+        self.seed[index] = seed
+        self.activity[index] = 0
+        self.room[index] = 0
+        self.building[index] = -1
+        self.goal[index] = -1
+        self.node[index] = 0
+        self.waiting[index] = 0
+        self.next_ident += 1
+        self.count += 1
+        self.tile_index = None
+        return index
+
+    def materialized(self):
+        """Every live view: cached, pinned and evicted-but-referenced."""
+        return [*self.views.values(), *self.pinned.values(), *self.loose.values()]
+
+    def view(self, row):
+        """The NPC object of a row, made from the row's seed if there isn't a live one."""
+        ident = int(self.ident[row])
+        view = self.pinned.get(ident)
+        if view is not None:
+            return view
+        view = self.views.get(ident)
+        if view is not None:
+            self.views.move_to_end(ident)
+            return view
+        view = self.loose.pop(ident, None)
+        if view is None:
+            from stinkworld.entities.npc import NPC
+            view = NPC(population=self, index=row)
+        self.views[ident] = view
+        while len(self.views) > self.view_cache_size:
+            ident, oldest = self.views.popitem(last=False)
+            if oldest.has_history():
+                self.pinned[ident] = oldest
+            else:
+                self.loose[ident] = oldest
+        return view
+
+    def pin(self, view):
+        """Keep a view for as long as its row exists (an NPC made by hand rather than by view())."""
+        ident = int(self.ident[view.index])
+        self.views.pop(ident, None)
+        self.pinned[ident] = view
+
+    def remove(self, view):
+        """Delete a view's row, shifting later rows down so spawn order is kept.
+
+        The view moves to a private population of its own, so it stays usable.
+        """
+        index = view.index
+        ident = int(self.ident[index])
+        detached = NPCPopulation(capacity=1)
+        detached.add(0, 0, 0, 0)
+        for name in self.COLUMNS:
+            getattr(detached, name)[0] = getattr(self, name)[index]
+        for store in (self.views, self.pinned, self.loose):
+            store.pop(ident, None)
+        view.population, view.index = detached, 0
+        detached.pin(view)
+
+        end = self.count
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[index:end - 1] = column[index + 1:end]
+        self.count -= 1
+        self.tile_index = None
+        for other in self.materialized():
+            if other.index > index:
+                other.index -= 1
+
+    def track_move(self, row):
+        """Note that one row moved, so rows_at() patches the tile index rather than rebuilding it."""
+        if self.tile_index is None:
+            return
+        tile = (int(self.x[row]), int(self.y[row]))
+        old = self.tile_moves.get(row)
+        if old is not None:
+            self.moved_tiles[old].discard(row)
+        self.tile_moves[row] = tile
+        self.moved_tiles.setdefault(tile, set()).add(row)
+
+    def rows_at(self, x, y):
+        """Rows standing on a tile, in spawn order (a binary search in a sorted tile index).
+
+        Rows moved one at a time since the index was built (see track_move)
+        are looked up in tile_moves instead, until there are too many.
+        """
+        if self.tile_index is None or len(self.tile_moves) > TILE_MOVES_LIMIT:
+            n = self.count
+            keys = (self.y[:n].astype(np.int64) << 32) | self.x[:n]
+            order = np.argsort(keys, kind='stable')
+            self.tile_index = (keys[order], order)
+            self.tile_moves.clear()
+            self.moved_tiles.clear()
+        keys, order = self.tile_index
+        key = (y << 32) | x
+        rows = order[np.searchsorted(keys, key):np.searchsorted(keys, key, side='right')]
+        if not self.tile_moves:
+            return rows
+        moved = self.tile_moves
+        rows = [row for row in rows.tolist() if row not in moved]
+        rows.extend(self.moved_tiles.get((x, y), ()))
+        return np.array(sorted(rows), dtype=np.intp)
+
+    def nbytes(self):
+        """Bytes of column storage per NPC row."""
+        return sum(getattr(self, name).itemsize for name in self.COLUMNS)
+
+    def sizeof(self):
+        """(bytes allocated for the columns, number of live NPC objects, their approximate bytes)."""
+        count, size = total_sizeof(self.materialized())
+        return sum(getattr(self, name).nbytes for name in self.COLUMNS), count, size
+
+    def positions(self, alive=False):
+        """(n, 2) array of NPC tiles, optionally leaving out the dead."""
+        n = self.count
+        xy = np.stack((self.x[:n], self.y[:n]), axis=1)
+        return xy[(self.flags[:n] & DEAD) == 0] if alive else xy
+
+    def in_rect(self, x0, y0, x1, y1):
+        """Rows with x0 <= x < x1 and y0 <= y < y1, in spawn order."""
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        return np.flatnonzero((x >= x0) & (x < x1) & (y >= y0) & (y < y1))
+
+    def bands(self, focus):
+        """Band of every row for a focus tile."""
+        n = self.count
+        distance = np.maximum(np.abs(self.x[:n] - focus[0]), np.abs(self.y[:n] - focus[1]))
+        return np.where(distance <= self.active_radius, ACTIVE,
+                        np.where(distance <= self.middle_radius, MIDDLE, FAR)).astype(np.uint8)
+
+    def step(self, blocked=(), focus=None):
+        """Run a turn for every NPC; blocked holds flat (y * width + x) tiles covered by cars.
+
+        focus is the player's tile (everyone is active without one).
+        Returns the moved rows with their previous x and y.
+        """
+        n = self.count
+        x, y, flags, cooldown = self.x[:n], self.y[:n], self.flags[:n], self.cooldown[:n]
+        moved = (flags & MOVING) != 0  # Last turn's movers, whose steps make up the flow
+        flags &= ~np.uint8(MOVING)
+        waiting = cooldown > 0
+        cooldown[waiting] -= 1
+        if self.passable is None:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+        height, width = self.passable.shape
+        if self.rng is None:
+            self.rng = np.random.default_rng(random.getrandbits(32))
+        rng = self.rng
+        self.turn += 1
+
+        alive = (flags & DEAD) == 0
+        able = alive & ((flags & (KNOCKED_OUT | BUSY)) == 0) & ~waiting
+        band = self.bands(focus) if focus is not None else np.zeros(n, dtype=np.uint8)
+        self.band_counts = dict(zip(BANDS, np.bincount(band[alive], minlength=len(BANDS)).tolist()))
+        phase = self.ident[:n] + np.uint32(self.turn)
+
+        # Crowd field over the tiles active NPCs can step onto
+        window = None
+        if focus is not None:
+            reach = self.active_radius + 1
+            window = (focus[0] - reach, focus[1] - reach, focus[0] + reach + 1, focus[1] + reach + 1)
+        facing = self.direction[:n]
+        self.crowd.accumulate(x[alive], y[alive], (STEP_X[facing] * moved)[alive],
+                              (STEP_Y[facing] * moved)[alive], window)
+
+        # Active: one step, maybe, in the direction scoring best on crowding, lane and a random draw
+        active = np.flatnonzero(able & (band == ACTIVE) & (rng.random(n) < self.wander_chance))
+        tx = x[active, None] + STEP_X[None, :]
+        ty = y[active, None] + STEP_Y[None, :]
+        fx, fy = self.crowd.flow(x[active], y[active])
+        score = (self.crowd_avoidance * self.crowd.density(tx, ty)
+                 - self.lane_following * (fx[:, None] * STEP_X[None, :] + fy[:, None] * STEP_Y[None, :])
+                 + rng.random(tx.shape))
+        inside = (tx >= 0) & (tx < width) & (ty >= 0) & (ty < height)
+        score[~inside] = np.inf
+        score[inside] = np.where(self.passable[ty[inside], tx[inside]], score[inside], np.inf)
+        steps = np.argmin(score, axis=1)
+        moves = [(active, STEP_X[steps], STEP_Y[steps])]
+
+        # Middle: middle_interval turns of wandering at once
+        middle = np.flatnonzero(able & (band == MIDDLE) & (phase % self.middle_interval == 0))
+        steps = rng.integers(0, len(DIRECTIONS), (len(middle), self.middle_interval))
+        taken = rng.random(steps.shape) < self.wander_chance
+        moves.append((middle, (STEP_X[steps] * taken).sum(axis=1), (STEP_Y[steps] * taken).sum(axis=1)))
+
+        # Far: to the goal of the current itinerary event, if that is far away too
+        far = np.flatnonzero(able & (band == FAR) & (phase % self.far_interval == 0) & (self.goal[:n] >= 0))
+        if len(far):
+            target = self.goal[far]
+            tx, ty = target % width, target // width
+            if focus is not None:
+                hidden = np.maximum(np.abs(tx - focus[0]), np.abs(ty - focus[1])) > self.middle_radius
+                far, tx, ty = far[hidden], tx[hidden], ty[hidden]
+            # No hopping into blocks that are already full
+            crowd = self.crowd
+            into = crowd.blocks(tx, ty)
+            leaving = np.flatnonzero(into != crowd.blocks(x[far], y[far]))
+            fits = np.ones(len(far), dtype=bool)
+            fits[leaving] = crowd.admit(crowd.block_counts(x[alive], y[alive]), into[leaving])
+            far, tx, ty = far[fits], tx[fits], ty[fits]
+            moves.append((far, tx - x[far], ty - y[far]))
+        self.updated = sum(len(rows) for rows, _, _ in moves)
+
+        rows = np.concatenate([rows for rows, _, _ in moves])
+        dx = np.concatenate([dx for _, dx, _ in moves]).astype(np.int32)
+        dy = np.concatenate([dy for _, _, dy in moves]).astype(np.int32)
+        moving = (dx != 0) | (dy != 0)
+        rows, dx, dy = rows[moving], dx[moving], dy[moving]
+        tx, ty = x[rows] + dx, y[rows] + dy
+        inside = (tx >= 0) & (tx < width) & (ty >= 0) & (ty < height)
+        rows, dx, dy, tx, ty = rows[inside], dx[inside], dy[inside], tx[inside], ty[inside]
+        ok = self.passable[ty, tx]
+
+        # Standing NPCs and cars block the tile (scattered into a grid: np.isin slows down on big maps)
+        target = ty.astype(np.int64) * width + tx
+        occupied = np.zeros(height * width, dtype=bool)
+        occupied[y[alive].astype(np.int64) * width + x[alive]] = True
+        if len(blocked):
+            blocked = np.asarray(blocked, dtype=np.int64)
+            occupied[blocked[(blocked >= 0) & (blocked < occupied.size)]] = True
+        ok &= ~occupied[target]
+        rows, dx, dy, target = rows[ok], dx[ok], dy[ok], target[ok]
+
+        # Several NPCs aiming for one tile: a random one of them gets it
+        order = rng.permutation(len(rows))
+        _, first = np.unique(target[order], return_index=True)
+        winners = order[first]
+        rows, dx, dy = rows[winners], dx[winners], dy[winners]
+
+        old_x, old_y = x[rows].copy(), y[rows].copy()
+        x[rows] += dx
+        y[rows] += dy
+        if len(rows):
+            self.tile_index = None
+        # Face along the longer axis of the move
+        self.direction[rows] = np.where(np.abs(dx) >= np.abs(dy), np.where(dx < 0, Direction.LEFT, Direction.RIGHT),
+                                        np.where(dy < 0, Direction.UP, Direction.DOWN))
+        flags[rows] |= MOVING
+        debug_log(f"[Population] {len(rows)} of {n} NPCs moved ({self.describe()})")
+        return rows, old_x, old_y
+
+    def describe(self):
+        """One-line band summary for the debug HUD."""
+        counts = ', '.join(f"{count} {band}" for band, count in self.band_counts.items())
+        return f"NPCs: {counts}; {self.updated} updated, {len(self.views) + len(self.pinned)} made"
+
+class Column:
+    """Attribute of an NPC view stored in one of its population's columns."""
+
+    def __init__(self, column, names=None, position=False):
+        """names maps stored integers to the values callers see (e.g. direction strings); position marks x and y."""
+        self.column = column
+        self.names = names
+        self.position = position
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        value = int(getattr(view.population, self.column)[view.index])
+        return self.names[value] if self.names else value
+
+    def __set__(self, view, value):
+        if self.names:
+            value = self.names.index(value)
+        population = view.population
+        getattr(population, self.column)[view.index] = value
+        if self.position:
+            population.track_move(view.index)
+
+class Flag:
+    """Boolean attribute of an NPC view stored as a bit of its population's flags column."""
+
+    def __init__(self, bit):
+        """Initialize flag."""
+        self.bit = bit
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        return bool(view.population.flags[view.index] & self.bit)
+
+    def __set__(self, view, value):
+        flags = view.population.flags
+        if value:
+            flags[view.index] |= self.bit
+        else:
+            flags[view.index] &= ~np.uint8(self.bit)
@@ -0,0 +1,315 @@
+"""NPC daily itineraries and the timing wheel that wakes NPCs when their next one is due."""
+import numpy as np
+from stinkworld.core.city import ROOMS
+from stinkworld.systems.population import DEAD
+from stinkworld.utils.debug import debug_log
+
+MINUTES_PER_HOUR = 60
+MINUTES_PER_DAY = 24 * MINUTES_PER_HOUR
+PERIODS = ('morning', 'afternoon', 'evening', 'night')
+PERIOD_STARTS = (6, 12, 18, 22)  # Hour each period begins
+PERIOD_ACTIVITIES = (  # What an NPC may be doing in each period
+    ('sleeping', 'working', 'exercising', 'shopping'),
+    ('working', 'relaxing', 'shopping', 'socializing'),
+    ('working', 'relaxing', 'socializing', 'sleeping'),
+    ('sleeping', 'working', 'partying', 'relaxing'),
+)
+ACTIVITIES = ('sleeping', 'working', 'exercising', 'shopping', 'relaxing', 'socializing', 'partying')
+ACTIVITY_PLACES = {  # Activity -> (which of the NPC's buildings, room it happens in)
+    'sleeping': ('home', 'bedroom'),
+    'relaxing': ('home', 'living'),
+    'working': ('work', 'office'),
+    'shopping': ('shop', 'shop'),
+    'exercising': ('out', None),
+    'socializing': ('out', 'living'),
+    'partying': ('out', 'living'),
+}
+PLACES = ('home', 'work', 'shop', 'out')
+START_SPREAD = 60  # An NPC starts a period up to this many minutes after it begins
+ENTRANCE_SPREAD = 4  # NPCs wait on a passable tile within this many tiles of the door
+
+# Salts of the per-NPC hashes
+HOME, WORK, SHOP, OUT, START, CHOICE, SPOT = range(7)
+
+# Activity (as its index in ACTIVITIES) of each period's choices
+PERIOD_CODES = np.array([[ACTIVITIES.index(a) for a in choices] for choices in PERIOD_ACTIVITIES], dtype=np.uint8)
+CODE_PLACES = np.array([PLACES.index(ACTIVITY_PLACES[a][0]) for a in ACTIVITIES], dtype=np.uint8)
+CODE_ROOMS = np.array([ROOMS.index(ACTIVITY_PLACES[a][1]) if ACTIVITY_PLACES[a][1] else -1 for a in ACTIVITIES],
+                      dtype=np.int8)
+
+def mix(keys, salt):
+    """SplitMix64 hash of integer keys and a salt, as uint64 (the same keys and salt always give the same hash)."""
+    h = np.asarray(keys).astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    h ^= np.uint64(salt * 0xBF58476D1CE4E5B9 & 0xFFFFFFFFFFFFFFFF)
+    h ^= h >> np.uint64(31)
+    h *= np.uint64(0x94D049BB133111EB)
+    h ^= h >> np.uint64(29)
+    return h
+
+def schedule_codes(seeds):
+    """(n, len(PERIODS)) activity codes of the NPCs with these seeds: their schedules."""
+    seeds = np.asarray(seeds)
+    choice = np.stack([mix(seeds, CHOICE * 8 + period) % np.uint64(len(PERIOD_ACTIVITIES[period]))
+                       for period in range(len(PERIODS))], axis=1).astype(np.intp)
+    return PERIOD_CODES[np.arange(len(PERIODS)), choice]
+
+def schedule_of(seed):
+    """Period -> activity schedule of the NPC with this seed."""
+    codes = schedule_codes([seed])[0]
+    return {period: ACTIVITIES[code] for period, code in zip(PERIODS, codes.tolist())}
+
+class TimingWheel:
+    """Hierarchical timing wheel of integer keys, each due at a whole minute.
+
+    Level 0 has a slot per minute of the current hour and level 1 a slot
+    per hour of the current day; keys due on a later day wait in an
+    overflow list until that day begins. Scheduling drops a key in the
+    slot of its minute or hour, and advancing a minute empties one level-0
+    slot (at the top of an hour the hour's level-1 slot is first spread
+    over level 0), so a tick costs as much as the keys due at it, not as
+    much as the keys waiting. Keys go in and come out as NumPy arrays.
+    """
+
+    def __init__(self, now=0):
+        """Initialize an empty wheel at minute now."""
+        self.now = now  # Last minute advanced to; keys due at it have been returned
+        self.minutes = [[] for _ in range(MINUTES_PER_HOUR)]  # Chunks of (keys, times)
+        self.hours = [[] for _ in range(MINUTES_PER_DAY // MINUTES_PER_HOUR)]
+        self.later = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def spread(slots, keys, times, slot):
+        """Append keys to their slots, one chunk per slot."""
+        if not len(keys):
+            return
+        order = np.argsort(slot, kind='stable')
+        keys, times, slot = keys[order], times[order], slot[order]
+        starts = np.flatnonzero(np.r_[True, slot[1:] != slot[:-1]])
+        for start, end in zip(starts.tolist(), np.r_[starts[1:], len(slot)].tolist()):
+            slots[int(slot[start])].append((keys[start:end], times[start:end]))
+
+    def schedule(self, keys, times):
+        """Add keys due at the given minutes; ones not after now come due at the next advance."""
+        keys = np.asarray(keys, dtype=np.int64)
+        times = np.maximum(np.asarray(times, dtype=np.int64), self.now + 1)
+        if not len(keys):
+            return
+        self.count += len(keys)
+        this_hour = times // MINUTES_PER_HOUR == (self.now + 1) // MINUTES_PER_HOUR
+        today = ~this_hour & (times // MINUTES_PER_DAY == (self.now + 1) // MINUTES_PER_DAY)
+        self.spread(self.minutes, keys[this_hour], times[this_hour], times[this_hour] % MINUTES_PER_HOUR)
+        self.spread(self.hours, keys[today], times[today], times[today] // MINUTES_PER_HOUR % len(self.hours))
+        rest = ~(this_hour | today)
+        if rest.any():
+            self.later.append((keys[rest], times[rest]))
+
+    def advance(self, now):
+        """Move forward to minute now, returns the keys that came due on the way."""
+        due = []
+        for minute in range(self.now + 1, now + 1):
+            if minute % MINUTES_PER_HOUR == 0:
+                self.now = minute - 1  # Re-scheduled keys land relative to the new hour
+                if minute % MINUTES_PER_DAY == 0:
+                    later, self.later = self.later, []
+                else:
+                    later = []
+                hour = self.hours[minute // MINUTES_PER_HOUR % len(self.hours)]
+                later += hour
+                hour.clear()
+                for keys, times in later:
+                    self.count -= len(keys)
+                    self.schedule(keys, times)
+            slot = self.minutes[minute % MINUTES_PER_HOUR]
+            if slot:
+                due += [keys for keys, _ in slot]
+                self.count -= sum(len(keys) for keys, _ in slot)
+                slot.clear()
+        self.now = max(self.now, now)
+        return np.concatenate(due) if due else np.zeros(0, dtype=np.int64)
+
+class ScheduleEngine:
+    """Runs NPC schedules: daily itineraries, woken by a timing wheel.
+
+    At the start of every day each NPC's schedule (see schedule_codes) is
+    compiled into its itinerary: for every period, the minute the NPC
+    starts it, the building and room it happens in (picked from the
+    city's registry: home and work are fixed per NPC, shops and nights
+    out change daily) and the activity. Only an NPC's next itinerary
+    event sits in the wheel, so a turn costs as much as the events due at
+    its minute and an NPC with nothing due costs nothing. A due event
+    sets the NPC's activity, building, room and goal columns (the goal is
+    a tile by the building's door, where the population's far band takes
+    NPCs nobody can see) and schedules the next one. Dead NPCs drop out.
+    Itineraries are stored by ident, so they survive rows shifting when an
+    NPC is despawned; NPCs spawned during a day are compiled on the next
+    advance().
+    """
+
+    def __init__(self, population, city):
+        """Initialize the engine for a population living in city."""
+        self.population = population
+        self.registry = city.registry
+        tiles, starts = self.find_entrances(population.passable, city.registry)
+        self.entrances = tiles  # Flat tiles by each building's door, grouped by building
+        self.entrance_start = starts  # Building -> first of its entrances (one extra entry at the end)
+        counts = np.diff(starts)
+        rooms = np.zeros((len(city.registry), len(ROOMS)), dtype=bool)
+        for building in city.registry:
+            rooms[building.index, [ROOMS.index(room) for room in building.rooms]] = True
+        self.has_room = rooms
+        usable = counts > 0
+        self.homes = np.flatnonzero(usable & (rooms[:, ROOMS.index('bedroom')] | ~rooms.any(axis=1)))
+        self.workplaces = np.flatnonzero(usable & rooms[:, ROOMS.index('office')])
+        self.shops = np.flatnonzero(usable & rooms[:, ROOMS.index('shop')])
+        self.venues = np.flatnonzero(usable)
+        self.wheel = TimingWheel()
+        self.day = None  # Day the itineraries are compiled for
+        self.compiled = 0  # NPC idents below this have an itinerary for the day
+        self.times = np.zeros((0, len(PERIODS)), dtype=np.int64)  # Ident -> minute each event is due
+        self.buildings = np.zeros((0, len(PERIODS)), dtype=np.int32)  # -1: nowhere to go
+        self.rooms = np.zeros((0, len(PERIODS)), dtype=np.uint8)  # Room column value (0: none)
+        self.activities = np.zeros((0, len(PERIODS)), dtype=np.uint8)  # Activity column value
+        self.woken = 0  # NPCs woken at the last advance
+        debug_log(f"[Schedule] {len(self.venues)} of {len(city.registry)} buildings usable: "
+                  f"{len(self.homes)} homes, {len(self.workplaces)} workplaces, {len(self.shops)} shops")
+
+    @staticmethod
+    def find_entrances(passable, registry):
+        """Flat passable tiles within ENTRANCE_SPREAD of each building's door, and where each building's start."""
+        height, width = passable.shape
+        spread = ENTRANCE_SPREAD
+        tiles = []
+        starts = [0]
+        for building in registry:
+            x, y = building.door
+            x0, y0 = max(0, x - spread), max(0, y - spread)
+            near = np.argwhere(passable[y0:y + spread + 1, x0:x + spread + 1])
+            tiles.append((near[:, 0] + y0) * width + near[:, 1] + x0)
+            starts.append(starts[-1] + len(near))
+        tiles = np.concatenate(tiles).astype(np.int32) if tiles else np.zeros(0, dtype=np.int32)
+        return tiles, np.array(starts, dtype=np.int64)
+
+    def pick(self, buildings, keys, salt):
+        """A building from buildings for every key (-1 if there are none)."""
+        if not len(buildings):
+            return np.full(len(keys), -1, dtype=np.int32)
+        return buildings[(mix(keys, salt) % np.uint64(len(buildings))).astype(np.intp)].astype(np.int32)
+
+    def grow(self, size):
+        """Make room for the itineraries of idents below size."""
+        if size <= len(self.times):
+            return
+        size = max(size, 2 * len(self.times))
+        for name in ('times', 'buildings', 'rooms', 'activities'):
+            old = getattr(self, name)
+            grown = np.zeros((size, len(PERIODS)), dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def compile(self, day, rows, now):
+        """Compile the itineraries of rows for day, put them to what's due by minute now and schedule the rest."""
+        population = self.population
+        rows = rows[(population.flags[rows] & DEAD) == 0]
+        idents = population.ident[rows].astype(np.int64)
+        seeds = population.seed[rows]
+        self.grow(int(population.next_ident))
+
+        codes = schedule_codes(seeds)
+        starts = day * MINUTES_PER_DAY + np.array(PERIOD_STARTS) * MINUTES_PER_HOUR
+        times = starts + np.stack([mix(seeds, (START * 8 + period) + day * 64) % np.uint64(START_SPREAD)
+                                   for period in range(len(PERIODS))], axis=1).astype(np.int64)
+        places = np.stack([self.pick(self.homes, seeds, HOME), self.pick(self.workplaces, seeds, WORK)], axis=1)
+        places = np.broadcast_to(places[:, :, None], (len(rows), 2, len(PERIODS)))
+        daily = np.stack([np.stack([self.pick(self.shops, seeds, (SHOP * 8 + period) + day * 64),
+                                    self.pick(self.venues, seeds, (OUT * 8 + period) + day * 64)], axis=1)
+                          for period in range(len(PERIODS))], axis=2)
+        places = np.concatenate([places, daily], axis=1)  # (n, len(PLACES), len(PERIODS))
+        buildings = np.take_along_axis(places, CODE_PLACES[codes][:, None, :].astype(np.intp), axis=1)[:, 0, :]
+        room = CODE_ROOMS[codes].astype(np.intp)
+        known = (buildings >= 0) & (room >= 0)
+        rooms = np.zeros(buildings.shape, dtype=np.uint8)
+        rooms[known] = self.has_room[buildings[known], room[known]] * (room[known] + 1)
+
+        self.times[idents] = times
+        self.buildings[idents] = buildings
+        self.rooms[idents] = rooms
+        self.activities[idents] = codes + 1
+
+        passed = (times <= now).sum(axis=1)
+        # Where the NPC is now: the latest event due, or for one with no activity yet, the night before
+        idle = (passed == 0) & (population.activity[rows] == 0)
+        current = np.where(passed > 0, passed - 1, len(PERIODS) - 1)
+        chosen = (passed > 0) | idle
+        self.apply(rows[chosen], idents[chosen], current[chosen])
+        waiting = passed < len(PERIODS)
+        events = passed[waiting]
+        self.wheel.schedule(idents[waiting] * len(PERIODS) + events, times[waiting, events])
+
+    def apply(self, rows, idents, events):
+        """Set rows' activity, building, room and goal from the given events of their itineraries."""
+        population = self.population
+        buildings = self.buildings[idents, events]
+        population.activity[rows] = self.activities[idents, events]
+        population.building[rows] = buildings
+        population.room[rows] = self.rooms[idents, events]
+        goal = np.full(len(rows), -1, dtype=np.int32)
+        placed = buildings >= 0
+        if placed.any():
+            start = self.entrance_start[buildings[placed]]
+            count = (self.entrance_start[buildings[placed] + 1] - start).astype(np.uint64)
+            spot = mix(idents[placed] * len(PERIODS) + events[placed], SPOT + self.day * 64) % count
+            goal[placed] = self.entrances[start + spot.astype(np.int64)]
+        population.goal[rows] = goal
+
+    def wake(self, keys):
+        """Apply the events of due keys (ident * len(PERIODS) + event) and schedule each NPC's next one."""
+        if not len(keys):
+            return 0
+        population = self.population
+        n = population.count
+        idents, events = keys // len(PERIODS), keys % len(PERIODS)
+        rows = np.searchsorted(population.ident[:n], idents)  # Idents stay in row order
+        found = rows < n
+        found[found] &= population.ident[rows[found]] == idents[found]
+        found[found] &= (population.flags[rows[found]] & DEAD) == 0
+        rows, idents, events = rows[found], idents[found], events[found]
+        self.apply(rows, idents, events)
+        more = events + 1 < len(PERIODS)
+        self.wheel.schedule(idents[more] * len(PERIODS) + events[more] + 1, self.times[idents[more], events[more] + 1])
+        return len(rows)
+
+    def restart(self, now):
+        """Drop everything scheduled and compile today's itineraries afresh as of minute now."""
+        self.wheel = TimingWheel(now)
+        self.day = now // MINUTES_PER_DAY
+        self.compiled = int(self.population.next_ident)
+        self.compile(self.day, np.arange(self.population.count), now)
+
+    def advance(self, now):
+        """Run schedules up to minute now (TimeSystem.elapsed_minutes), compiling a new day's itineraries as it begins."""
+        population = self.population
+        if self.day is None or now < self.wheel.now or now - self.wheel.now > MINUTES_PER_DAY:
+            self.restart(now)  # First call, or the clock was set rather than run
+            self.woken = population.count
+            return
+        woken = 0
+        if population.next_ident > self.compiled:
+            n = population.count
+            new = np.flatnonzero(population.ident[:n] >= self.compiled)
+            self.compiled = int(population.next_ident)
+            self.compile(self.day, new, self.wheel.now)
+        while now // MINUTES_PER_DAY > self.day:
+            woken += self.wake(self.wheel.advance((self.day + 1) * MINUTES_PER_DAY - 1))
+            self.day += 1
+            self.compile(self.day, np.arange(population.count), self.wheel.now)
+            debug_log(f"[Schedule] Day {self.day + 1}: compiled {population.count} itineraries")
+        woken += self.wake(self.wheel.advance(now))
+        self.woken = woken
+
+    def describe(self):
+        """One-line summary for the debug HUD."""
+        return f"Schedules: {len(self.wheel)} events waiting, {self.woken} NPCs woken"
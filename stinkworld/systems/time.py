@@ -9,7 +9,8 @@ class TimeSystem:
     
     def __init__(self):
         """Initialize time system."""
-        self.current_minute = 0  # Minutes since game start
+        self.current_minute = 0  # Minute of the current day
+        self.days = 0  # Whole days passed since game start
         self.last_update = time.time()
         
         # Time constants
@@ -25,6 +26,19 @@ class TimeSystem:
             'dusk': (60, 40, 80, 80),    # Cool, purple overlay
             'night': (0, 0, 0, 128)      # Dark overlay at night
         }
+        # --- Ambient light multiplier through the day (used by get_ambient_light) ---
+        # Format: (hour, (R, G, B)), interpolated linearly between entries
+        self.ambient = [
+            (0, (55, 60, 90)),
+            (5, (55, 60, 90)),
+            (6, (190, 160, 140)),   # Warm dawn
+            (7, (255, 255, 255)),
+            (18, (255, 255, 255)),
+            (19, (210, 170, 200)),  # Purple dusk
+            (21, (100, 95, 140)),
+            (22, (55, 60, 90)),
+            (24, (55, 60, 90)),
+        ]
     
     def update(self):
         """Update game time."""
@@ -33,7 +47,13 @@ class TimeSystem:
         self.last_update = current_time
         
         # Update game minutes (1 real second = 1 game minute)
-        self.current_minute = (self.current_minute + int(elapsed)) % self.MINUTES_PER_DAY
+        days, self.current_minute = divmod(self.current_minute + int(elapsed), self.MINUTES_PER_DAY)
+        self.days += days
+    
+    @property
+    def elapsed_minutes(self):
+        """Minutes since game start, counting whole days (what NPC schedules are timed in)."""
+        return self.days * self.MINUTES_PER_DAY + self.current_minute
     
     @property
     def hour(self):
@@ -66,7 +86,7 @@ class TimeSystem:
     
     def get_current_datetime(self):
         """Get the current in-game date and time."""
-        minutes_passed = self.current_minute
+        minutes_passed = self.elapsed_minutes
         return datetime(2024, 1, 1, 6, 0) + timedelta(minutes=minutes_passed)
     
     def get_time_of_day(self):
@@ -88,14 +108,22 @@ class TimeSystem:
         tod = self.get_time_of_day()
         return self.lighting.get(tod, (0, 0, 0, 0))
     
+    def get_ambient_light(self):
+        """Get the ambient light color for the current minute; (255, 255, 255) is full daylight."""
+        hours = (self.current_minute % self.MINUTES_PER_DAY) / self.MINUTES_PER_HOUR
+        for (start, low), (end, high) in zip(self.ambient, self.ambient[1:]):
+            if start <= hours < end:
+                t = (hours - start) / (end - start)
+                return tuple(int(round(a + (b - a) * t)) for a, b in zip(low, high))
+        return self.ambient[-1][1]
+    
     def format_time(self):
         """Format the current time as HH:MM."""
         return self.get_time_string()
     
     def format_date(self):
         """Format the current date."""
-        day = (self.current_minute // self.MINUTES_PER_DAY) + 1
-        return f"Day {day}"
+        return f"Day {self.days + 1}"
     
     def apply_lighting(self, screen):
         """Apply lighting effects based on time of day."""
@@ -122,9 +150,12 @@ class TimeSystem:
     
     def advance_time(self):
         """Advance time by one turn (only called when player acts)."""
-        self.current_minute = (self.current_minute + 1) % self.MINUTES_PER_DAY
+        self.current_minute += 1
+        if self.current_minute == self.MINUTES_PER_DAY:
+            self.current_minute = 0
+            self.days += 1
         debug_log(f"[TimeSystem] Time advanced to {self.get_time_string()}")
     
     def get_current_day(self):
         """Return the current in-game day number (starting from 1)."""
-        return (self.current_minute // self.MINUTES_PER_DAY) + 1
\ No newline at end of file
+        return self.days + 1
\ No newline at end of file
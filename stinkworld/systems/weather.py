@@ -3,12 +3,26 @@ import random
 from datetime import datetime
 from stinkworld.utils.debug import debug_log
 import pygame  # Needed for apply_weather_effects and update_particles
+from stinkworld.core.settings import WEATHER_MAX_PARTICLES
+from stinkworld.systems.particles import ParticleEngine
+
+# Motion ranges per particle type, in pixels per frame
+PARTICLE_SPECS = {
+    'rain': {'vx': (0, 0), 'vy': (10, 20), 'jitter': (0, 0)},
+    'snow': {'vx': (0, 0), 'vy': (1, 3), 'jitter': (1, 0)},
+    'fog': {'vx': (0, 0), 'vy': (0, 0), 'jitter': (1, 1)},
+}
+RAIN_LENGTHS = range(5, 16)
+RAIN_COLOR = (200, 200, 255)
+SNOW_SIZES = range(2, 5)
+FOG_SIZES = (20, 30, 40, 50)
+FOG_ALPHAS = (20, 40, 60)
 
 class WeatherSystem:
     """Manages game weather conditions."""
     
-    def __init__(self):
-        """Initialize weather system."""
+    def __init__(self, max_particles=WEATHER_MAX_PARTICLES):
+        """Initialize weather system; max_particles is the capacity of the particle engine."""
         self.weather_types = {
             'clear': {
                 'name': 'Clear',
@@ -27,7 +41,8 @@ class WeatherSystem:
                 'lighting_mod': (-20, -20, -20, 40),
                 'movement_penalty': 1,
                 'visibility_reduction': 2,
-                'particles': 'rain'
+                'particles': 'rain',
+                'particle_count': 1500
             },
             'storm': {
                 'name': 'Storm',
@@ -35,6 +50,7 @@ class WeatherSystem:
                 'movement_penalty': 2,
                 'visibility_reduction': 3,
                 'particles': 'rain',
+                'particle_count': 10000,
                 'lightning': True
             },
             'fog': {
@@ -42,20 +58,27 @@ class WeatherSystem:
                 'lighting_mod': (50, 50, 50, 70),
                 'movement_penalty': 1,
                 'visibility_reduction': 4,
-                'particles': 'fog'
+                'particles': 'fog',
+                'particle_count': 120
             },
             'snow': {
                 'name': 'Snow',
                 'lighting_mod': (100, 100, 100, 20),
                 'movement_penalty': 2,
                 'visibility_reduction': 2,
-                'particles': 'snow'
+                'particles': 'snow',
+                'particle_count': 3000
             }
         }
         
         self.current_weather = 'clear'
         self.weather_duration = 0  # How many more turns this weather will last
-        self.particles = []  # List to store active weather particles
+        self.particles = ParticleEngine(max_particles)  # Active weather particles
+        self.particle_type = None  # Particle type currently held by the engine
+        self.particle_scale = 1.0  # Multiplier applied to each weather's particle_count
+        self.fog_scale = 1.0  # Multiplier applied to fog puff sizes
+        self.stamps = None  # Pre-rendered particle surfaces, built on first draw
+        self._overlay = None  # Cached full-screen tint surface
         
         # Season-based weather probabilities
         self.seasonal_weights = {
@@ -126,75 +149,96 @@ class WeatherSystem:
             max(0, min(255, time_of_day_lighting[3] + mod[3]))
         )
         
-        overlay = pygame.Surface(screen.get_size())
-        overlay.fill(final_color[:3])
-        overlay.set_alpha(final_color[3])
-        screen.blit(overlay, (0, 0))
+        # A fully transparent tint (clear weather) would still cost a full-screen blend
+        if final_color[3] > 0:
+            if self._overlay is None or self._overlay.get_size() != screen.get_size():
+                self._overlay = pygame.Surface(screen.get_size())
+            self._overlay.fill(final_color[:3])
+            self._overlay.set_alpha(final_color[3])
+            screen.blit(self._overlay, (0, 0))
         
         # Update and draw weather particles
         if 'particles' in weather:
             self.update_particles(screen, weather['particles'])
+        else:
+            self.particles.clear()
+    
+    def set_quality(self, particle_scale, fog_scale):
+        """Set particle density and fog puff size; smaller puffs are cheaper to blend."""
+        self.particle_scale = particle_scale
+        if fog_scale != self.fog_scale:
+            self.fog_scale = fog_scale
+            self.stamps = None  # Rebuilt at the new size on the next draw
+    
+    def build_stamps(self):
+        """Pre-render one small surface per particle variant (streak length, flake size, fog puff)."""
+        display_ready = pygame.display.get_surface() is not None
+        
+        def finish(surface, colorkey=None):
+            if display_ready:
+                surface = surface.convert()
+            if colorkey is not None:
+                surface.set_colorkey(colorkey)
+            return surface
+        
+        rain = []
+        for length in RAIN_LENGTHS:
+            streak = pygame.Surface((1, length + 1))
+            streak.fill(RAIN_COLOR)
+            rain.append(finish(streak))
+        snow = []
+        for size in SNOW_SIZES:
+            flake = pygame.Surface((size * 2 + 1, size * 2 + 1))
+            flake.fill((0, 0, 0))
+            pygame.draw.circle(flake, (255, 255, 255), (size, size), size)
+            snow.append(finish(flake, (0, 0, 0)))
+        fog = []
+        for size in FOG_SIZES:
+            size = max(1, int(size * self.fog_scale))
+            for alpha in FOG_ALPHAS:
+                puff = pygame.Surface((size, size))
+                puff.fill((200, 200, 200))
+                puff = finish(puff)
+                puff.set_alpha(alpha)
+                fog.append(puff)
+        return {'rain': rain, 'snow': snow, 'fog': fog}
     
     def update_particles(self, screen, particle_type):
         """Update and draw weather particles."""
-        # Add new particles
-        if len(self.particles) < 100:  # Maintain 100 particles
-            if particle_type == 'rain':
-                self.particles.append({
-                    'x': random.randint(0, screen.get_width()),
-                    'y': random.randint(-20, 0),
-                    'speed': random.randint(10, 20),
-                    'length': random.randint(5, 15)
-                })
-            elif particle_type == 'snow':
-                self.particles.append({
-                    'x': random.randint(0, screen.get_width()),
-                    'y': random.randint(-20, 0),
-                    'speed': random.randint(1, 3),
-                    'size': random.randint(2, 4)
-                })
-            elif particle_type == 'fog':
-                self.particles.append({
-                    'x': random.randint(0, screen.get_width()),
-                    'y': random.randint(0, screen.get_height()),
-                    'size': random.randint(20, 50),
-                    'alpha': random.randint(20, 60)
-                })
+        if self.stamps is None:
+            self.stamps = self.build_stamps()
+        if particle_type != self.particle_type:
+            self.particles.clear()
+            self.particle_type = particle_type
+        
+        width, height = screen.get_size()
+        spec = PARTICLE_SPECS[particle_type]
+        stamps = self.stamps[particle_type]
+        target = int(self.get_current_weather().get('particle_count', 100) * self.particle_scale)
+        target = min(target, self.particles.capacity)
+        
+        # Top up to the target count; a fresh storm is spread over the whole
+        # screen, afterwards replacements enter just above the top edge
+        deficit = target - self.particles.count
+        if deficit > 0:
+            if particle_type == 'fog' or self.particles.count == 0:
+                y_range = (0 if particle_type == 'fog' else -20, height)
+            else:
+                y_range = (-spec['vy'][1], 0)
+            self.particles.spawn(deficit, (0, width), y_range,
+                                 spec['vx'], spec['vy'], (0, len(stamps) - 1))
+        elif deficit < 0:
+            self.particles.count = target
         
-        # Update existing particles
-        for particle in self.particles[:]:
-            # --- Fix: Ensure 'speed' key exists before using it ---
-            if particle_type in ('rain', 'snow'):
-                if 'speed' not in particle:
-                    # Assign a sensible default speed if missing
-                    particle['speed'] = 10 if particle_type == 'rain' else 2
-            if particle_type == 'rain':
-                particle['y'] += particle['speed']
-                pygame.draw.line(screen, (200, 200, 255),
-                               (particle['x'], particle['y']),
-                               (particle['x'], particle['y'] + particle['length']))
-                if particle['y'] > screen.get_height():
-                    self.particles.remove(particle)
-            elif particle_type == 'snow':
-                particle['y'] += particle['speed']
-                particle['x'] += random.randint(-1, 1)
-                pygame.draw.circle(screen, (255, 255, 255),
-                                 (int(particle['x']), int(particle['y'])),
-                                 particle['size'])
-                if particle['y'] > screen.get_height():
-                    self.particles.remove(particle)
-            elif particle_type == 'fog':
-                fog_surface = pygame.Surface((particle['size'], particle['size']))
-                fog_surface.fill((200, 200, 200))
-                fog_surface.set_alpha(particle['alpha'])
-                screen.blit(fog_surface, (particle['x'], particle['y']))
-                
-                # Slowly move fog
-                particle['x'] += random.randint(-1, 1)
-                particle['y'] += random.randint(-1, 1)
-                if not (0 <= particle['x'] <= screen.get_width() and
-                       0 <= particle['y'] <= screen.get_height()):
-                    self.particles.remove(particle)
+        if particle_type == 'rain':
+            self.particles.draw_streaks(screen, RAIN_LENGTHS, RAIN_COLOR)
+        else:
+            self.particles.draw(screen, stamps)
+        self.particles.integrate(1.0, *spec['jitter'])
+        if particle_type == 'fog':
+            self.particles.cull(0, 0, width, height)
+        else:
+            self.particles.cull(-50, -100, width + 50, height)
     
     def update(self):
         """Update weather conditions."""
@@ -16,6 +16,21 @@ SKIN_TONES = {
     'pale': (255, 236, 204)
 }
 VITILIGO_INTENSITIES = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+HAIR_RGB = {
+    'black': (0, 0, 0),
+    'brown': (139, 69, 19),
+    'blonde': (255, 215, 0),
+    'red': (255, 0, 0),
+    'gray': (128, 128, 128),
+    'white': (255, 255, 255)
+}
+CLOTHES_RGB = {
+    'casual': (0, 0, 255),  # Blue
+    'formal': (0, 0, 0),    # Black
+    'sporty': (255, 0, 0),  # Red
+    'punk': (128, 0, 128),  # Purple
+    'fancy': (218, 165, 32) # Goldenrod
+}
 
 def generate_vitiligo_patches(intensity, size):
     """Generate vitiligo patch locations based on intensity."""
@@ -102,15 +117,7 @@ def draw_portrait(surface, x, y, size, appearance):
     # Draw hair
     hair_style = appearance.get('hair_style', 'short')
     hair_color_name = appearance.get('hair_color', 'brown')
-    hair_colors = {
-        'black': (0, 0, 0),
-        'brown': (139, 69, 19),
-        'blonde': (255, 215, 0),
-        'red': (255, 0, 0),
-        'gray': (128, 128, 128),
-        'white': (255, 255, 255)
-    }
-    hair_color = hair_colors.get(hair_color_name, (0, 0, 0))
+    hair_color = HAIR_RGB.get(hair_color_name, (0, 0, 0))
     
     if hair_style != 'bald':
         if hair_style == 'short':
@@ -138,13 +145,16 @@ def draw_portrait(surface, x, y, size, appearance):
     
     # Draw clothes
     clothes_type = appearance.get('clothes', 'casual')
-    clothes_colors = {
-        'casual': (0, 0, 255),  # Blue
-        'formal': (0, 0, 0),    # Black
-        'sporty': (255, 0, 0),  # Red
-        'punk': (128, 0, 128),  # Purple
-        'fancy': (218, 165, 32) # Goldenrod
-    }
-    clothes_color = clothes_colors.get(clothes_type, (0, 0, 255))
+    clothes_color = CLOTHES_RGB.get(clothes_type, (0, 0, 255))
     pygame.draw.rect(surface, clothes_color,
-                    (x, y + size*3//4, size, size//4))
\ No newline at end of file
+                    (x, y + size*3//4, size, size//4))
+
+def draw_portrait_simple(surface, x, y, size, appearance):
+    """Draw a low-detail portrait: face, hair and clothes as three flat shapes."""
+    skin_tone = appearance.get('skin_tone', SKIN_TONES['medium'])
+    pygame.draw.ellipse(surface, skin_tone, (x + size//8, y + size//8, size*3//4, size*3//4))
+    if appearance.get('hair_style', 'short') != 'bald':
+        hair_color = HAIR_RGB.get(appearance.get('hair_color', 'brown'), (0, 0, 0))
+        pygame.draw.rect(surface, hair_color, (x + size//4, y, size//2, size//4))
+    clothes_color = CLOTHES_RGB.get(appearance.get('clothes', 'casual'), (0, 0, 255))
+    pygame.draw.rect(surface, clothes_color, (x, y + size*3//4, size, size//4))
@@ -0,0 +1,146 @@
+"""Baked sprite cache: procedural sprites and decoded sheets in one packed file."""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import pygame
+from stinkworld.core.settings import ASSET_CACHE_PATH
+from stinkworld.utils.debug import debug_log
+
+MAGIC = b'SWASSET1'
+FORMAT_VERSION = 1
+
+def hash_file(path):
+    """Return the SHA-1 hex digest of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class AssetCache:
+    """Packed raw-pixel cache for the sprites Graphics builds at startup.
+
+    File layout: MAGIC, a little-endian uint32 header length, a JSON header
+    (format version, source hashes, one entry per surface) and then the raw
+    RGB/RGBA pixels of every surface back to back. Loading is one file read
+    plus a frombuffer/convert per surface; the cache is treated as stale as
+    soon as any source file hash differs from the ones it was baked from.
+    """
+
+    def __init__(self, path=ASSET_CACHE_PATH):
+        """Initialize asset cache."""
+        self.path = path
+
+    def source_hashes(self, sources):
+        """Hash every existing source file, keyed by path."""
+        return {path: hash_file(path) for path in sorted(sources) if os.path.exists(path)}
+
+    def load(self, sources):
+        """Return {key: Surface} from the cache, or None if it is missing or stale."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                blob = f.read()
+            if blob[:len(MAGIC)] != MAGIC:
+                debug_log(f"[AssetCache] {self.path} is not an asset cache, rebuilding")
+                return None
+            (header_size,) = struct.unpack_from('<I', blob, len(MAGIC))
+            start = len(MAGIC) + 4
+            header = json.loads(blob[start:start + header_size].decode('utf-8'))
+        except (OSError, ValueError, struct.error) as e:
+            debug_log(f"[AssetCache] Failed to read {self.path}: {e}")
+            return None
+        if header.get('version') != FORMAT_VERSION:
+            return None
+        if header.get('sources') != self.source_hashes(sources):
+            debug_log("[AssetCache] Sources changed, rebuilding")
+            return None
+
+        data = memoryview(blob)[start + header_size:]
+        display_ready = pygame.display.get_surface() is not None
+        surfaces = {}
+        for entry in header['entries']:
+            offset, length = entry['offset'], entry['length']
+            surface = pygame.image.frombuffer(data[offset:offset + length], tuple(entry['size']), entry['format'])
+            if display_ready:
+                surface = surface.convert_alpha() if entry['format'] == 'RGBA' else surface.convert()
+            else:
+                surface = surface.copy()  # Detach from the file buffer
+            if entry.get('colorkey') is not None:
+                surface.set_colorkey(entry['colorkey'])
+            surfaces[entry['key']] = surface
+        debug_log(f"[AssetCache] Loaded {len(surfaces)} surfaces from {self.path}")
+        return surfaces
+
+    def save(self, surfaces, sources):
+        """Bake {key: Surface} into the cache file."""
+        entries = []
+        chunks = []
+        offset = 0
+        for key, surface in surfaces.items():
+            pixel_format = 'RGBA' if surface.get_flags() & pygame.SRCALPHA else 'RGB'
+            pixels = pygame.image.tobytes(surface, pixel_format)
+            colorkey = surface.get_colorkey()
+            entries.append({
+                'key': key,
+                'size': list(surface.get_size()),
+                'format': pixel_format,
+                'offset': offset,
+                'length': len(pixels),
+                'colorkey': list(colorkey[:3]) if colorkey else None,
+            })
+            chunks.append(pixels)
+            offset += len(pixels)
+        header = json.dumps({
+            'version': FORMAT_VERSION,
+            'sources': self.source_hashes(sources),
+            'entries': entries,
+        }).encode('utf-8')
+
+        directory = os.path.dirname(self.path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(MAGIC)
+                f.write(struct.pack('<I', len(header)))
+                f.write(header)
+                for pixels in chunks:
+                    f.write(pixels)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            debug_log(f"[AssetCache] Failed to write {self.path}: {e}")
+            return False
+        debug_log(f"[AssetCache] Baked {len(entries)} surfaces ({offset} bytes) into {self.path}")
+        return True
+
+    def remove(self):
+        """Delete the cache file if it exists."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def main(argv=None):
+    """Bake the asset cache ahead of time (python -m stinkworld.ui.asset_cache)."""
+    parser = argparse.ArgumentParser(description="Bake StinkWorld sprites into the asset cache.")
+    parser.add_argument('--output', default=ASSET_CACHE_PATH, help="cache file to write")
+    parser.add_argument('--force', action='store_true', help="rebuild even if the cache is current")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    from stinkworld.ui.graphics import Graphics  # Imported late, graphics imports this module
+
+    cache = AssetCache(args.output)
+    if args.force:
+        cache.remove()
+    Graphics(asset_cache=cache)
+    print(f"Asset cache ready: {args.output}")
+    pygame.quit()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Lazy sprite atlas backed by subsurface views of a single sheet."""
+import os
+import pygame
+from stinkworld.utils.debug import debug_log
+
+# Semantic names for cells of the bundled sheets
+ROGUELIKE_MANIFEST = {
+    'wall': 0,
+    'building': 0,
+    'floor': 1,
+}
+TOPDOWN_MANIFEST = {
+    'grass': 0,
+    'dirt': 1,
+}
+
+class SpriteAtlas:
+    """A spritesheet sliced into fixed-size cells on demand.
+
+    The sheet is loaded on first access and cells are handed out as
+    Surface.subsurface views, so no pixels are copied. Cells are numbered
+    row-major like the old sliced list, and can also be looked up by the
+    names in the manifest. Views share pixels with the sheet, so use
+    materialize() when a tile needs to be drawn on.
+
+    Cells baked elsewhere (see Graphics.build_sprites) can be handed in as
+    cells, {name or index: Surface}; those are served without loading the
+    sheet at all.
+    """
+
+    def __init__(self, filename, tile_size=32, manifest=None, sprite_dir=None, sheet=None, cells=None):
+        """Initialize atlas, optionally around an already decoded sheet or baked cells."""
+        self.filename = filename
+        self.tile_size = tile_size
+        self.manifest = dict(manifest or {})
+        self.path = os.path.join(sprite_dir or os.path.join(os.getcwd(), "sprites"), filename)
+        self.sheet = None
+        self.columns = 0
+        self.rows = 0
+        self.views = {}  # cell index -> subsurface view
+        self.baked = {self.index(key): surface for key, surface in (cells or {}).items()}
+        self.missing = sheet is None and not self.baked and not os.path.exists(self.path)
+        if self.missing:
+            debug_log(f"[Graphics] Spritesheet not found: {self.path}")
+        if sheet is not None:
+            self.set_sheet(sheet)
+
+    def load(self):
+        """Load the sheet if needed, returns False when it is unavailable."""
+        if self.sheet is not None:
+            return True
+        if self.missing:
+            return False
+        sheet = pygame.image.load(self.path)
+        if pygame.display.get_surface() is not None:
+            sheet = sheet.convert_alpha()
+        self.set_sheet(sheet)
+        debug_log(f"[Graphics] Loaded atlas {self.filename} ({self.columns}x{self.rows} cells)")
+        return True
+
+    def set_sheet(self, sheet):
+        """Use an already decoded sheet surface."""
+        self.sheet = sheet
+        self.views.clear()
+        # Partial cells on the right/bottom edge are kept so indices match the sheet grid
+        self.columns = -(-sheet.get_width() // self.tile_size)
+        self.rows = -(-sheet.get_height() // self.tile_size)
+
+    def index(self, key):
+        """Resolve a manifest name or cell index to a cell index (None if unknown)."""
+        if isinstance(key, str):
+            return self.manifest.get(key)
+        return key
+
+    def cell_rect(self, index):
+        """Return the sheet rect of a cell, clipped to the sheet."""
+        size = self.tile_size
+        rect = pygame.Rect((index % self.columns) * size, (index // self.columns) * size, size, size)
+        return rect.clip(self.sheet.get_rect())
+
+    def get(self, key, default=None):
+        """Return a zero-copy view of the cell for a name or index."""
+        index = self.index(key)
+        if index in self.baked:
+            return self.baked[index]
+        if index is None or not self.load() or not 0 <= index < len(self):
+            return default
+        view = self.views.get(index)
+        if view is None:
+            view = self.sheet.subsurface(self.cell_rect(index))
+            self.views[index] = view
+        return view
+
+    def materialize(self, key):
+        """Return an independent tile_size x tile_size copy of a cell."""
+        view = self.get(key)
+        if view is None:
+            return None
+        tile = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
+        tile.blit(view, (0, 0))
+        return tile
+
+    def __getitem__(self, key):
+        view = self.get(key)
+        if view is None:
+            raise IndexError(f"{self.filename} has no cell {key!r}")
+        return view
+
+    def __len__(self):
+        if not self.load():
+            return 0
+        return self.columns * self.rows
+
+    def __bool__(self):
+        return not self.missing
@@ -1,15 +1,12 @@
 """Base UI module."""
 import pygame
-import textwrap
+from stinkworld.ui.fonts import get_font, get_font_manager, render_text
+from stinkworld.ui.text_layout import get_text_layout, render_paragraph
 from stinkworld.utils.debug import debug_log
 
 def draw_wrapped_text(surface, text, font, color, rect, line_height):
-    lines = textwrap.wrap(text, width=50)
-    y = rect.top
-    for line in lines:
-        rendered = font.render(line, True, color)
-        surface.blit(rendered, (rect.left, y))
-        y += line_height
+    """Draw text wrapped to the rect's width."""
+    surface.blit(render_paragraph(text, font, color, rect.width, line_height), rect.topleft)
 
 class UI:
     """Base UI class for rendering game interface."""
@@ -17,12 +14,14 @@ class UI:
     def __init__(self, settings):
         """Initialize UI."""
         self.settings = settings
-        self.font = pygame.font.SysFont(settings.ui_font, settings.ui_font_size)
+        get_font_manager().set_cache_size(settings.text_cache_size)
+        get_text_layout().set_cache_size(settings.text_layout_cache_size)
+        self.font = get_font(settings.ui_font_size, settings.ui_font)
         self.color = settings.ui_color
     
     def render_text(self, screen, text, x, y):
         """Render text on screen."""
-        surface = self.font.render(text, True, self.color)
+        surface = render_text(self.font, text, self.color)
         screen.blit(surface, (x, y))
     
     def render(self, screen):
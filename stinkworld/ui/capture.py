@@ -0,0 +1,156 @@
+"""Frame capture: screenshots and raw recordings encoded off the render thread."""
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+import numpy as np
+import pygame
+from stinkworld.core.settings import CAPTURE_DIR, CAPTURE_QUEUE_DEPTH
+from stinkworld.utils.debug import debug_log
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_LEVEL = 6  # zlib level for screenshots
+
+def png_chunk(tag, data):
+    """One length-prefixed, CRC-suffixed PNG chunk."""
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+def encode_png(rows, width, height, level=PNG_LEVEL):
+    """Encode 8-bit RGB scanlines, each already prefixed with its filter byte, as a PNG file."""
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)  # 8-bit truecolor, no interlace
+    return (PNG_SIGNATURE + png_chunk(b'IHDR', header)
+            + png_chunk(b'IDAT', zlib.compress(rows, level)) + png_chunk(b'IEND', b''))
+
+class FrameCapture:
+    """Copies frames into pooled buffers and writes them out on a background thread.
+
+    A buffer is a (height, 1 + width * 3) uint8 array: PNG scanlines with
+    the filter byte column left at 0 ("none"), so the render thread does a
+    single pixel copy and the encoder compresses the buffer as is. There
+    are `depth` buffers; a frame captured while all of them are waiting to
+    be encoded is dropped and counted rather than stalling the frame.
+
+    Screenshots become PNG files. Recordings append raw RGB24 frames to
+    one .rgb file per recording, named with the frame size, e.g.
+    ffmpeg -f rawvideo -pix_fmt rgb24 -s 1280x720 -r 60 -i rec_1280x720.rgb
+    """
+
+    def __init__(self, directory=CAPTURE_DIR, depth=CAPTURE_QUEUE_DEPTH):
+        """Initialize frame capture; the encoder thread starts with the first capture."""
+        self.directory = directory
+        self.depth = depth
+        self.free = queue.SimpleQueue()  # Buffers ready to be filled
+        for _ in range(depth):
+            self.free.put(None)  # Allocated on first use, at the frame's size
+        self.jobs = queue.Queue()
+        self.thread = None
+        self.raw_files = {}  # path -> open file, used by the encoder thread only
+        self.recording = None  # Stem of the active recording
+        self.shots = 0
+        self.stats = {'captured': 0, 'written': 0, 'dropped': 0, 'failed': 0}
+
+    def capture(self, surface, name=None, fmt='png'):
+        """Queue a copy of the surface as a PNG file or a raw frame, returns False if it was dropped."""
+        try:
+            buffer = self.free.get_nowait()
+        except queue.Empty:
+            self.stats['dropped'] += 1
+            return False
+        width, height = surface.get_size()
+        if buffer is None or buffer.shape != (height, 1 + width * 3):
+            buffer = np.zeros((height, 1 + width * 3), dtype=np.uint8)
+        pixels = buffer[:, 1:].reshape(height, width, 3)
+        pygame.pixelcopy.surface_to_array(pixels.transpose(1, 0, 2), surface, 'P')
+
+        if name is None:
+            self.shots += 1
+            name = f"shot_{time.strftime('%Y%m%d_%H%M%S')}_{self.shots:03d}"
+        if fmt == 'png':
+            path = os.path.join(self.directory, name + '.png')
+        else:
+            path = os.path.join(self.directory, f"{name}_{width}x{height}.rgb")
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.encode_loop, name='FrameCapture', daemon=True)
+            self.thread.start()
+        self.jobs.put((buffer, fmt, path))
+        self.stats['captured'] += 1
+        return True
+
+    def screenshot(self, surface, name=None):
+        """Queue a PNG of the surface."""
+        return self.capture(surface, name, 'png')
+
+    def start_recording(self, name=None):
+        """Start appending every frame passed to record_frame() to a raw file."""
+        self.recording = name or f"rec_{time.strftime('%Y%m%d_%H%M%S')}"
+        debug_log(f"[Capture] Recording to {self.directory}/{self.recording}_*.rgb")
+
+    def stop_recording(self):
+        """Stop recording; the file is closed once its frames are written."""
+        if self.recording:
+            self.jobs.put((None, 'close', self.recording))
+            debug_log(f"[Capture] Recording {self.recording} stopped, {self.stats['dropped']} frames dropped so far")
+        self.recording = None
+
+    def record_frame(self, surface):
+        """Queue a frame of the active recording."""
+        if self.recording:
+            self.capture(surface, self.recording, 'raw')
+
+    def encode_loop(self):
+        """Encoder thread: write queued frames until a None job arrives."""
+        while True:
+            job = self.jobs.get()
+            try:
+                if job is None:
+                    return
+                buffer, fmt, path = job
+                if fmt == 'close':
+                    self.close_raw(path)
+                else:
+                    self.write(buffer, fmt, path)
+            finally:
+                self.jobs.task_done()
+
+    def close_raw(self, name):
+        """Close the raw files of a recording (runs on the encoder thread)."""
+        for path in [path for path in self.raw_files if os.path.basename(path).startswith(name + '_')]:
+            self.raw_files.pop(path).close()
+
+    def write(self, buffer, fmt, path):
+        """Write one frame and return its buffer to the pool (runs on the encoder thread)."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if fmt == 'png':
+                height, row = buffer.shape
+                data = encode_png(buffer.data, (row - 1) // 3, height)
+                with open(path, 'wb') as f:
+                    f.write(data)
+                debug_log(f"[Capture] Saved {path}")
+            else:
+                f = self.raw_files.get(path)
+                if f is None:
+                    f = self.raw_files[path] = open(path, 'ab')
+                f.write(buffer[:, 1:].tobytes())
+            self.stats['written'] += 1
+        except OSError as e:
+            self.stats['failed'] += 1
+            debug_log(f"[Capture] Failed to write {path}: {e}")
+        finally:
+            self.free.put(buffer)
+
+    def flush(self):
+        """Wait until every queued frame is written."""
+        if self.thread is not None:
+            self.jobs.join()
+
+    def close(self):
+        """Write what is queued, close recordings and stop the encoder thread."""
+        self.stop_recording()
+        if self.thread is not None:
+            self.jobs.put(None)
+            self.thread.join()
+            self.thread = None
+        debug_log(f"[Capture] Closed: {self.stats}")
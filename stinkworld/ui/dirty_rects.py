@@ -0,0 +1,96 @@
+"""Dirty-rectangle tracking for partial display updates."""
+import pygame
+from stinkworld.core.settings import TILE_SIZE, DIRTY_RECT_MAX_COVERAGE
+
+FRAME_IDLE = 'idle'  # Nothing changed, skip composing and presenting
+FRAME_PARTIAL = 'partial'  # Compose inside the clip rect, update only the dirty rects
+FRAME_FULL = 'full'  # Compose everything and flip
+
+class DirtyRectTracker:
+    """Collects the screen regions that changed since the last presented frame.
+
+    Sources add rects directly (tile invalidations) or through track(), which
+    compares a per-key signature and rect with the previous frame and marks
+    both the old and new rect when either changed (entities, HUD fields).
+    plan() turns the collected rects into an idle, partial or full frame;
+    rects are snapped to the tile grid so tile-based renderers can redraw
+    exactly the clip area.
+    """
+
+    def __init__(self, screen_size, max_coverage=DIRTY_RECT_MAX_COVERAGE, align=TILE_SIZE):
+        """Initialize tracker."""
+        self.screen_rect = pygame.Rect((0, 0), screen_size)
+        self.max_coverage = max_coverage
+        self.align = align
+        self.rects = []
+        self.full = True  # The first frame is always drawn completely
+        self.tracked = {}  # key -> (signature, rect) as of the last frame
+        self.seen = set()
+        self.update_rects = []
+        self.clip = None
+        self.stats = {FRAME_IDLE: 0, FRAME_PARTIAL: 0, FRAME_FULL: 0}
+
+    def invalidate_all(self):
+        """Force the next frame to be drawn and flipped completely."""
+        self.full = True
+
+    def add(self, rect):
+        """Mark a screen rect as changed."""
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width and rect.height:
+            self.rects.append(rect)
+
+    def track(self, key, signature, rect):
+        """Mark the old and new rect of key dirty if its signature or rect changed."""
+        self.seen.add(key)
+        old = self.tracked.get(key)
+        if old is not None and old[0] == signature and old[1] == rect:
+            return
+        if old is not None:
+            self.add(old[1])
+        self.add(rect)
+        self.tracked[key] = (signature, rect)
+
+    def end_tracking(self):
+        """Mark rects of keys that were not tracked this frame (removed entities, hidden fields)."""
+        for key in [key for key in self.tracked if key not in self.seen]:
+            self.add(self.tracked.pop(key)[1])
+        self.seen.clear()
+
+    def snap(self, rect):
+        """Grow a rect to the tile grid."""
+        align = self.align
+        left, top = rect.left // align * align, rect.top // align * align
+        right = -(-rect.right // align) * align
+        bottom = -(-rect.bottom // align) * align
+        return pygame.Rect(left, top, right - left, bottom - top).clip(self.screen_rect)
+
+    def plan(self):
+        """Decide how to draw this frame, returns one of FRAME_IDLE, FRAME_PARTIAL, FRAME_FULL."""
+        self.clip = None
+        self.update_rects = []
+        if self.full:
+            mode = FRAME_FULL
+        elif not self.rects:
+            mode = FRAME_IDLE
+        else:
+            self.update_rects = [self.snap(rect) for rect in self.rects]
+            clip = self.update_rects[0].unionall(self.update_rects[1:])
+            screen_area = self.screen_rect.width * self.screen_rect.height
+            if clip.width * clip.height > self.max_coverage * screen_area:
+                mode = FRAME_FULL
+            else:
+                mode = FRAME_PARTIAL
+                self.clip = clip
+        self.stats[mode] += 1
+        return mode
+
+    def present(self, mode):
+        """Push the composed frame to the display and start collecting the next one."""
+        if mode == FRAME_FULL:
+            pygame.display.flip()
+        elif mode == FRAME_PARTIAL:
+            pygame.display.update(self.update_rects)
+        self.rects = []
+        self.update_rects = []
+        self.full = False
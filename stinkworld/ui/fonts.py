@@ -0,0 +1,71 @@
+"""Font manager and rendered-text cache."""
+import pygame
+from collections import OrderedDict
+from stinkworld.core.settings import TEXT_CACHE_SIZE
+from stinkworld.utils.debug import debug_log
+
+class FontManager:
+    """Loads each (face, size) font once and caches rendered text surfaces."""
+
+    def __init__(self, cache_size=TEXT_CACHE_SIZE):
+        """Initialize font manager."""
+        self.fonts = {}  # (face, size) -> pygame.font.Font
+        self.text_cache = OrderedDict()  # (font, text, color, antialias) -> Surface
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size, face=None):
+        """Return the font for (face, size), loading it on first use."""
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(face, size)
+            self.fonts[key] = font
+            debug_log(f"[Fonts] Loaded font {face or 'default'} at size {size}")
+        return font
+
+    def render(self, font, text, color, antialias=True):
+        """Render text through the LRU cache.
+
+        The returned surface is shared, so callers must not draw on it.
+        """
+        key = (font, text, tuple(color), antialias)
+        surface = self.text_cache.get(key)
+        if surface is not None:
+            self.text_cache.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.text_cache[key] = surface
+        if len(self.text_cache) > self.cache_size:
+            self.text_cache.popitem(last=False)
+        return surface
+
+    def set_cache_size(self, cache_size):
+        """Change how many text surfaces are kept, dropping the oldest if over."""
+        self.cache_size = cache_size
+        while len(self.text_cache) > cache_size:
+            self.text_cache.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached text surfaces (fonts stay loaded)."""
+        self.text_cache.clear()
+
+_font_manager = None
+
+def get_font_manager():
+    """Return the shared font manager, creating it on first use."""
+    global _font_manager
+    if _font_manager is None:
+        _font_manager = FontManager()
+    return _font_manager
+
+def get_font(size, face=None):
+    """Shortcut for get_font_manager().get_font()."""
+    return get_font_manager().get_font(size, face)
+
+def render_text(font, text, color, antialias=True):
+    """Shortcut for get_font_manager().render()."""
+    return get_font_manager().render(font, text, color, antialias)
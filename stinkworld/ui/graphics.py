@@ -3,18 +3,32 @@ import pygame
 import os
 import random
 from stinkworld.utils.debug import debug_log
+from stinkworld.entities.direction import Direction
+from stinkworld.ui.atlas import SpriteAtlas, ROGUELIKE_MANIFEST, TOPDOWN_MANIFEST
+from stinkworld.ui.asset_cache import AssetCache
 
 # Constants for viewport and tile size
 VIEWPORT_WIDTH = 800  # Adjust as needed
 VIEWPORT_HEIGHT = 600  # Adjust as needed
 TILE_SIZE = 32  # Standard tile size
 
+# Spritesheets whose manifest cells are baked into the asset cache: attribute -> (filename, manifest)
+SPRITESHEETS = {
+    'roguelike_tiles': ('The Roguelike 1-15-1.png', ROGUELIKE_MANIFEST),
+    'ground_tiles': ('32x32 topdown tileset Spreadsheet V1-1.png', TOPDOWN_MANIFEST),
+}
+TERRAIN_SPRITE_KEYS = ['road_h', 'road_v', 'road_intersection', 'grass', 'sidewalk', 'building', 'floor', 'tree', 'water']
+FURNITURE_SPRITE_KEYS = ['bed', 'toilet', 'sink', 'desk', 'table', 'fridge', 'oven', 'counter', 'shop_shelf']
+VEHICLE_SPRITE_KEYS = ['sedan', 'sports_car', 'suv', 'truck']
+
 class Graphics:
     """Handles rendering of game elements."""
     
-    def __init__(self, game=None):
+    def __init__(self, game=None, asset_cache=None):
         """Initialize graphics system."""
         self.game = game  # Reference to the Game instance
+        self.asset_cache = asset_cache or AssetCache()
+        self.car_direction = None  # Facing of the car draw_car() is drawing, for sprite flipping
         self.terrain_colors = {
             'road_h': (90, 90, 90),
             'road_v': (90, 90, 90),
@@ -49,59 +63,96 @@ class Graphics:
         self.sprites = {}
         self.load_sprites()
         
-        # Load Roguelike wall spritesheet
-        self.roguelike_tiles = self.load_spritesheet('The Roguelike 1-15-1.png', 32)
-        
+    def sprite_sources(self):
+        """Return the files the baked sprites are built from (this module plus any PNGs)."""
+        sprite_dir = os.path.join(os.getcwd(), "sprites")
+        sources = [os.path.abspath(__file__)]
+        for key in TERRAIN_SPRITE_KEYS + FURNITURE_SPRITE_KEYS + VEHICLE_SPRITE_KEYS:
+            sources.append(os.path.join(sprite_dir, f"{key}.png"))
+        for filename, _ in SPRITESHEETS.values():
+            sources.append(os.path.join(sprite_dir, filename))
+        return sources
+
     def load_sprites(self):
-        """Load all game sprites, using PNGs from sprites/ if available."""
+        """Load all game sprites from the asset cache, rebuilding it if the sources changed."""
+        sources = self.sprite_sources()
+        surfaces = self.asset_cache.load(sources)
+        if surfaces is None:
+            surfaces = self.build_sprites()
+            self.asset_cache.save(surfaces, sources)
+        
+        self.terrain_sprites = {}
+        self.furniture_sprites = {}
+        self.vehicle_sprites = {}
+        cells = {filename: {} for filename, _ in SPRITESHEETS.values()}
+        categories = {'terrain': self.terrain_sprites, 'furniture': self.furniture_sprites,
+                      'vehicle': self.vehicle_sprites}
+        for full_key, surface in surfaces.items():
+            category, key = full_key.split('/', 1)
+            if category in categories:
+                categories[category][key] = surface
+            elif category == 'cell':
+                filename, name = key.split('/', 1)
+                cells.setdefault(filename, {})[name] = surface
+        for attr, (filename, manifest) in SPRITESHEETS.items():
+            setattr(self, attr, SpriteAtlas(filename, 32, manifest, cells=cells[filename]))
+
+    def build_sprites(self):
+        """Build every sprite, using PNGs from sprites/ if available, keyed 'category/name'."""
         sprite_dir = os.path.join(os.getcwd(), "sprites")
+        sprites = {}
         # Terrain
-        self.terrain_sprites = {}
-        for key in ['road_h', 'road_v', 'road_intersection', 'grass', 'sidewalk', 'building', 'floor', 'tree', 'water']:
+        for key in TERRAIN_SPRITE_KEYS:
             sprite_path = os.path.join(sprite_dir, f"{key}.png")
             if os.path.exists(sprite_path):
-                self.terrain_sprites[key] = pygame.image.load(sprite_path).convert_alpha()
+                sprites[f"terrain/{key}"] = pygame.image.load(sprite_path).convert_alpha()
             else:
                 # Fallback to procedural
                 if key == 'road_h':
-                    self.terrain_sprites[key] = self.create_road_sprite('horizontal')
+                    sprites[f"terrain/{key}"] = self.create_road_sprite('horizontal')
                 elif key == 'road_v':
-                    self.terrain_sprites[key] = self.create_road_sprite('vertical')
+                    sprites[f"terrain/{key}"] = self.create_road_sprite('vertical')
                 elif key == 'road_intersection':
-                    self.terrain_sprites[key] = self.create_road_sprite('intersection')
+                    sprites[f"terrain/{key}"] = self.create_road_sprite('intersection')
                 elif key == 'grass':
-                    self.terrain_sprites[key] = self.create_grass_sprite()
+                    sprites[f"terrain/{key}"] = self.create_grass_sprite()
                 elif key == 'sidewalk':
-                    self.terrain_sprites[key] = self.create_sidewalk_sprite()
+                    sprites[f"terrain/{key}"] = self.create_sidewalk_sprite()
                 elif key == 'building':
-                    self.terrain_sprites[key] = self.create_building_sprite()
+                    sprites[f"terrain/{key}"] = self.create_building_sprite()
                 elif key == 'floor':
                     # Simple tan/beige fill for floor
                     surface = pygame.Surface((32, 32))
                     surface.fill((220, 210, 180))
-                    self.terrain_sprites[key] = surface
+                    sprites[f"terrain/{key}"] = surface
                 elif key == 'tree':
-                    self.terrain_sprites[key] = self.create_tree_sprite()
+                    sprites[f"terrain/{key}"] = self.create_tree_sprite()
                 elif key == 'water':
-                    self.terrain_sprites[key] = self.create_water_sprite()
+                    sprites[f"terrain/{key}"] = self.create_water_sprite()
         # Furniture
-        self.furniture_sprites = {}
-        for key in ['bed', 'toilet', 'sink', 'desk', 'table', 'fridge', 'oven', 'counter', 'shop_shelf']:
+        for key in FURNITURE_SPRITE_KEYS:
             sprite_path = os.path.join(sprite_dir, f"{key}.png")
             if os.path.exists(sprite_path):
-                self.furniture_sprites[key] = pygame.image.load(sprite_path).convert_alpha()
+                sprites[f"furniture/{key}"] = pygame.image.load(sprite_path).convert_alpha()
             else:
                 create_method = getattr(self, f"create_{key}_sprite", None)
                 if create_method:
-                    self.furniture_sprites[key] = create_method()
+                    sprites[f"furniture/{key}"] = create_method()
         # Vehicles
-        self.vehicle_sprites = {}
-        for key in ['sedan', 'sports_car', 'suv', 'truck']:
+        for key in VEHICLE_SPRITE_KEYS:
             sprite_path = os.path.join(sprite_dir, f"{key}.png")
             if os.path.exists(sprite_path):
-                self.vehicle_sprites[key] = pygame.image.load(sprite_path).convert_alpha()
+                sprites[f"vehicle/{key}"] = pygame.image.load(sprite_path).convert_alpha()
             else:
-                self.vehicle_sprites[key] = self.create_car_sprite(key)
+                sprites[f"vehicle/{key}"] = self.create_car_sprite(key)
+        # Spritesheet cells the game looks up by name, copied out of the atlases' views
+        for filename, manifest in SPRITESHEETS.values():
+            atlas = SpriteAtlas(filename, 32, manifest)
+            for name in manifest:
+                tile = atlas.materialize(name)
+                if tile is not None:
+                    sprites[f"cell/{filename}/{name}"] = tile
+        return sprites
 
     def create_bed_sprite(self):
         """Create a bed sprite."""
@@ -247,10 +298,11 @@ class Graphics:
         surface = pygame.Surface((32, 32))
         surface.fill((34, 139, 34))  # Base green
         
-        # Add grass detail
+        # Add grass detail (own RNG so the sprite is reproducible and cached builds match)
+        rng = random.Random('grass')
         for _ in range(10):
-            x = random.randint(0, 31)
-            y = random.randint(0, 31)
+            x = rng.randint(0, 31)
+            y = rng.randint(0, 31)
             pygame.draw.line(surface, (50, 160, 50), 
                            (x, y), (x, y-4), 1)
         
@@ -311,67 +363,30 @@ class Graphics:
         else:
             print(f"Warning: Invalid sprite type {type(sprite)}")
 
-    def load_spritesheet(self, filename, tile_size=32):
-        """Load a spritesheet and return a list of tile surfaces."""
-        path = os.path.join(os.getcwd(), "sprites", filename)
-        if not os.path.exists(path):
-            debug_log(f"[Graphics] Spritesheet not found: {path}")
-            return []
-        sheet = pygame.image.load(path).convert_alpha()
-        sheet_width, sheet_height = sheet.get_width(), sheet.get_height()
-        tiles = []
-        for y in range(0, sheet_height, tile_size):
-            for x in range(0, sheet_width, tile_size):
-                tile = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
-                tile.blit(sheet, (0, 0), (x, y, tile_size, tile_size))
-                tiles.append(tile)
-        return tiles
-
     def get_ground_tile(self, tile_type):
         """Return the correct ground tile surface for a given type."""
-        mapping = {
-            'grass': 0,  # tile index for grass (from topdown sheet)
-            'dirt': 1,   # tile index for dirt (from topdown sheet)
-            'building': 0,  # wall tile index from roguelike sheet (adjust as needed)
-            'floor': 1,     # floor tile index from roguelike sheet (adjust as needed)
-        }
-        from stinkworld.utils.debug import debug_log
-        if tile_type == 'building':
-            if hasattr(self, 'roguelike_tiles') and self.roguelike_tiles:
-                idx = mapping['building']
-                debug_log(f"[GRAPHICS] Using roguelike wall tile index {idx} for 'building'")
-                if idx < len(self.roguelike_tiles):
-                    return self.roguelike_tiles[idx]
-                else:
-                    debug_log(f"[GRAPHICS] Roguelike wall tile index {idx} out of range!")
-            else:
-                debug_log("[GRAPHICS] Roguelike spritesheet missing for 'building'!")
-        if tile_type == 'floor':
-            if hasattr(self, 'roguelike_tiles') and self.roguelike_tiles:
-                idx = mapping['floor']
-                debug_log(f"[GRAPHICS] Using roguelike floor tile index {idx} for 'floor'")
-                if idx < len(self.roguelike_tiles):
-                    return self.roguelike_tiles[idx]
-                else:
-                    debug_log(f"[GRAPHICS] Roguelike floor tile index {idx} out of range!")
-            else:
-                debug_log("[GRAPHICS] Roguelike spritesheet missing for 'floor'! Using fallback color.")
-        if tile_type not in mapping:
+        if tile_type in ('building', 'floor'):
+            atlas = self.roguelike_tiles
+        elif tile_type in TOPDOWN_MANIFEST:
+            atlas = self.ground_tiles
+        else:
             return None
-        if not hasattr(self, 'ground_tiles'):
-            self.ground_tiles = self.load_spritesheet('32x32 topdown tileset Spreadsheet V1-1.png', 32)
-        idx = mapping[tile_type]
-        if self.ground_tiles and idx < len(self.ground_tiles):
-            debug_log(f"[GRAPHICS] Using topdown sheet tile index {idx} for '{tile_type}'")
-            return self.ground_tiles[idx]
-        debug_log(f"[GRAPHICS] No sprite found for '{tile_type}', using fallback color.")
-        return None
-
-    def draw_terrain(self, screen, terrain_type, x, y):
-        """Draw terrain tile at given screen coordinates."""
+        tile = atlas.get(tile_type)
+        if tile is None:
+            debug_log(f"[GRAPHICS] No sprite found for '{tile_type}', using fallback color.")
+        return tile
+
+    def draw_terrain(self, screen, terrain_type, x, y, tile_pos=None):
+        """Draw terrain tile at given screen coordinates.
+
+        tile_pos is the map position, used to look up door/window state; it
+        defaults to the screen position divided by the tile size.
+        """
+        if tile_pos is None:
+            tile_pos = (x//32, y//32)
         if terrain_type == 'door':
             # Get door state from game
-            state = self.game.furniture_state.get((x//32, y//32), {}).get('state', 'closed')
+            state = self.game.furniture_state.get(tile_pos, {}).get('state', 'closed')
             
             # Draw door with state (open/closed)
             door_surface = pygame.Surface((32, 32), pygame.SRCALPHA)
@@ -396,7 +411,7 @@ class Graphics:
             window_surface = pygame.Surface((32, 32), pygame.SRCALPHA)
             window_surface.fill((80, 80, 100))  # Window frame
             
-            state = self.game.furniture_state.get((x//32, y//32), {}).get('state', 'normal')
+            state = self.game.furniture_state.get(tile_pos, {}).get('state', 'normal')
             if state == 'broken':
                 # Broken window effect
                 pygame.draw.rect(window_surface, (200, 220, 255, 100), (4, 4, 24, 24))  # Glass
@@ -478,12 +493,12 @@ class Graphics:
             if direction == 'horizontal':
                 blit_sprite = pygame.transform.scale(sprite, (size*2, size))
                 # Flip horizontally if moving left
-                if hasattr(self, 'car_direction') and self.car_direction == 'left':
+                if self.car_direction == Direction.LEFT:
                     blit_sprite = pygame.transform.flip(blit_sprite, True, False)
             else:
                 blit_sprite = pygame.transform.rotate(pygame.transform.scale(sprite, (size*2, size)), 90)
                 # Flip vertically if moving up
-                if hasattr(self, 'car_direction') and self.car_direction == 'up':
+                if self.car_direction == Direction.UP:
                     blit_sprite = pygame.transform.flip(blit_sprite, False, True)
             surface.blit(blit_sprite, (x, y))
         else:
@@ -579,11 +594,12 @@ class Graphics:
                            (4, 6 + i*7, 24, 2))
             
         # Draw items on shelves (simplified)
+        rng = random.Random('shop_shelf')
         for i in range(3):
             for j in range(4):
-                pygame.draw.rect(surface, (random.randint(50, 200),
-                                         random.randint(50, 200),
-                                         random.randint(50, 200)),
+                pygame.draw.rect(surface, (rng.randint(50, 200),
+                                         rng.randint(50, 200),
+                                         rng.randint(50, 200)),
                                (6 + i*8, 8 + j*7, 4, 4))
         
         return surface
@@ -628,13 +644,5 @@ class Graphics:
             pygame.draw.rect(surface, (255, 0, 255), (x, y, size, size))
 
     def redraw_tile(self, x, y):
-        """Force redraw of a specific tile."""
-        # Convert tile coordinates to screen coordinates
-        screen_x = (x - self.game.player.x + VIEWPORT_WIDTH // 2) * TILE_SIZE
-        screen_y = (y - self.game.player.y + VIEWPORT_HEIGHT // 2) * TILE_SIZE
-        
-        # Get tile type and redraw
-        tile = self.game.city.get_tile(x, y)
-        if tile == 'door':
-            self.draw_terrain(self.screen, 'door', screen_x, screen_y)
-        pygame.display.update(pygame.Rect(screen_x, screen_y, TILE_SIZE, TILE_SIZE))
\ No newline at end of file
+        """Force redraw of a specific map tile on the next frame."""
+        self.game.invalidate_tile(x, y)
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""Per-tile light map for night rendering."""
+import numpy as np
+import pygame
+from stinkworld.core.settings import TILE_SIZE, TILE_ROAD, TILE_WINDOW, STREET_LAMP_SPACING
+from stinkworld.utils.debug import debug_log
+
+# Light sources: (color, radius in tiles, strength)
+LAMP_LIGHT = ((255, 200, 140), 3, 0.6)
+WINDOW_LIGHT = ((255, 190, 110), 2, 0.5)
+HEADLIGHT = ((255, 250, 220), 3, 0.8)
+FIRE_LIGHT = ((255, 120, 40), 3, 1.0)
+HEADLIGHT_REACH = 2  # Tiles ahead of the car the headlight pool is centred
+FIRE_TURNS = 40  # Turns a fire burns, fading out towards the end
+LIGHTS_ON_HOUR = 17  # Occupied homes switch their lights on from this hour
+DAYLIGHT = (255, 255, 255)
+SMOOTH_SCALE = 8  # Pixels per tile of the smoothed light before the final upscale
+
+def falloff_kernel(color, radius, strength):
+    """(2r+1, 2r+1, 3) light contribution around a source, fading quadratically with distance."""
+    dy, dx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+    falloff = np.clip(1.0 - np.hypot(dx, dy) / (radius + 1), 0.0, None) ** 2
+    return (falloff[:, :, None] * np.array(color, dtype=np.float32) * strength).astype(np.float32)
+
+def stamp(layer, x, y, kernel, x0=0, y0=0, x1=None, y1=None, scale=1.0):
+    """Add a kernel centred on (x, y) to layer, restricted to the rect x0 <= x < x1, y0 <= y < y1."""
+    height, width = layer.shape[:2]
+    x1 = width if x1 is None else x1
+    y1 = height if y1 is None else y1
+    r = kernel.shape[0] // 2
+    left, top = max(x0, x - r), max(y0, y - r)
+    right, bottom = min(x1, x + r + 1), min(y1, y + r + 1)
+    if left >= right or top >= bottom:
+        return
+    patch = kernel[top - y + r:bottom - y + r, left - x + r:right - x + r]
+    if scale != 1.0:
+        patch = patch * scale
+    layer[top:bottom, left:right] += patch
+
+class LightMap:
+    """Accumulates light sources into a low-resolution RGB buffer, one sample per tile.
+
+    Street lamps and lit building windows go into a static layer that is
+    only re-stamped inside the region around a source that switched on or
+    off. Headlights and fires are stamped per frame into the visible window
+    only. The window (ambient light + static + dynamic, clipped to 0-255)
+    is upscaled once to the viewport and multiplied onto the frame with a
+    single BLEND_MULT blit; the scaled surface is reused while the window
+    doesn't change, and full daylight skips the pass entirely.
+    """
+
+    def __init__(self, game, lamp_spacing=STREET_LAMP_SPACING):
+        """Initialize light map."""
+        self.game = game
+        city = game.city
+        self.kernels = {name: falloff_kernel(*spec) for name, spec in
+                        (('lamp', LAMP_LIGHT), ('window', WINDOW_LIGHT),
+                         ('headlight', HEADLIGHT), ('fire', FIRE_LIGHT))}
+        self.static = np.zeros((city.height, city.width, 3), dtype=np.float32)
+        self.fires = {}  # (x, y) -> turns left
+
+        # Buildings: shell rects and when each household turns its lights off
+        rects = np.array(city.buildings, dtype=np.intp).reshape(-1, 4)
+        self.building_rects = np.column_stack((rects[:, 0], rects[:, 1],
+                                               rects[:, 0] + rects[:, 2], rects[:, 1] + rects[:, 3]))
+        self.lights_out = np.random.default_rng(len(city.buildings)).integers(22, 30, len(city.buildings)) % 24
+        self.building_lit = np.zeros(len(city.buildings), dtype=bool)
+        self.building_at = np.full((city.height, city.width), -1, dtype=np.int32)  # Building index per tile, -1 outside
+        for index, (x0, y0, x1, y1) in enumerate(self.building_rects.tolist()):
+            self.building_at[y0:y1, x0:x1] = index  # Buildings never overlap
+
+        # Static sources: lamps (always on at night) then windows (on while their building is lit)
+        lamps = self.find_lamps(city.tiles, lamp_spacing)
+        windows, owners = self.find_windows(city.tiles)
+        self.lamp_count = len(lamps)
+        self.source_pos = np.concatenate([lamps, windows]).reshape(-1, 2)
+        self.source_owner = np.concatenate([np.full(len(lamps), -1, dtype=np.intp), owners])
+        self.source_on = self.source_owner < 0
+        self.source_kernel = ['lamp'] * len(lamps) + ['window'] * len(windows)
+        self.source_radius = np.array([self.kernels[k].shape[0] // 2 for k in self.source_kernel], dtype=np.intp)
+        self.rebuild(0, 0, city.width, city.height)
+        debug_log(f"[LightMap] {len(lamps)} street lamps, {len(windows)} windows in {len(city.buildings)} buildings")
+
+        self.window = None  # Last composed (view_h, view_w, 3) uint8 light window
+        self.window_origin = None
+        self.surface = None  # Upscaled window, ready to multiply onto the frame
+        self.scaled = None  # Reused full-size target of the upscale
+        self.smooth_scale = SMOOTH_SCALE  # Pixels per tile of the smoothed light, 0 for blocky tiles
+        game.city.add_tile_listener(self.on_tile_changed)
+
+    def find_lamps(self, tiles, spacing):
+        """Road tiles on the edge of the network, about one every `spacing` tiles."""
+        roads = tiles == TILE_ROAD
+        padded = np.pad(roads, 1, constant_values=False)
+        edge = roads & ~(padded[:-2, 1:-1] & padded[2:, 1:-1] & padded[1:-1, :-2] & padded[1:-1, 2:])
+        ys, xs = np.nonzero(edge & (np.add.outer(np.arange(tiles.shape[0]), np.arange(tiles.shape[1])) % spacing == 0))
+        return np.column_stack((xs, ys)).astype(np.intp)
+
+    def find_windows(self, tiles):
+        """Window tiles and the building each belongs to."""
+        positions, owners = [], []
+        for index, (x0, y0, x1, y1) in enumerate(self.building_rects.tolist()):
+            ys, xs = np.nonzero(tiles[y0:y1, x0:x1] == TILE_WINDOW)
+            positions.append(np.column_stack((xs + x0, ys + y0)))
+            owners.append(np.full(len(xs), index, dtype=np.intp))
+        if not positions:
+            return np.zeros((0, 2), dtype=np.intp), np.zeros(0, dtype=np.intp)
+        return np.concatenate(positions).astype(np.intp), np.concatenate(owners)
+
+    def rebuild(self, x0, y0, x1, y1):
+        """Re-stamp the static layer inside a tile rect from every source that reaches it."""
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.static.shape[1], x1), min(self.static.shape[0], y1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        self.static[y0:y1, x0:x1] = 0.0
+        pos, radius = self.source_pos, self.source_radius
+        reaches = (self.source_on & (pos[:, 0] + radius >= x0) & (pos[:, 0] - radius < x1) &
+                   (pos[:, 1] + radius >= y0) & (pos[:, 1] - radius < y1))
+        for i in np.nonzero(reaches)[0].tolist():
+            x, y = pos[i].tolist()
+            stamp(self.static, x, y, self.kernels[self.source_kernel[i]], x0, y0, x1, y1)
+
+    def on_tile_changed(self, x, y, old_tile, new_tile):
+        """Drop window sources whose tile stopped being a window."""
+        if old_tile == TILE_WINDOW and new_tile != TILE_WINDOW:
+            gone = np.all(self.source_pos == (x, y), axis=1) & (self.source_owner >= 0)
+            if gone.any():
+                self.source_on[gone] = False
+                self.source_owner[gone] = -2  # Never relit
+                r = self.kernels['window'].shape[0] // 2
+                self.rebuild(x - r, y - r, x + r + 1, y + r + 1)
+
+    def add_fire(self, x, y, turns=FIRE_TURNS):
+        """Start a fire at a tile."""
+        self.fires[(x, y)] = turns
+
+    def update_sources(self):
+        """Per-turn update: burn down fires and switch building lights by hour and occupancy."""
+        self.fires = {pos: turns - 1 for pos, turns in self.fires.items() if turns > 1}
+        if not len(self.building_rects):
+            return
+        game = self.game
+        hour = game.time_system.hour
+        evening = (hour - LIGHTS_ON_HOUR) % 24 < (self.lights_out - LIGHTS_ON_HOUR) % 24
+
+        # Anyone standing inside a building keeps its lights on
+        xy = game.population.positions(alive=True)
+        if game.player is not None:
+            xy = np.vstack((xy, [(game.player.x, game.player.y)]))
+        occupied = np.zeros(len(self.building_rects), dtype=bool)
+        owners = self.building_at[xy[:, 1], xy[:, 0]]
+        occupied[owners[owners >= 0]] = True
+
+        lit = evening | occupied
+        changed = np.nonzero(lit != self.building_lit)[0]
+        if not len(changed):
+            return
+        self.building_lit = lit
+        windows = self.source_owner >= 0
+        self.source_on[windows] = lit[self.source_owner[windows]]
+        r = self.kernels['window'].shape[0] // 2
+        for index in changed.tolist():
+            x0, y0, x1, y1 = self.building_rects[index].tolist()
+            self.rebuild(x0 - r, y0 - r, x1 + r, y1 + r)
+
+    def compose(self, camera_x, camera_y, view_w, view_h):
+        """Build the (view_h, view_w, 3) uint8 light window for the viewport."""
+        ambient = np.array(self.game.time_system.get_ambient_light(), dtype=np.float32)
+        light = np.empty((view_h, view_w, 3), dtype=np.float32)
+        light[...] = ambient
+        map_h, map_w = self.static.shape[:2]
+        x1, y1 = min(camera_x + view_w, map_w), min(camera_y + view_h, map_h)
+        light[:y1 - camera_y, :x1 - camera_x] += self.static[camera_y:y1, camera_x:x1]
+
+        # Dynamic sources, stamped in window coordinates
+        for car in self.game.cars:
+            dx, dy = car.direction.dx, car.direction.dy
+            stamp(light, car.x - camera_x + dx * HEADLIGHT_REACH, car.y - camera_y + dy * HEADLIGHT_REACH,
+                  self.kernels['headlight'])
+        for (x, y), turns in self.fires.items():
+            stamp(light, x - camera_x, y - camera_y, self.kernels['fire'], scale=min(1.0, turns / 10))
+        return np.clip(light, 0, 255).astype(np.uint8)
+
+    def update(self, camera_x, camera_y, view_w, view_h):
+        """Recompose the light window, returns the changed tile rect (x, y, w, h in view tiles) or None."""
+        window = self.compose(camera_x, camera_y, view_w, view_h)
+        previous = self.window
+        self.window = window
+        if previous is None or previous.shape != window.shape or self.window_origin != (camera_x, camera_y):
+            self.window_origin = (camera_x, camera_y)
+            self.surface = None
+            return (0, 0, view_w, view_h)
+        changed = np.any(previous != window, axis=2)
+        if not changed.any():
+            return None
+        self.surface = None
+        ys, xs = np.nonzero(changed)
+        return (int(xs.min()), int(ys.min()), int(xs.max() - xs.min()) + 1, int(ys.max() - ys.min()) + 1)
+
+    def is_daylight(self):
+        """True when the light window is full white, so multiplying would change nothing."""
+        return self.window is not None and bool((self.window == 255).all())
+
+    def set_smooth_scale(self, smooth_scale):
+        """Change the light resolution; the next apply() re-upscales the window."""
+        if smooth_scale != self.smooth_scale:
+            self.smooth_scale = smooth_scale
+            self.surface = None
+
+    def apply(self, screen):
+        """Multiply the last composed light window onto the frame."""
+        if self.window is None or self.is_daylight():
+            return
+        if self.surface is None:
+            # Smooth gradients at smooth_scale px per tile, then a plain nearest-neighbour scale
+            # up to full size, which is about half the cost of one full-size smoothscale
+            view_h, view_w = self.window.shape[:2]
+            smooth = pygame.surfarray.make_surface(self.window.transpose(1, 0, 2))
+            if self.smooth_scale:
+                smooth = pygame.transform.smoothscale(smooth, (view_w * self.smooth_scale, view_h * self.smooth_scale))
+            size = (view_w * TILE_SIZE, view_h * TILE_SIZE)
+            if self.scaled is None or self.scaled.get_size() != size:
+                self.scaled = pygame.Surface(size, 0, smooth)
+            pygame.transform.scale(smooth, size, self.scaled)
+            self.surface = self.scaled
+        screen.blit(self.surface, (0, 0), special_flags=pygame.BLEND_MULT)
+
+    def apply_ambient(self, screen):
+        """Multiply the ambient light alone onto the frame (zoomed-out views)."""
+        ambient = self.game.time_system.get_ambient_light()
+        if ambient != DAYLIGHT:
+            screen.fill(ambient, special_flags=pygame.BLEND_MULT)
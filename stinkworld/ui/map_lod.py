@@ -0,0 +1,195 @@
+"""Zoomed-out map rendering from pre-scaled, chunk-cached tile levels."""
+from collections import OrderedDict
+import numpy as np
+import pygame
+from stinkworld.core.settings import TILE_SIZE, LOD_TILE_SIZES, LOD_CHUNK_SIZE, LOD_CACHE_CHUNKS
+from stinkworld.ui.tile_renderer import (
+    TERRAIN_NAMES, FURNITURE_NAMES, ATLAS_TERRAIN, classify_terrain, reclassify_around
+)
+from stinkworld.utils.debug import debug_log
+
+# Sprite drawn for each tile type at low zoom; furniture gets its own cell
+LOD_NAMES = {**TERRAIN_NAMES, **FURNITURE_NAMES}
+LOD_TERRAIN = ATLAS_TERRAIN + ['door', 'window']
+
+# Chunks hold chunk_size tiles per side at this many pixels per tile or more; at smaller
+# sizes they span more tiles, so a chunk stays about as big on screen at any zoom
+CHUNK_TILE_PX = 16
+
+# Screen pixels between density dots; entities closer than this are aggregated
+DOT_SPACING = 8
+NPC_DOT_COLOR = (255, 220, 0)
+CAR_DOT_COLOR = (255, 70, 70)
+PLAYER_DOT_COLOR = (255, 255, 255)
+
+class MapLOD:
+    """Draws the city zoomed out, from mip levels of the tile atlas.
+
+    Every terrain and furniture sprite is box-filtered down to each size in
+    `tile_sizes` (16, 8, 4 and 1 pixels per tile by default). The map is
+    split into chunks of `chunk_size` tiles, or more when zoomed out
+    further so a chunk stays about as big on screen (see span()); a chunk
+    is built with one NumPy gather from the level closest above the
+    requested zoom (scaled when the zoom falls between levels) and cached,
+    so a frame is a handful of blits however much of the city is visible. Door/window/furniture states and
+    props are not shown at this scale. Entities are drawn as density dots.
+    """
+
+    def __init__(self, game, tile_sizes=LOD_TILE_SIZES, chunk_size=LOD_CHUNK_SIZE, max_chunks=LOD_CACHE_CHUNKS):
+        """Initialize zoomed map."""
+        self.game = game
+        self.tile_sizes = sorted(tile_sizes)
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.cells = {}  # sprite name -> atlas cell
+        self.blocks = None  # (cells, TILE_SIZE, TILE_SIZE, 3) RGB, row-major
+        self.levels = {}  # tile size -> (cells, size, size, 3) uint8
+        self.chunks = OrderedDict()  # (tile px, chunk x, chunk y) -> Surface, least recently used first
+        self.index_layer = None
+        self.origin = (0, 0)  # Screen position of map pixel (0, 0) in the last draw
+        self.px = TILE_SIZE  # Pixels per tile in the last draw
+        self.build_atlas()
+        self.build_layer()
+        game.city.add_tile_listener(self.on_tile_changed)
+
+    def build_atlas(self):
+        """Render terrain and furniture sprites into full-size RGB blocks."""
+        graphics = self.game.graphics
+        blocks = [np.zeros((TILE_SIZE, TILE_SIZE, 3), dtype=np.uint8)]
+        for name in LOD_TERRAIN + list(FURNITURE_NAMES.values()):
+            tile = pygame.Surface((TILE_SIZE, TILE_SIZE))
+            tile.fill((0, 0, 0))
+            if name in FURNITURE_NAMES.values():
+                graphics.draw_furniture(tile, name, 0, 0)
+            else:
+                # Off-map tile_pos, so doors and windows use their default state
+                graphics.draw_terrain(tile, name, 0, 0, (-1, -1))
+            self.cells[name] = len(blocks)
+            blocks.append(pygame.surfarray.array3d(tile).transpose(1, 0, 2))
+        self.blocks = np.stack(blocks)
+        self.levels.clear()
+
+    def level(self, size):
+        """Return the atlas box-filtered to size x size pixels per cell."""
+        level = self.levels.get(size)
+        if level is None:
+            factor = TILE_SIZE // size
+            blocks = self.blocks.reshape(-1, size, factor, size, factor, 3).astype(np.float32)
+            level = np.rint(blocks.mean(axis=(2, 4))).astype(np.uint8)
+            self.levels[size] = level
+            debug_log(f"[MapLOD] Built {size}px tile level")
+        return level
+
+    def level_for(self, px):
+        """Pick the smallest level at least px pixels per tile (the largest if none is)."""
+        for size in self.tile_sizes:
+            if size >= px:
+                return size
+        return self.tile_sizes[-1]
+
+    def build_layer(self):
+        """Classify every map tile into an atlas cell."""
+        self.index_layer = classify_terrain(self.game.city.tiles, self.cells, LOD_NAMES)
+
+    def span(self, px):
+        """Tiles per side of a chunk drawn at px pixels per tile."""
+        return self.chunk_size * max(1, CHUNK_TILE_PX // px)
+
+    def on_tile_changed(self, x, y, old_tile, new_tile):
+        """Reclassify around the tile and drop the chunks near it (road orientation depends on neighbours)."""
+        reclassify_around(self.index_layer, self.game.city.tiles, self.cells, x, y, LOD_NAMES)
+        stale = []
+        for key in self.chunks:
+            n = self.span(key[0])
+            if any(((x + dx) // n, (y + dy) // n) == key[1:] for dx in (-1, 0, 1) for dy in (-1, 0, 1)):
+                stale.append(key)
+        for key in stale:
+            del self.chunks[key]
+
+    def chunk(self, px, chunk_x, chunk_y):
+        """Return the cached surface of one chunk at px pixels per tile."""
+        key = (px, chunk_x, chunk_y)
+        surface = self.chunks.get(key)
+        if surface is not None:
+            self.chunks.move_to_end(key)
+            return surface
+
+        n = self.span(px)
+        index = self.index_layer[chunk_y * n:(chunk_y + 1) * n, chunk_x * n:(chunk_x + 1) * n]
+        rows, cols = index.shape
+        size = self.level_for(px)
+        # (rows, cols, size, size, 3) gathered, then laid out x-major for surfarray
+        pixels = self.level(size)[index].transpose(1, 3, 0, 2, 4).reshape(cols * size, rows * size, 3)
+        surface = pygame.surfarray.make_surface(pixels)
+        if size != px:
+            surface = pygame.transform.smoothscale(surface, (cols * px, rows * px))
+        surface = surface.convert(self.game.screen)
+
+        self.chunks[key] = surface
+        if len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return surface
+
+    def view_origin(self, screen_size, focus, px):
+        """Screen position of the map's top-left corner, centred on focus and clamped to the map."""
+        origin = []
+        for screen, tiles, center in zip(screen_size, self.index_layer.shape[::-1], focus):
+            extent = tiles * px
+            if extent <= screen:
+                origin.append((screen - extent) // 2)  # Whole map fits, centre it
+            else:
+                offset = int((center + 0.5) * px - screen / 2)
+                origin.append(-max(0, min(offset, extent - screen)))
+        return tuple(origin)
+
+    def draw(self, screen, focus, zoom):
+        """Draw the map around the focus tile at a zoom factor; this also clears the screen."""
+        px = max(1, int(round(TILE_SIZE * zoom)))
+        width, height = screen.get_size()
+        ox, oy = self.origin = self.view_origin((width, height), focus, px)
+        self.px = px
+
+        screen.fill((0, 0, 0))
+        map_h, map_w = self.index_layer.shape
+        n = self.span(px)
+        chunk_px = n * px
+        blits = []
+        for chunk_y in range(max(0, -oy // chunk_px), min(-(-map_h // n), (height - 1 - oy) // chunk_px + 1)):
+            for chunk_x in range(max(0, -ox // chunk_px), min(-(-map_w // n), (width - 1 - ox) // chunk_px + 1)):
+                blits.append((self.chunk(px, chunk_x, chunk_y), (ox + chunk_x * chunk_px, oy + chunk_y * chunk_px)))
+        screen.blits(blits, doreturn=False)
+
+    def draw_density(self, screen, positions, color):
+        """Draw entities as one dot per DOT_SPACING cell, sized by how many share it."""
+        if not len(positions):
+            return
+        px = self.px
+        ox, oy = self.origin
+        map_h, map_w = self.index_layer.shape
+        bucket = max(1, -(-DOT_SPACING // px))  # Tiles per dot cell
+        cols = -(-map_w // bucket)
+        tiles = np.asarray(positions, dtype=np.intp)
+        xs = np.clip(tiles[:, 0], 0, map_w - 1) // bucket
+        ys = np.clip(tiles[:, 1], 0, map_h - 1) // bucket
+        counts = np.bincount(ys * cols + xs)
+        occupied = np.nonzero(counts)[0]
+        cell_px = bucket * px
+        max_radius = max(1, cell_px // 2)
+        for key, count in zip(occupied.tolist(), counts[occupied].tolist()):
+            center = (ox + (key % cols) * cell_px + cell_px // 2, oy + (key // cols) * cell_px + cell_px // 2)
+            radius = min(max_radius, 1 + int(count ** 0.5))
+            pygame.draw.circle(screen, color, center, radius)
+
+    def draw_entities(self, screen):
+        """Draw NPCs, cars and the player on the last drawn map."""
+        game = self.game
+        self.draw_density(screen, game.population.positions(alive=True), NPC_DOT_COLOR)
+        self.draw_density(screen, [(car.x, car.y) for car in game.cars], CAR_DOT_COLOR)
+
+        # The player is never aggregated
+        focus = game.camera_focus()
+        ox, oy = self.origin
+        center = (ox + focus.x * self.px + self.px // 2, oy + focus.y * self.px + self.px // 2)
+        radius = max(3, self.px // 2)
+        pygame.draw.circle(screen, (0, 0, 0), center, radius + 1)
+        pygame.draw.circle(screen, PLAYER_DOT_COLOR, center, radius)
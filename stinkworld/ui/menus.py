@@ -1,12 +1,13 @@
 """Game menus module."""
 import pygame
 import sys
+from stinkworld.ui.fonts import get_font, render_text
 from stinkworld.utils.debug import debug_log
 
 def main_menu(screen):
     """Display main menu and return user choice."""
-    font = pygame.font.SysFont(None, 72)
-    title_font = pygame.font.SysFont(None, 100)
+    font = get_font(72)
+    title_font = get_font(100)
     
     # Menu options
     options = ["New Game", "Load Game", "Exit"]
@@ -16,13 +17,13 @@ def main_menu(screen):
         screen.fill((0, 0, 0))
         
         # Draw title
-        title = title_font.render("Slop Theft Auto", True, (255, 255, 0))
+        title = render_text(title_font, "Slop Theft Auto", (255, 255, 0))
         screen.blit(title, (screen.get_width()//2 - title.get_width()//2, 100))
         
         # Draw menu options
         for i, option in enumerate(options):
             color = (255, 255, 255) if i == selected else (180, 180, 180)
-            text = font.render(option, True, color)
+            text = render_text(font, option, color)
             screen.blit(text, (screen.get_width()//2 - text.get_width()//2, 250 + i*80))
         
         pygame.display.flip()
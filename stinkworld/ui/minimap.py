@@ -0,0 +1,105 @@
+"""Minimap rendered from a one-pixel-per-tile image of the city."""
+import numpy as np
+import pygame
+from stinkworld.core.settings import (
+    TILE_ROAD, TILE_PARK, TILE_BUILDING, TILE_TREE, TILE_POND, TILE_GRASS,
+    TILE_FLOOR, TILE_DOOR, TILE_WINDOW, TILE_COUNTRY_HOUSE, MINIMAP_SIZE, MINIMAP_MARGIN
+)
+from stinkworld.ui.tile_renderer import FURNITURE_NAMES
+from stinkworld.utils.debug import debug_log
+
+MINIMAP_COLORS = {
+    TILE_GRASS: (60, 140, 60),
+    TILE_ROAD: (70, 70, 70),
+    TILE_BUILDING: (120, 120, 130),
+    TILE_PARK: (80, 170, 80),
+    TILE_DOOR: (140, 90, 50),
+    TILE_FLOOR: (190, 180, 160),
+    TILE_TREE: (30, 100, 30),
+    TILE_POND: (50, 90, 200),
+    TILE_COUNTRY_HOUSE: (170, 100, 80),
+    TILE_WINDOW: (150, 190, 230),
+}
+FURNITURE_COLOR = (150, 120, 90)
+UNEXPLORED_COLOR = (20, 20, 25)
+FRAME_COLOR = (200, 200, 200)
+VIEW_COLOR = (255, 255, 0)
+PLAYER_COLOR = (255, 255, 255)
+
+def tile_palette():
+    """Lookup table from tile type to minimap color."""
+    palette = np.zeros((256, 3), dtype=np.uint8)
+    for tile in FURNITURE_NAMES:
+        palette[tile] = FURNITURE_COLOR
+    for tile, color in MINIMAP_COLORS.items():
+        palette[tile] = color
+    return palette
+
+class Minimap:
+    """Corner overview of the city, hiding tiles the player hasn't explored.
+
+    `colors` holds every tile's color as a (width, height, 3) array built
+    from City.tiles with one palette lookup; `image` is the same size with
+    unexplored tiles fogged. Tile changes and newly explored rects update
+    only their own pixels. The scaled-up copy shown on screen is rebuilt
+    only when the image changed.
+    """
+
+    def __init__(self, game, exploration, size=MINIMAP_SIZE, margin=MINIMAP_MARGIN):
+        """Initialize minimap."""
+        self.game = game
+        self.exploration = exploration
+        self.size = size
+        self.margin = margin
+        self.palette = tile_palette()
+        city = game.city
+        self.scale = size / max(city.width, city.height)  # Screen pixels per tile
+        self.colors = self.palette[city.tiles.T]
+        self.image = pygame.surfarray.make_surface(self.colors)
+        self.scaled = None
+        self.version = 0  # Bumped whenever the image changes
+        self.refresh(0, 0, city.width, city.height)
+        city.add_tile_listener(self.on_tile_changed)
+        debug_log(f"[Minimap] Built {city.width}x{city.height} minimap image")
+
+    def refresh(self, x0, y0, x1, y1):
+        """Recomposite a tile rect of the image from the colors and the explored bits."""
+        explored = self.exploration.unpack(x0, y0, x1, y1).T[:, :, None]
+        pixels = pygame.surfarray.pixels3d(self.image)
+        pixels[x0:x1, y0:y1] = np.where(explored, self.colors[x0:x1, y0:y1], UNEXPLORED_COLOR)
+        del pixels
+        self.scaled = None
+        self.version += 1
+
+    def on_tile_changed(self, x, y, old_tile, new_tile):
+        """Recolor one tile."""
+        self.colors[x, y] = self.palette[new_tile]
+        self.refresh(x, y, x + 1, y + 1)
+
+    def explore(self, x0, y0, x1, y1):
+        """Mark a tile rect explored and reveal it on the map."""
+        if self.exploration.mark_rect(x0, y0, x1, y1):
+            x0, y0, x1, y1 = self.exploration.clip(x0, y0, x1, y1)
+            self.refresh(x0, y0, x1, y1)
+
+    def rect(self):
+        """Screen rect of the minimap (top-right corner)."""
+        width = round(self.game.city.width * self.scale)
+        height = round(self.game.city.height * self.scale)
+        return pygame.Rect(self.game.screen.get_width() - width - self.margin, self.margin, width, height)
+
+    def draw(self, screen, focus, view):
+        """Draw the minimap with the viewport outline (tile rect) and the focus tile."""
+        rect = self.rect()
+        if self.scaled is None:
+            self.scaled = pygame.transform.scale(self.image, rect.size)
+        screen.blit(self.scaled, rect)
+        pygame.draw.rect(screen, FRAME_COLOR, rect.inflate(2, 2), 1)
+
+        scale = self.scale
+        vx, vy, vw, vh = view
+        view_rect = pygame.Rect(rect.x + int(vx * scale), rect.y + int(vy * scale),
+                                max(1, int(vw * scale)), max(1, int(vh * scale))).clip(rect)
+        pygame.draw.rect(screen, VIEW_COLOR, view_rect, 1)
+        center = (rect.x + int((focus[0] + 0.5) * scale), rect.y + int((focus[1] + 0.5) * scale))
+        pygame.draw.circle(screen, PLAYER_COLOR, center, 2)
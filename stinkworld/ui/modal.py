@@ -0,0 +1,66 @@
+"""Modal dialogs drawn over a snapshot of the game frame."""
+import sys
+import pygame
+from stinkworld.core.settings import MODAL_WAIT_MS
+from stinkworld.ui.dirty_rects import FRAME_FULL, FRAME_PARTIAL
+
+BACKDROP_DIM = (90, 90, 90)  # Multiplied onto the game frame behind a dialog
+REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED)
+
+class ModalLayer:
+    """Runs a dialog until it returns a result, sleeping between key presses.
+
+    The game frame is copied and dimmed once when a dialog opens and reused
+    by dialogs opened before the game draws again (a menu followed by a
+    message), so each redraw is one blit plus the dialog's own text. The
+    dialog is only redrawn after input; in between the loop blocks in
+    pygame.event.wait(), so an open dialog costs no CPU.
+    """
+
+    def __init__(self, game, wait_ms=MODAL_WAIT_MS):
+        """Initialize modal layer."""
+        self.game = game
+        self.wait_ms = wait_ms
+        self.backdrop = None
+        self.backdrop_frame = None  # Game frames drawn when the backdrop was taken
+
+    def frames_drawn(self):
+        """Number of frames the game has drawn so far."""
+        stats = self.game.dirty_rects.stats
+        return stats[FRAME_FULL] + stats[FRAME_PARTIAL]
+
+    def get_backdrop(self):
+        """The dimmed game frame, snapshotted on first use after each drawn frame."""
+        frame = self.frames_drawn()
+        if self.backdrop is None or self.backdrop_frame != frame:
+            self.backdrop = self.game.screen.copy()
+            self.backdrop.fill(BACKDROP_DIM, special_flags=pygame.BLEND_MULT)
+            self.backdrop_frame = frame
+        return self.backdrop
+
+    def run(self, draw, on_key):
+        """Show a dialog: draw(screen) paints it, on_key(event) returns None to keep it open or its result."""
+        game = self.game
+        screen = game.screen
+        backdrop = self.get_backdrop()
+        result = None
+        redraw = True
+        while result is None:
+            if redraw:
+                screen.blit(backdrop, (0, 0))
+                draw(screen)
+                pygame.display.flip()
+                redraw = False
+            event = pygame.event.wait(self.wait_ms)
+            if event.type == pygame.QUIT:
+                pygame.quit(); sys.exit()
+            elif event.type == pygame.KEYDOWN:
+                result = on_key(event)
+                redraw = True
+            elif event.type in REDRAW_EVENTS:
+                redraw = True
+
+        # The screen holds the dialog and the clock has been standing still
+        game.dirty_rects.invalidate_all()
+        game.loop.reset()
+        return result
@@ -0,0 +1,128 @@
+"""Adaptive render quality: steps effect detail up or down to hold a frame budget."""
+from collections import deque
+from stinkworld.core.settings import FRAME_BUDGET, RENDER_QUALITY
+from stinkworld.ui.light_map import SMOOTH_SCALE
+from stinkworld.utils.debug import debug_log
+
+# Quality levels from cheapest to best
+QUALITY_LEVELS = ('low', 'medium', 'high')
+QUALITY_PRESETS = {
+    'low': {
+        'particle_scale': 0.25,  # Fraction of each weather's particle count
+        'fog_scale': 0.5,  # Fog puff size
+        'light_smooth': 0,  # Pixels per tile of the smoothed light map, 0 for blocky tiles
+        'portrait_detail': 'low',
+        'draw_distance': 12,  # Tiles from the camera focus that NPCs and cars are drawn, None for all
+    },
+    'medium': {
+        'particle_scale': 0.5,
+        'fog_scale': 0.75,
+        'light_smooth': 4,
+        'portrait_detail': 'low',
+        'draw_distance': 16,
+    },
+    'high': {
+        'particle_scale': 1.0,
+        'fog_scale': 1.0,
+        'light_smooth': SMOOTH_SCALE,
+        'portrait_detail': 'high',
+        'draw_distance': None,
+    },
+}
+
+SAMPLE_FRAMES = 30  # Drawn frames averaged before a decision
+DOWNGRADE_RATIO = 1.0  # Step down when the average frame is above this fraction of the budget
+UPGRADE_RATIO = 0.6  # Step up when it is below this fraction
+UPGRADE_HOLD = 120  # Frames to wait after a change before stepping up
+MAX_UPGRADE_HOLD = 1920
+DECISION_HISTORY = 20  # Past decisions kept for debugging
+
+class QualityGovernor:
+    """Watches frame times and moves between QUALITY_LEVELS to stay within budget.
+
+    Only drawn frames are recorded; after each change the sample window
+    starts over, so a decision is always based on SAMPLE_FRAMES frames at
+    the current level. Stepping down happens as soon as a full window is
+    over budget, stepping up needs a window well under budget (UPGRADE_RATIO)
+    and UPGRADE_HOLD frames since the last change. An upgrade that has to
+    be undone within the hold doubles the hold, so a machine that sits
+    right at the edge of a level stops flapping between the two.
+    """
+
+    def __init__(self, game, budget=FRAME_BUDGET, mode=RENDER_QUALITY):
+        """Initialize governor; mode is 'auto' or a fixed level name."""
+        self.game = game
+        self.budget = budget
+        self.samples = deque(maxlen=SAMPLE_FRAMES)
+        self.frames = 0  # Drawn frames recorded so far
+        self.last_change = 0  # Frame of the last level change
+        self.last_upgrade = None  # Frame of the last step up
+        self.upgrade_hold = UPGRADE_HOLD
+        self.decisions = deque(maxlen=DECISION_HISTORY)  # Most recent last
+        self.pinned = mode != 'auto'
+        self.level = QUALITY_LEVELS.index(mode) if self.pinned else len(QUALITY_LEVELS) - 1
+        self.apply()
+
+    @property
+    def name(self):
+        """Name of the current level."""
+        return QUALITY_LEVELS[self.level]
+
+    @property
+    def preset(self):
+        """Settings of the current level."""
+        return QUALITY_PRESETS[self.name]
+
+    def average(self):
+        """Average recorded frame time in seconds (0 with no samples)."""
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    def record(self, seconds):
+        """Add a drawn frame's time and step the level if the window calls for it."""
+        self.frames += 1
+        if self.pinned:
+            return
+        self.samples.append(seconds)
+        if len(self.samples) < SAMPLE_FRAMES:
+            return
+        average = self.average()
+        if average > self.budget * DOWNGRADE_RATIO and self.level > 0:
+            if self.last_upgrade is not None and self.frames - self.last_upgrade < self.upgrade_hold:
+                self.upgrade_hold = min(self.upgrade_hold * 2, MAX_UPGRADE_HOLD)
+            self.set_level(self.level - 1, 'over budget', average)
+        elif (average < self.budget * UPGRADE_RATIO and self.level < len(QUALITY_LEVELS) - 1
+              and self.frames - self.last_change >= self.upgrade_hold):
+            self.last_upgrade = self.frames
+            self.set_level(self.level + 1, 'under budget', average)
+
+    def set_level(self, level, reason, average=None):
+        """Switch to a level, logging the decision."""
+        decision = {'frame': self.frames, 'from': self.name, 'to': QUALITY_LEVELS[level],
+                    'reason': reason, 'average_ms': None if average is None else round(average * 1000, 2)}
+        self.decisions.append(decision)
+        debug_log(f"[Quality] {decision['from']} -> {decision['to']} at frame {self.frames}: {reason}"
+                  + ("" if average is None else f" ({decision['average_ms']} ms, budget {self.budget * 1000:.1f} ms)"))
+        self.level = level
+        self.last_change = self.frames
+        self.samples.clear()
+        self.apply()
+
+    def pin(self, mode):
+        """Fix the level ('low', 'medium', 'high') or hand control back to the governor ('auto')."""
+        self.pinned = mode != 'auto'
+        self.upgrade_hold = UPGRADE_HOLD
+        if self.pinned and QUALITY_LEVELS.index(mode) != self.level:
+            self.set_level(QUALITY_LEVELS.index(mode), 'pinned')
+
+    def apply(self):
+        """Push the current level's settings into the systems that use them."""
+        game = self.game
+        preset = self.preset
+        game.weather_system.set_quality(preset['particle_scale'], preset['fog_scale'])
+        game.light_map.set_smooth_scale(preset['light_smooth'])
+        game.dirty_rects.invalidate_all()  # Portraits and light look different, redraw everything
+
+    def describe(self):
+        """One-line status for the debug HUD."""
+        mode = 'pinned' if self.pinned else 'auto'
+        return f"Quality: {self.name} ({mode}, {self.average() * 1000:.1f}/{self.budget * 1000:.1f} ms)"
@@ -0,0 +1,138 @@
+"""Ring-buffer scrolling map surface."""
+import pygame
+from stinkworld.core.settings import TILE_SIZE, SCROLL_BUFFER_MARGIN
+from stinkworld.utils.debug import debug_log
+
+class ScrollBufferRenderer:
+    """Keeps the map around the viewport pre-rendered in a wrap-around surface.
+
+    The buffer is the viewport plus `margin` tiles on every side. World tile
+    (x, y) always lives at buffer cell (x % cols, y % rows), so scrolling
+    never moves pixels: when the camera leaves the cached region the region
+    is re-centred and only the newly exposed strips of tiles are drawn.
+    Presenting is at most four blits, one per wrapped quadrant. Tiles whose
+    look changes (doors, broken furniture, set_tile) must be invalidated.
+    """
+
+    def __init__(self, game, margin=SCROLL_BUFFER_MARGIN):
+        """Initialize scroll buffer."""
+        self.game = game
+        self.margin = margin
+        self.buffer = None
+        self.cols = 0
+        self.rows = 0
+        self.origin = None  # World tile of the cached region's top-left corner
+        self.dirty = set()  # Cached tiles that must be redrawn
+        self.tiles_drawn = 0  # Tiles drawn by the last draw(), for profiling
+        game.city.add_tile_listener(self.on_tile_changed)
+
+    def resize(self, view_w, view_h):
+        """(Re)allocate the buffer for a viewport of view_w x view_h tiles."""
+        self.cols = view_w + 2 * self.margin
+        self.rows = view_h + 2 * self.margin
+        self.buffer = pygame.Surface((self.cols * TILE_SIZE, self.rows * TILE_SIZE), 0, self.game.screen)
+        self.origin = None
+        self.dirty.clear()
+        debug_log(f"[ScrollBuffer] Allocated {self.cols}x{self.rows} tile buffer")
+
+    def invalidate_tile(self, x, y):
+        """Mark a tile for redraw if it is cached."""
+        if self.contains(x, y):
+            self.dirty.add((x, y))
+
+    def invalidate(self):
+        """Drop the whole cached region."""
+        self.origin = None
+        self.dirty.clear()
+
+    def on_tile_changed(self, x, y, old_tile, new_tile):
+        """Redraw the tile and its neighbours (road orientation depends on them)."""
+        for dx, dy in ((0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)):
+            self.invalidate_tile(x + dx, y + dy)
+
+    def contains(self, x, y):
+        """Check if a world tile is inside the cached region."""
+        if self.origin is None:
+            return False
+        ox, oy = self.origin
+        return ox <= x < ox + self.cols and oy <= y < oy + self.rows
+
+    def draw_cell(self, x, y):
+        """Render world tile (x, y) into its wrapped buffer cell."""
+        bx = (x % self.cols) * TILE_SIZE
+        by = (y % self.rows) * TILE_SIZE
+        self.buffer.fill((0, 0, 0), (bx, by, TILE_SIZE, TILE_SIZE))
+        self.game.draw_tile(x, y, bx, by, surface=self.buffer)
+
+    def draw_block(self, x0, x1, y0, y1):
+        """Render every tile with x0 <= x < x1 and y0 <= y < y1."""
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                self.draw_cell(x, y)
+        return max(0, x1 - x0) * max(0, y1 - y0)
+
+    def scroll_to(self, camera_x, camera_y, view_w, view_h):
+        """Make sure the viewport is cached, drawing only the newly exposed tiles."""
+        drawn = 0
+        if self.origin is not None:
+            ox, oy = self.origin
+            if (ox <= camera_x and camera_x + view_w <= ox + self.cols and
+                    oy <= camera_y and camera_y + view_h <= oy + self.rows):
+                return drawn
+
+        nx, ny = camera_x - self.margin, camera_y - self.margin
+        cols, rows = self.cols, self.rows
+        if self.origin is None or abs(nx - self.origin[0]) >= cols or abs(ny - self.origin[1]) >= rows:
+            # Nothing reusable
+            self.dirty.clear()
+            drawn += self.draw_block(nx, nx + cols, ny, ny + rows)
+        else:
+            ox, oy = self.origin
+            # Columns that entered the region, over its full height
+            if nx > ox:
+                drawn += self.draw_block(ox + cols, nx + cols, ny, ny + rows)
+            elif nx < ox:
+                drawn += self.draw_block(nx, ox, ny, ny + rows)
+            # Rows that entered the region, over the columns both regions share
+            shared_x0, shared_x1 = max(nx, ox), min(nx, ox) + cols
+            if ny > oy:
+                drawn += self.draw_block(shared_x0, shared_x1, oy + rows, ny + rows)
+            elif ny < oy:
+                drawn += self.draw_block(shared_x0, shared_x1, ny, oy)
+        self.origin = (nx, ny)
+        self.dirty = {pos for pos in self.dirty if self.contains(*pos)}
+        return drawn
+
+    def draw(self, screen, camera_x, camera_y):
+        """Draw the visible map; this also clears the rest of the screen."""
+        width, height = screen.get_size()
+        view_w, view_h = width // TILE_SIZE, height // TILE_SIZE
+        if self.buffer is None or (self.cols, self.rows) != (view_w + 2 * self.margin, view_h + 2 * self.margin):
+            self.resize(view_w, view_h)
+
+        drawn = self.scroll_to(camera_x, camera_y, view_w, view_h)
+        for x, y in self.dirty:
+            self.draw_cell(x, y)
+        drawn += len(self.dirty)
+        self.dirty.clear()
+        self.tiles_drawn = drawn
+
+        # Blit the viewport out of the ring buffer, split where it wraps
+        pixel_w, pixel_h = view_w * TILE_SIZE, view_h * TILE_SIZE
+        buffer_w, buffer_h = self.buffer.get_size()
+        src_x = (camera_x % self.cols) * TILE_SIZE
+        src_y = (camera_y % self.rows) * TILE_SIZE
+        first_w = min(pixel_w, buffer_w - src_x)
+        first_h = min(pixel_h, buffer_h - src_y)
+        blits = [(self.buffer, (0, 0), (src_x, src_y, first_w, first_h))]
+        if first_w < pixel_w:
+            blits.append((self.buffer, (first_w, 0), (0, src_y, pixel_w - first_w, first_h)))
+        if first_h < pixel_h:
+            blits.append((self.buffer, (0, first_h), (src_x, 0, first_w, pixel_h - first_h)))
+            if first_w < pixel_w:
+                blits.append((self.buffer, (first_w, first_h), (0, 0, pixel_w - first_w, pixel_h - first_h)))
+        screen.blits(blits, doreturn=False)
+        if pixel_w < width:
+            screen.fill((0, 0, 0), (pixel_w, 0, width - pixel_w, height))
+        if pixel_h < height:
+            screen.fill((0, 0, 0), (0, pixel_h, pixel_w, height - pixel_h))
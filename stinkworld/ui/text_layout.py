@@ -0,0 +1,173 @@
+"""Word-wrapping text layout with per-font glyph advance tables."""
+from collections import OrderedDict
+import string
+import pygame
+from stinkworld.core.settings import TEXT_LAYOUT_CACHE_SIZE
+from stinkworld.utils.debug import debug_log
+
+MAX_CACHED_WORDS = 4096  # Word widths kept per font before the table is cleared
+
+class GlyphAdvances(dict):
+    """Character -> horizontal advance in pixels for one font, filled in on demand.
+
+    Also caches the measured width of every word seen. Summing glyph
+    advances alone can be off by several pixels per word (kerning and
+    subpixel positioning), so words are measured once with font.size();
+    the advances are used for spaces and for breaking overlong words.
+    """
+
+    def __init__(self, font):
+        """Initialize the table with the printable ASCII characters."""
+        super().__init__()
+        self.font = font
+        self.words = {}  # word -> width
+        chars = string.printable[:95]
+        for ch, metrics in zip(chars, font.metrics(chars)):
+            self[ch] = metrics[4] if metrics else font.size(ch)[0]
+
+    def __missing__(self, ch):
+        metrics = self.font.metrics(ch)[0]
+        advance = self[ch] = metrics[4] if metrics else self.font.size(ch)[0]
+        return advance
+
+    def word_width(self, word):
+        """Width of a word, measured on first use."""
+        width = self.words.get(word)
+        if width is None:
+            if len(self.words) >= MAX_CACHED_WORDS:
+                self.words.clear()
+            width = self.words[word] = self.font.size(word)[0]
+        return width
+
+class TextLayout:
+    """Breaks text into lines that fit a width and caches the results.
+
+    Widths come from each font's GlyphAdvances table, so wrapping a
+    paragraph is a dict lookup per word instead of a font.size() call per
+    candidate line; each finished line is checked with one font.size() call
+    and gives back words if the estimate was short. Laid-out lines are cached
+    by (text, font, width) and rendered paragraphs by (text, font, color,
+    width, line_height); both caches are LRU.
+    """
+
+    def __init__(self, cache_size=TEXT_LAYOUT_CACHE_SIZE):
+        """Initialize text layout."""
+        self.cache_size = cache_size
+        self.advances = {}  # font -> GlyphAdvances
+        self.lines = OrderedDict()  # (text, font, width) -> tuple of lines
+        self.surfaces = OrderedDict()  # (text, font, color, width, line_height) -> Surface
+
+    def glyphs(self, font):
+        """Return the advance table of a font, building it on first use."""
+        table = self.advances.get(font)
+        if table is None:
+            table = self.advances[font] = GlyphAdvances(font)
+            debug_log(f"[TextLayout] Built glyph table for font {id(font):x}")
+        return table
+
+    def set_cache_size(self, cache_size):
+        """Change how many entries each cache keeps, dropping the oldest if over."""
+        self.cache_size = cache_size
+        for store in (self.lines, self.surfaces):
+            while len(store) > cache_size:
+                store.popitem(last=False)
+
+    def cache(self, store, key, value):
+        """Add an entry to one of the LRU caches."""
+        store[key] = value
+        if len(store) > self.cache_size:
+            store.popitem(last=False)
+        return value
+
+    def layout(self, text, font, width):
+        """Return the lines of text wrapped to width pixels; newlines start a new line."""
+        key = (text, font, width)
+        lines = self.lines.get(key)
+        if lines is not None:
+            self.lines.move_to_end(key)
+            return lines
+
+        glyphs = self.glyphs(font)
+        lines = []
+        for paragraph in text.split('\n'):
+            lines.extend(self.break_paragraph(font, glyphs, paragraph.split(' '), width))
+        return self.cache(self.lines, key, tuple(lines))
+
+    def break_paragraph(self, font, glyphs, words, width):
+        """Greedily fill lines with words, returns the lines."""
+        space = glyphs[' ']
+        lines = []
+        start = 0
+        while start < len(words):
+            end = start
+            line_width = 0
+            while end < len(words):
+                added = glyphs.word_width(words[end]) + (space if end > start else 0)
+                if end > start and line_width + added > width:
+                    break
+                line_width += added
+                end += 1
+            # The estimate ignores kerning around spaces; give back words that don't really fit
+            while end - start > 1 and font.size(' '.join(words[start:end]))[0] > width:
+                end -= 1
+            if end - start == 1 and glyphs.word_width(words[start]) > width:
+                lines.extend(self.split_word(font, glyphs, words[start], width))
+            else:
+                lines.append(' '.join(words[start:end]))
+            start = end
+        return lines
+
+    def split_word(self, font, glyphs, word, width):
+        """Break a word wider than the line between characters."""
+        pieces = []
+        while word:
+            end = 0
+            estimate = 0
+            while end < len(word) and estimate + glyphs[word[end]] <= width:
+                estimate += glyphs[word[end]]
+                end += 1
+            end = max(end, 1)
+            while end > 1 and font.size(word[:end])[0] > width:
+                end -= 1
+            pieces.append(word[:end])
+            word = word[end:]
+        return pieces
+
+    def render(self, text, font, color, width, line_height=None):
+        """Return a transparent surface with the wrapped text; shared, so callers must not draw on it."""
+        line_height = line_height or font.get_linesize()
+        key = (text, font, tuple(color), width, line_height)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        rendered = [font.render(line, True, color) for line in self.layout(text, font, width)]
+        height = (len(rendered) - 1) * line_height + font.get_height()
+        surface = pygame.Surface((max(1, max(line.get_width() for line in rendered)), max(1, height)), pygame.SRCALPHA)
+        for i, line in enumerate(rendered):
+            # Lines never overlap the (transparent) canvas, so MAX copies them as they are
+            surface.blit(line, (0, i * line_height), special_flags=pygame.BLEND_RGBA_MAX)
+        return self.cache(self.surfaces, key, surface)
+
+    def clear(self):
+        """Drop cached layouts and surfaces (glyph tables stay)."""
+        self.lines.clear()
+        self.surfaces.clear()
+
+_text_layout = None
+
+def get_text_layout():
+    """Return the shared text layout, creating it on first use."""
+    global _text_layout
+    if _text_layout is None:
+        _text_layout = TextLayout()
+    return _text_layout
+
+def wrap_text(text, font, width):
+    """Shortcut for get_text_layout().layout()."""
+    return get_text_layout().layout(text, font, width)
+
+def render_paragraph(text, font, color, width, line_height=None):
+    """Shortcut for get_text_layout().render()."""
+    return get_text_layout().render(text, font, color, width, line_height)
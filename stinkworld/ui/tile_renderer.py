@@ -0,0 +1,193 @@
+"""Whole-viewport terrain rendering by gathering atlas pixel blocks with NumPy."""
+import numpy as np
+import pygame
+from stinkworld.core.settings import (
+    TILE_SIZE, TILE_ROAD, TILE_PARK, TILE_BUILDING, TILE_TREE, TILE_POND,
+    TILE_GRASS, TILE_FLOOR, TILE_DOOR, TILE_WINDOW, TILE_TOILET, TILE_OVEN,
+    TILE_BED, TILE_DESK, TILE_SHOP_SHELF, TILE_TABLE, TILE_FRIDGE,
+    TILE_COUNTER, TILE_SINK, TILE_TUB
+)
+from stinkworld.utils.debug import debug_log
+
+# Terrain sprite drawn for each tile type (roads pick an orientation, see road_terrain)
+TERRAIN_NAMES = {
+    TILE_PARK: 'grass',
+    TILE_BUILDING: 'building',
+    TILE_TREE: 'tree',
+    TILE_POND: 'water',
+    TILE_GRASS: 'grass',
+    TILE_FLOOR: 'floor',
+    TILE_DOOR: 'door',
+    TILE_WINDOW: 'window',
+}
+
+# Furniture sprite drawn for each furniture tile type
+FURNITURE_NAMES = {
+    TILE_TOILET: 'toilet',
+    TILE_OVEN: 'oven',
+    TILE_BED: 'bed',
+    TILE_DESK: 'desk',
+    TILE_SHOP_SHELF: 'shop_shelf',
+    TILE_TABLE: 'table',
+    TILE_FRIDGE: 'fridge',
+    TILE_COUNTER: 'counter',
+    TILE_SINK: 'sink',
+    TILE_TUB: 'tub'
+}
+
+# Terrain whose look depends on per-tile state, so it can't live in the atlas
+DYNAMIC_TERRAIN = (TILE_DOOR, TILE_WINDOW)
+
+# Static terrain baked into the atlas; cell 0 is left empty (black)
+ATLAS_TERRAIN = ['grass', 'building', 'tree', 'water', 'floor', 'road_h', 'road_v', 'road_intersection']
+
+# overlay_mask values
+OVERLAY_NONE = 0
+OVERLAY_ON_TOP = 1  # Prop or furniture over the gathered terrain
+OVERLAY_WITH_TERRAIN = 2  # Door/window terrain drawn per tile as well
+
+def road_terrain(city, x, y):
+    """Pick the road sprite for a road tile based on the surrounding roads."""
+    is_vertical = (city.get_tile(x, y-1) == TILE_ROAD and
+                   city.get_tile(x, y+1) == TILE_ROAD)
+    is_horizontal = (city.get_tile(x-1, y) == TILE_ROAD and
+                     city.get_tile(x+1, y) == TILE_ROAD)
+    if is_vertical and is_horizontal:
+        return 'road_intersection'
+    elif is_vertical:
+        return 'road_v'
+    return 'road_h'  # Default to horizontal
+
+def classify_terrain(tiles, cells, names=TERRAIN_NAMES):
+    """Map a (H, W) tile array to atlas cells, picking road orientation like road_terrain.
+
+    names maps tile types to sprite names; types whose name has no cell get cell 0.
+    """
+    index = np.zeros(tiles.shape, dtype=np.uint8)
+    for tile, name in names.items():
+        if name in cells:
+            index[tiles == tile] = cells[name]
+
+    # Road orientation; tiles off the map count as grass, like City.get_tile
+    roads = tiles == TILE_ROAD
+    padded = np.pad(roads, 1, constant_values=False)
+    vertical = padded[:-2, 1:-1] & padded[2:, 1:-1]
+    horizontal = padded[1:-1, :-2] & padded[1:-1, 2:]
+    index[roads] = cells['road_h']
+    index[roads & vertical] = cells['road_v']
+    index[roads & vertical & horizontal] = cells['road_intersection']
+    return index
+
+def reclassify_around(index, tiles, cells, x, y, names=TERRAIN_NAMES):
+    """Update a classify_terrain() result for tile (x, y) and its 4 neighbours after that tile changed."""
+    height, width = tiles.shape
+    # Two tiles of margin, so each updated tile sees all of its own neighbours
+    x0, y0 = max(0, x - 2), max(0, y - 2)
+    patch = classify_terrain(tiles[y0:y + 3, x0:x + 3], cells, names)
+    for dx, dy in ((0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)):
+        tx, ty = x + dx, y + dy
+        if 0 <= tx < width and 0 <= ty < height:
+            index[ty, tx] = patch[ty - y0, tx - x0]
+
+class GatherMapRenderer:
+    """Draws the terrain layer with one NumPy gather per frame.
+
+    Each map tile is classified once into an atlas cell. Per frame the visible
+    window of that index layer fancy-indexes the atlas (stored as mapped
+    screen pixels) and the result is written straight into the screen's
+    pixels2d view, so the whole terrain layer is one vectorized copy. Doors,
+    windows, props and furniture depend on per-tile state, so only those
+    tiles go through Game.draw_tile afterwards. Output matches Game.draw_map.
+    """
+
+    def __init__(self, game):
+        """Initialize renderer."""
+        self.game = game
+        self.cells = {}  # terrain name -> atlas cell
+        self.atlas_rows = None  # (cells * TILE_SIZE, TILE_SIZE) mapped screen pixels, one row per cell pixel row
+        self.row_offsets = np.arange(TILE_SIZE, dtype=np.intp)[None, :, None]
+        self.index_layer = None  # (H, W) atlas cell per tile
+        self.overlay_mask = None  # (H, W) OVERLAY_* per tile
+        self.build_atlas()
+        self.build_layers()
+        game.city.add_tile_listener(self.on_tile_changed)
+
+    def build_atlas(self):
+        """Render every static terrain sprite into the atlas array."""
+        screen = self.game.screen
+        blocks = [np.full((TILE_SIZE, TILE_SIZE), screen.map_rgb((0, 0, 0)), dtype=np.uint32)]
+        for name in ATLAS_TERRAIN:
+            tile = pygame.Surface((TILE_SIZE, TILE_SIZE), 0, screen)
+            tile.fill((0, 0, 0))
+            self.game.graphics.draw_terrain(tile, name, 0, 0)
+            self.cells[name] = len(blocks)
+            blocks.append(pygame.surfarray.array2d(tile).T.astype(np.uint32))
+        self.atlas_rows = np.stack(blocks).reshape(-1, TILE_SIZE)
+        debug_log(f"[MapRenderer] Built terrain atlas with {len(blocks)} cells")
+
+    def build_layers(self):
+        """Classify every map tile into an atlas cell and an overlay flag."""
+        city = self.game.city
+        tiles = city.tiles
+        index = classify_terrain(tiles, self.cells)
+
+        overlay = np.zeros(tiles.shape, dtype=np.uint8)
+        overlay[np.isin(tiles, list(FURNITURE_NAMES))] = OVERLAY_ON_TOP
+        for x, y in city.props:
+            overlay[y, x] = OVERLAY_ON_TOP
+        overlay[np.isin(tiles, DYNAMIC_TERRAIN)] = OVERLAY_WITH_TERRAIN
+
+        self.index_layer = index
+        self.overlay_mask = overlay
+
+    def on_tile_changed(self, x, y, old_tile, new_tile):
+        """Reclassify the tile and its neighbours (neighbouring roads may change orientation)."""
+        reclassify_around(self.index_layer, self.game.city.tiles, self.cells, x, y)
+        overlay = OVERLAY_NONE
+        if new_tile in FURNITURE_NAMES or (x, y) in self.game.city.props:
+            overlay = OVERLAY_ON_TOP
+        if new_tile in DYNAMIC_TERRAIN:
+            overlay = OVERLAY_WITH_TERRAIN
+        self.overlay_mask[y, x] = overlay
+
+    def invalidate_tile(self, x, y):
+        """Nothing cached per tile; stateful tiles are redrawn every frame."""
+
+    def draw(self, screen, camera_x, camera_y):
+        """Draw the visible map; this also clears the rest of the screen."""
+        width, height = screen.get_size()
+        view_w, view_h = width // TILE_SIZE, height // TILE_SIZE
+        pixel_w, pixel_h = view_w * TILE_SIZE, view_h * TILE_SIZE
+
+        # Visible window of the index layer; off-map tiles render as grass
+        map_h, map_w = self.index_layer.shape
+        x1, y1 = min(camera_x + view_w, map_w), min(camera_y + view_h, map_h)
+        window = np.full((view_h, view_w), self.cells['grass'], dtype=np.uint8)
+        window[:y1 - camera_y, :x1 - camera_x] = self.index_layer[camera_y:y1, camera_x:x1]
+
+        # Only tiles inside the clip rect are written; pixels2d ignores the
+        # clip, so this relies on clips snapped to the tile grid (DirtyRectTracker)
+        clip = screen.get_clip()
+        tx0, ty0 = clip.left // TILE_SIZE, clip.top // TILE_SIZE
+        tx1 = min(view_w, -(-clip.right // TILE_SIZE))
+        ty1 = min(view_h, -(-clip.bottom // TILE_SIZE))
+        if tx0 < tx1 and ty0 < ty1:
+            # Gather atlas pixel rows in screen memory order: the screen viewed as
+            # (tile y, pixel y, tile x, pixel x) takes row cell * TILE_SIZE + pixel y
+            rows = window[ty0:ty1, None, tx0:tx1].astype(np.intp) * TILE_SIZE + self.row_offsets
+            pixels = pygame.surfarray.pixels2d(screen).T
+            target = pixels[ty0 * TILE_SIZE:ty1 * TILE_SIZE, tx0 * TILE_SIZE:tx1 * TILE_SIZE]
+            target.reshape(ty1 - ty0, TILE_SIZE, tx1 - tx0, TILE_SIZE)[...] = self.atlas_rows[rows]
+            del target, pixels  # Unlock the screen before blitting overlays
+        if pixel_w < width:
+            screen.fill((0, 0, 0), (pixel_w, 0, width - pixel_w, height))
+        if pixel_h < height:
+            screen.fill((0, 0, 0), (0, pixel_h, pixel_w, height - pixel_h))
+
+        # Stateful tiles go through the regular per-tile path
+        overlay = self.overlay_mask[camera_y:y1, camera_x:x1]
+        ys, xs = np.nonzero(overlay)
+        draw_tile = self.game.draw_tile
+        for y, x in zip(ys.tolist(), xs.tolist()):
+            draw_tile(camera_x + x, camera_y + y, x * TILE_SIZE, y * TILE_SIZE,
+                      terrain=overlay[y, x] == OVERLAY_WITH_TERRAIN)
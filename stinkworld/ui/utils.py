@@ -1,5 +1,6 @@
 """UI utility functions."""
 import pygame
+from stinkworld.ui.text_layout import wrap_text
 from stinkworld.utils.debug import debug_log
 
 def draw_wrapped_text(surface, text, font, color, rect, aa=True, bkg=None):
@@ -21,32 +22,19 @@ def draw_wrapped_text(surface, text, font, color, rect, aa=True, bkg=None):
     # Get the height of the font
     font_height = font.size("Tg")[1]
 
-    while text:
-        i = 1
-
+    for line in wrap_text(text, font, rect.width):
         # Determine if the row of text will be outside our area
         if y + font_height > rect.bottom:
             break
 
-        # Determine maximum width of line
-        while font.size(text[:i])[0] < rect.width and i < len(text):
-            i += 1
-
-        # If we've wrapped the text, then adjust the wrap to the last word      
-        if i < len(text): 
-            i = text.rfind(" ", 0, i) + 1
-
         # Render the line and blit it to the surface
         if bkg:
-            image = font.render(text[:i], aa, color, bkg)
+            image = font.render(line, aa, color, bkg)
             image.set_colorkey(bkg)
         else:
-            image = font.render(text[:i], aa, color)
+            image = font.render(line, aa, color)
 
         surface.blit(image, (rect.left, y))
         y += font_height + line_spacing
 
-        # Remove the text we just blitted
-        text = text[i:]
-
-    return y
\ No newline at end of file
+    return y
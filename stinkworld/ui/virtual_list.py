@@ -0,0 +1,148 @@
+"""Scrolling list widget that only renders the rows on screen."""
+from collections import OrderedDict
+import pygame
+from stinkworld.core.settings import LIST_ROW_CACHE_SIZE
+
+ROW_COLOR = (180, 180, 180)
+SELECTED_COLOR = (255, 255, 255)
+SEARCH_COLOR = (255, 255, 0)
+SCROLLBAR_COLOR = (120, 120, 120)
+
+class VirtualList:
+    """A window onto a sequence: journal entries, inventory, shop stock, menu options.
+
+    The source is any object with len() and indexing and is read live,
+    never copied, so a journal that keeps growing while the list is open
+    simply gets longer. Only the rows in view are formatted and rendered,
+    through a row-surface LRU cache, so the cost of a redraw doesn't depend
+    on the source's length. Supports line, page and Home/End movement and
+    incremental search: typed characters jump to the next row containing
+    them (F3 finds the next match, Backspace edits the search).
+
+    With selectable=False there is no cursor and the arrows scroll the view.
+    """
+
+    def __init__(self, source, font, rect, row_height, format_row=str, selectable=True, wrap=False,
+                 colors=(ROW_COLOR, SELECTED_COLOR), cache_size=LIST_ROW_CACHE_SIZE):
+        """Initialize list widget."""
+        self.source = source
+        self.font = font
+        self.rect = pygame.Rect(rect)
+        self.row_height = row_height
+        self.format_row = format_row
+        self.selectable = selectable
+        self.wrap = wrap  # Moving past either end jumps to the other
+        self.colors = colors
+        self.cache_size = cache_size
+        self.rows = OrderedDict()  # (text, color) -> Surface
+        self.selected = 0
+        self.top = 0  # Index of the first visible row
+        self.search = ''
+
+    def __len__(self):
+        return len(self.source)
+
+    def visible_rows(self):
+        """Number of rows that fit in the rect (one is reserved for the search line while searching)."""
+        return max(1, self.rect.height // self.row_height - (1 if self.search else 0))
+
+    def text(self, index):
+        """Formatted text of a source row."""
+        return self.format_row(self.source[index])
+
+    def row_surface(self, text, color):
+        """Render a row through the cache."""
+        key = (text, color)
+        surface = self.rows.get(key)
+        if surface is not None:
+            self.rows.move_to_end(key)
+            return surface
+        surface = self.font.render(text, True, color)
+        self.rows[key] = surface
+        if len(self.rows) > self.cache_size:
+            self.rows.popitem(last=False)
+        return surface
+
+    def select(self, index):
+        """Move the cursor (or the view, if not selectable) to an index, scrolling it into view."""
+        count = len(self.source)
+        rows = self.visible_rows()
+        if not self.selectable:
+            self.top = max(0, min(index, count - rows))
+            return
+        if count == 0:
+            self.selected = self.top = 0
+            return
+        self.selected = max(0, min(index, count - 1))
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + rows:
+            self.top = self.selected - rows + 1
+
+    def move(self, delta):
+        """Move by delta rows."""
+        count = len(self.source)
+        current = self.selected if self.selectable else self.top
+        if self.wrap and self.selectable and count:
+            self.select((current + delta) % count)
+        else:
+            self.select(current + delta)
+
+    def find(self, start):
+        """Select the first row at or after start (wrapping) containing the search text."""
+        count = len(self.source)
+        needle = self.search.lower()
+        for offset in range(count):
+            index = (start + offset) % count
+            if needle in self.text(index).lower():
+                self.select(index)
+                return True
+        return False
+
+    def handle_key(self, event):
+        """Apply a navigation or search key, returns True if the list used it."""
+        current = self.selected if self.selectable else self.top
+        if event.key == pygame.K_UP:
+            self.move(-1)
+        elif event.key == pygame.K_DOWN:
+            self.move(1)
+        elif event.key == pygame.K_PAGEUP:
+            self.select(current - self.visible_rows())
+        elif event.key == pygame.K_PAGEDOWN:
+            self.select(current + self.visible_rows())
+        elif event.key == pygame.K_HOME:
+            self.select(0)
+        elif event.key == pygame.K_END:
+            self.select(len(self.source) - 1)
+        elif event.key == pygame.K_F3 and self.search:
+            self.find(current + 1)
+        elif event.key == pygame.K_BACKSPACE and self.search:
+            self.search = self.search[:-1]
+            if not (self.search and self.find(current)):
+                self.select(current)  # Keep the cursor in view, the search line may have gone
+        elif event.unicode.isprintable() and event.unicode.strip(' ') or (event.unicode == ' ' and self.search):
+            self.search += event.unicode
+            if not self.find(current):
+                self.select(current)
+        else:
+            return False
+        return True
+
+    def draw(self, screen):
+        """Draw the visible rows, a scrollbar and the search line."""
+        x, y = self.rect.topleft
+        count = len(self.source)
+        rows = self.visible_rows()
+        normal, highlight = self.colors
+        for index in range(self.top, min(self.top + rows, count)):
+            color = highlight if self.selectable and index == self.selected else normal
+            screen.blit(self.row_surface(self.text(index), color), (x, y))
+            y += self.row_height
+        if count > rows:
+            track = rows * self.row_height
+            size = max(4, track * rows // count)
+            offset = (track - size) * self.top // max(1, count - rows)
+            pygame.draw.rect(screen, SCROLLBAR_COLOR, (self.rect.right - 4, self.rect.top + offset, 4, size))
+        if self.search:
+            search = self.row_surface(f"Search: {self.search}", SEARCH_COLOR)
+            screen.blit(search, (self.rect.left, self.rect.top + rows * self.row_height))
@@ -0,0 +1,41 @@
+"""Approximate memory accounting for game objects."""
+import sys
+from enum import Enum
+
+def deep_sizeof(value, seen):
+    """Bytes of a value plus the containers, strings and numbers inside it, each counted once per seen set.
+
+    None, bools, enum members and small ints are shared by the whole
+    program and count as nothing; other strings and numbers count in
+    full even if they came from a shared list (so this is an upper bound).
+    """
+    if value is None or isinstance(value, (bool, Enum)) or (type(value) is int and -5 <= value <= 256):
+        return 0
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in value)
+    return size
+
+def sizeof_slots(obj, references=(), seen=None):
+    """Bytes of a slotted object and what its slots hold; slots named in references point at other objects and aren't followed."""
+    seen = set() if seen is None else seen
+    size = sys.getsizeof(obj)
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get('__slots__', ()):
+            if name not in references and name != '__weakref__':
+                size += deep_sizeof(getattr(obj, name, None), seen)
+    return size
+
+def total_sizeof(objects):
+    """(count, bytes) of a collection of objects with a sizeof(seen) method, counting anything they share once."""
+    seen = set()
+    count = size = 0
+    for obj in objects:
+        count += 1
+        size += obj.sizeof(seen)
+    return count, size